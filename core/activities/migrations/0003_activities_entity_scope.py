@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:15
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activities", "0002_activity_duration"),
+        ("projects", "0007_projects_entity_scope"),
+        ("rubros", "0002_rubros_entity_scope"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="activity",
+            options={"default_manager_name": "all_objects", "ordering": ["id"]},
+        ),
+        migrations.AlterModelManagers(
+            name="activity",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="activity",
+            index=models.Index(fields=["project", "id"], name="activities_project_idx"),
+        ),
+    ]
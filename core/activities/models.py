@@ -2,6 +2,7 @@ import uuid
 from django.db import models
 from core.projects.models import Project
 from core.rubros.models import Rubro
+from core.entities.tenancy import EntityScopedManager
 
 
 # Create your models here.
@@ -24,6 +25,14 @@ class Activity(models.Model):
     updated_at = models.DateTimeField("updated_at", auto_now=True)
     deleted_at = models.DateTimeField("deleted_at", null=True, blank=True)
 
+    all_objects = models.Manager()
+    # Restringido a la entidad de la solicitud (core.entities.tenancy)
+    objects = EntityScopedManager("project__entity")
+
     class Meta:
         db_table = "activities"
         ordering = ["id"]
+        default_manager_name = "all_objects"
+        indexes = [
+            models.Index(fields=["project", "id"], name="activities_project_idx")
+        ]
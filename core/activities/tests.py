@@ -1,3 +1,38 @@
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.entities.models import Entity
+from core.metrics.testing import QueryBudgetMixin
+from core.projects.models import Project
+from core.rubros.models import Rubro
+from core.users.models import User
+from .models import Activity
 
-# Create your tests here.
+
+class ActivityByProjectQueryBudgetTests(QueryBudgetMixin, TestCase):
+    query_budgets = {"activities_by_project_view": 2}
+
+    def setUp(self):
+        self.project = Project.objects.create(
+            name="Proyecto", entity=Entity.objects.create(name="Entidad")
+        )
+        for index in range(6):
+            rubro = Rubro.objects.create(
+                descripcion=f"Rubro {index}", value_sgr=1000, project=self.project
+            )
+            Activity.objects.create(
+                name=f"Actividad {index}", project=self.project, rubro=rubro
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create(
+                email="admin@example.com", identification="1", is_superuser=True
+            )
+        )
+
+    def test_list_by_project(self):
+        url = reverse("activities_by_project_view", args=[self.project.id])
+        with self.assertQueryBudget("activities_by_project_view"):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 6)
@@ -319,7 +319,9 @@ class ActivityByProjectView(APIView):
             return Response(response, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            activities = Activity.objects.filter(project_id=project_id)
+            activities = Activity.objects.filter(project_id=project_id).select_related(
+                "project", "rubro__project__entity"
+            )
 
             if not activities.exists():
                 response = {
@@ -0,0 +1,67 @@
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+
+# Alias de CACHES para las versiones: sin descarte de entradas (ver settings)
+VERSIONS_CACHE = "versions"
+
+
+def new_token():
+    return uuid.uuid4().hex
+
+
+def get_version(key):
+    """
+    Versión vigente de `key` en el caché compartido por los workers.
+
+    Las versiones son tokens aleatorios y no contadores: si la clave se pierde
+    se crea un token nuevo, distinto de todos los anteriores, así las entradas
+    guardadas con una versión anterior nunca vuelven a ser válidas.
+    """
+    return caches[VERSIONS_CACHE].get_or_set(key, new_token, None)
+
+
+# Copia por proceso de las versiones leídas con get_local_version:
+# {clave: (momento de la lectura, versión)}
+_local_versions = {}
+
+
+def get_local_version(key):
+    """
+    get_version para las rutas que lo consultan en cada solicitud: la versión
+    se guarda en memoria del proceso y solo se vuelve a leer del caché
+    compartido cada VERSIONS_CHECK_INTERVAL segundos, así que los cambios
+    hechos en otro proceso se ven con ese retraso como máximo.
+    """
+    now = time.monotonic()
+    entry = _local_versions.get(key)
+    if entry is not None and now - entry[0] < settings.VERSIONS_CHECK_INTERVAL:
+        return entry[1]
+    version = get_version(key)
+    _local_versions[key] = (now, version)
+    return version
+
+
+def get_versions(keys):
+    """
+    @return: diccionario {clave: versión}, creando las que falten
+    """
+    cache = caches[VERSIONS_CACHE]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = cache.get_or_set(key, new_token, None)
+    return versions
+
+
+def bump_version(*keys):
+    """
+    Invalida todo lo guardado con la versión vigente de `keys`.
+    """
+    versions = {key: new_token() for key in keys}
+    caches[VERSIONS_CACHE].set_many(versions, None)
+    # El proceso que invalida ve el cambio de inmediato
+    now = time.monotonic()
+    for key, version in versions.items():
+        _local_versions[key] = (now, version)
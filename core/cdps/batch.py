@@ -0,0 +1,229 @@
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from pypdf import PdfReader, PdfWriter
+from .generate_pdf import GeneratePdf
+from .pdf_cache import PdfCache
+from .signing import get_signing_session
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+class PdfRenderError(Exception):
+    pass
+
+
+def init_render_worker():
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sgr.settings")
+    django.setup()
+
+
+def render_cdp_pdf(entity, user, cdp, sign=False):
+    # Cada proceso del pool firma con su propia sesión de firma, que se crea
+    # con el primer documento y se reutiliza para los siguientes
+    return GeneratePdf(entity, user, cdp, sign=sign).generate_pdf()
+
+
+def get_render_pool():
+    """
+    Pool de procesos compartido por el worker para generar PDFs.
+
+    Usa `spawn` para que los procesos hijos no hereden las conexiones a la base
+    de datos del proceso padre; se crea una sola vez y se reutiliza hasta que
+    se rompe (ver `reset_render_pool`).
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_render_worker,
+            )
+        return _render_pool
+
+
+def reset_render_pool(pool):
+    """
+    Descarta `pool` si sigue siendo el pool compartido: cuando un proceso hijo
+    termina de forma abrupta (p. ej. por falta de memoria) el pool queda roto
+    y todas sus tareas fallan con BrokenProcessPool. El siguiente
+    `get_render_pool` crea uno nuevo.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is pool:
+            _render_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class CdpsBatchRenderer:
+    """
+    Genera los PDFs de varios CDPs en paralelo.
+
+    Los PDFs que ya están en el caché en disco se leen de ahí; el resto se
+    generan en el pool de procesos con un número acotado de tareas en curso,
+    así la memoria no crece con el número de CDPs. Con `sign` cada PDF se
+    firma en el mismo proceso que lo genera.
+
+    Si el pool se rompe se reemplaza y se vuelven a enviar los PDFs que
+    estaban en curso, una sola vez por lote; si el nuevo pool también se
+    rompe falla con PdfRenderError.
+    """
+
+    def __init__(self, cdps, entity, user, sign=False):
+        self.cdps = cdps
+        self.entity = entity
+        self.user = user
+        self.sign = sign
+        self.pdf_cache = PdfCache()
+        self.max_pending = settings.PDF_RENDER_WORKERS * 2
+        self.pool = None
+        self.restarted = False
+
+    def iter_pdfs(self, sign=None):
+        """
+        @param sign: firmar cada PDF (por defecto el valor de `sign` del lote)
+        @return: generador de tuplas (índice, cdp, pdf) en el orden en que terminan
+        """
+        sign = self.sign if sign is None else sign
+        self.pool = get_render_pool()
+        pending = {}
+        try:
+            for index, cdp in enumerate(self.cdps):
+                key = self.pdf_cache.key(cdp, self.entity, self.user, sign)
+                pdf = self.pdf_cache.read(key)
+                if pdf is not None:
+                    yield index, cdp, pdf
+                    continue
+
+                self.submit(pending, index, cdp, key, sign)
+                if len(pending) >= self.max_pending:
+                    yield from self.collect(pending)
+
+            while pending:
+                yield from self.collect(pending)
+        finally:
+            for future in pending:
+                future.cancel()
+            self.pdf_cache.evict()
+
+    def submit(self, pending, index, cdp, key, sign):
+        try:
+            future = self.pool.submit(render_cdp_pdf, self.entity, self.user, cdp, sign)
+        except BrokenProcessPool:
+            self.restart_pool(self.pool)
+            future = self.pool.submit(render_cdp_pdf, self.entity, self.user, cdp, sign)
+        pending[future] = (index, cdp, key, sign, self.pool)
+
+    def restart_pool(self, broken):
+        # Las demás tareas del pool roto también fallan: solo la primera lo
+        # reemplaza
+        if broken is not self.pool:
+            return
+        reset_render_pool(broken)
+        if self.restarted:
+            raise PdfRenderError(
+                "El proceso que genera los PDFs terminó inesperadamente dos "
+                "veces; intente de nuevo con menos CDPs"
+            )
+        self.restarted = True
+        self.pool = get_render_pool()
+
+    def collect(self, pending):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, cdp, key, sign, pool = pending.pop(future)
+            try:
+                pdf = future.result()
+            except BrokenProcessPool:
+                self.restart_pool(pool)
+                self.submit(pending, index, cdp, key, sign)
+                continue
+            self.pdf_cache.store(key, pdf)
+            yield index, cdp, pdf
+
+    def iter_zip(self):
+        """
+        Genera un ZIP con un PDF por CDP, entregando los bytes de cada entrada
+        en cuanto su PDF está listo.
+        """
+        buffer = ZipStreamBuffer()
+        names = set()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for index, cdp, pdf in self.iter_pdfs():
+                name = f"cdp_{cdp.number or cdp.id}.pdf"
+                if name in names:
+                    name = f"cdp_{cdp.number or cdp.id}_{index}.pdf"
+                names.add(name)
+                archive.writestr(name, pdf)
+                yield buffer.pop()
+        yield buffer.pop()
+
+    def merged_pdf(self):
+        """
+        Une los PDFs en el orden de los CDPs en un archivo temporal. Al unir
+        se pierden las firmas de cada PDF, así que con `sign` se firma una
+        sola vez el documento unido.
+
+        PdfWriter conserva todas las páginas en memoria hasta escribir el
+        archivo: las vistas solo lo usan hasta CDPS_MERGED_PDF_SYNC_MAX CDPs
+        y los proyectos más grandes se generan en la cola de reportes.
+        @return: archivo temporal posicionado al inicio
+        """
+        results = {}
+        next_index = 0
+        writer = PdfWriter()
+        for index, _, pdf in self.iter_pdfs(sign=False):
+            results[index] = pdf
+            # Agrega en orden los PDFs que ya están disponibles
+            while next_index in results:
+                writer.append(PdfReader(io.BytesIO(results.pop(next_index))))
+                next_index += 1
+
+        output = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+        writer.write(output)
+        output.seek(0)
+        if self.sign:
+            signed = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+            with output:
+                get_signing_session().sign_file(output, signed)
+            signed.seek(0)
+            return signed
+        return output
+
+
+class ZipStreamBuffer(io.RawIOBase):
+    """
+    Destino de escritura sin posicionamiento para `zipfile`, que acumula los
+    bytes escritos hasta que se retiran con `pop()`.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def pop(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
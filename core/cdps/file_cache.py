@@ -0,0 +1,98 @@
+import os
+import tempfile
+from django.utils import timezone
+
+
+class FileCache:
+    """
+    Caché de archivos en disco, nombrados por una clave (un hash de todo lo
+    que afecta al contenido). Cuando el directorio supera `max_bytes` se
+    eliminan los archivos usados hace más tiempo.
+    """
+
+    EXTENSION = ""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}{self.EXTENSION}")
+
+    def open(self, key, render):
+        """
+        Abre el archivo de `key`, generándolo con `render()` si no está en caché.
+        @return: archivo abierto en modo binario
+        """
+        cached_file = self.open_cached(key)
+        if cached_file is None:
+            self.store(key, render())
+            cached_file = open(self.path(key), "rb")
+            self.evict()
+        return cached_file
+
+    def open_cached(self, key):
+        """
+        @return: archivo abierto o None si `key` no está en caché
+        """
+        path = self.path(key)
+        try:
+            cached_file = open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+        # Marca el archivo como usado recientemente (atime) sin cambiar su
+        # fecha de modificación, que se usa como Last-Modified
+        mtime = os.fstat(cached_file.fileno()).st_mtime
+        try:
+            os.utime(path, (timezone.now().timestamp(), mtime))
+        except OSError:
+            pass
+        return cached_file
+
+    def read(self, key):
+        """
+        @return: contenido del archivo o None si `key` no está en caché
+        """
+        cached_file = self.open_cached(key)
+        if cached_file is None:
+            return None
+        with cached_file:
+            return cached_file.read()
+
+    def store(self, key, content):
+        """
+        Guarda el archivo de forma atómica. No aplica la expulsión; quien guarde
+        varios archivos debe llamar a `evict()` al terminar.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, self.path(key))
+
+    def evict(self):
+        """
+        Elimina los archivos menos usados hasta que el directorio quepa en
+        `max_bytes`.
+        """
+        entries = []
+        total = 0
+        if not os.path.isdir(self.directory):
+            return
+        with os.scandir(self.directory) as files:
+            for entry in files:
+                if not entry.name.endswith(self.EXTENSION):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
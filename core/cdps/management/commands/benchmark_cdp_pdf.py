@@ -0,0 +1,232 @@
+import time
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from xhtml2pdf import pisa
+from core.cdps.generate_pdf import GeneratePdf
+from core.cdps.models import Cdps
+from core.entities.models import Entity
+from core.rubros.models import Rubro
+from core.users.models import User
+
+
+class LegacyGeneratePdf:
+    """
+    Ruta anterior a las plantillas: el HTML se arma con f-strings y xhtml2pdf
+    interpreta sus estilos por defecto y los del documento en cada PDF. Es la
+    versión previa de GeneratePdf, sin el código QR de verificación.
+    """
+
+    def __init__(self, entity, user, dataCdp):
+        self.entity = entity
+        self.user = user
+        self.dataCdp = dataCdp
+
+    def generate_pdf(self):
+        buffer = BytesIO()
+        pisa.CreatePDF(self.metaData().encode("utf-8"), dest=buffer)
+        return buffer.getvalue()
+
+    def metaData(self):
+        html = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1">
+            <title>Generar PDF</title>
+            <style>
+                @page {{
+                    size: letter;
+                    margin: 2cm;
+                    font-family: Arial, sans-serif !important; 
+                }}
+                header {{
+                    font-size: 12px;
+                    align-items: center;
+                }}
+                .table-header,
+                .table-footer {{
+                    width: 100%;
+                    border-collapse: collapse;
+                }}
+                .td-header.no-spacing h1{{
+                    font-size: 16px;
+                }}
+                .td-header.no-spacing h1, 
+                .td-header.no-spacing p {{
+                    margin: 0;
+                    padding: 0;
+                }}
+            </style>
+        </head>
+        <body>
+            <header>
+                {self.headerPdf()}
+            </header>
+            <main>
+                {self.bodyPdf()}
+            </main>
+            <footer>
+                {self.footerPdf()}
+            </footer>
+        </body>
+        </html>
+        """
+        return html
+
+    def headerPdf(self):
+        html = f"""
+        <header>
+            <table class="table-header">
+                <tr>
+                    <td class="td-header" style="width: 100%; text-align: center;">
+                        <h1>{self.entity.name}</h1>
+                        <p>{self.entity.nit}</p>
+                        <p>{self.entity.address}</p>
+                        <p>{self.entity.phone}</p>
+                        <p>{self.entity.email}</p>
+                    </td>
+                </tr>
+            </table>
+        </header>
+        """
+        return html
+
+    def footerPdf(self):
+        html = f"""
+        <footer>
+            <table class="table-footer">
+                <tr>
+                    <td class="td-footer" style="width: 20%; text-align: left;">
+                        <p>Desarrollo</p>
+                    </td>
+                    <td class="td-footer" style="width: 20%; text-align: center;">
+                        <p>Impresión {timezone.localdate().strftime('%d/%m/%Y')}</p>
+                    </td>
+                    <td class="td-footer" style="width: 40%; text-align: center;">
+                        <p>Usuario: {self.user.name} {self.user.last_name}</p>
+                    </td>
+                    <td class="td-footer" style="width: 20%; text-align: right;">
+                        <p>Pagina: 1 de 1 </p>
+                    </td>
+                </tr>
+        </footer>
+        """
+        return html
+
+    def bodyPdf(self):
+        html = f"""
+        <section>
+            <h2 style="text-align: center;">Certificado de Disponibilidad Presupuestal (CDP)</h2>
+            
+            <div style="margin-bottom: 20px;">
+                <strong>Número:</strong> {self.dataCdp.number if self.dataCdp.number else 'No asignado'} <br>
+                <strong>Fecha de Expedición:</strong> {self.dataCdp.expedition_date.strftime('%d/%m/%Y') if self.dataCdp.expedition_date else 'No asignada'} <br>
+                <strong>Monto:</strong> {self.dataCdp.amount if self.dataCdp.amount else 'No especificado'} <br>
+            </div>
+
+            <div style="margin-bottom: 20px;">
+                <strong>Descripción:</strong> <br>
+                <p>{self.dataCdp.description if self.dataCdp.description else 'No especificada'}</p>
+            </div>
+            
+            <div style="margin-bottom: 20px;">
+                <strong>Rubro:</strong> {self.dataCdp.rubro.descripcion if self.dataCdp.rubro else 'No asignado'} <br>
+            </div>
+            
+            <div style="margin-bottom: 20px;">
+                <strong>Estado:</strong> 
+                <ul>
+                    <li><strong>Generado:</strong> {"Sí" if self.dataCdp.is_generated else "No"}</li>
+                    <li><strong>Cancelado:</strong> {"Sí" if self.dataCdp.is_canceled else "No"}</li>
+                </ul>
+            </div>
+
+            <hr style="border: 1px solid #ccc;">
+        </section>
+        """
+        return html
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el tiempo de pared, el tiempo de CPU y los PDFs por segundo "
+        "de los motores de PDF de CDP y de la ruta anterior con xhtml2pdf"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=50,
+            help="Número de PDFs generados por ruta",
+        )
+        parser.add_argument(
+            "--cdp-id",
+            help="CDP a generar (por defecto uno de ejemplo que no se guarda)",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations debe ser mayor que 0")
+
+        entity, user, cdp = self.get_data(options["cdp_id"])
+        routes = {
+            "anterior": LegacyGeneratePdf(entity, user, cdp).generate_pdf,
+            **{
+                engine: GeneratePdf(entity, user, cdp, engine).generate_pdf
+                for engine in GeneratePdf.ENGINES
+            },
+        }
+
+        results = {}
+        for name, render in routes.items():
+            # Primera generación fuera de la medición (carga de plantillas y fuentes)
+            render()
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            for _ in range(options["iterations"]):
+                render()
+            wall = (time.perf_counter() - wall_start) / options["iterations"]
+            cpu = (time.process_time() - cpu_start) / options["iterations"]
+            results[name] = wall
+            self.stdout.write(
+                f"{name:>10}: {wall * 1000:8.2f} ms/PDF, "
+                f"CPU {cpu * 1000:8.2f} ms/PDF, {1 / wall:8.1f} PDFs/s"
+            )
+
+        for engine in GeneratePdf.ENGINES:
+            speedup = results["anterior"] / results[engine]
+            self.stdout.write(
+                self.style.SUCCESS(f"Mejora de {engine} sobre anterior: {speedup:.2f}x")
+            )
+
+    def get_data(self, cdp_id):
+        if cdp_id:
+            try:
+                cdp = Cdps.objects.select_related("rubro").get(id=cdp_id)
+            except Cdps.DoesNotExist:
+                raise CommandError("CDP no encontrado")
+            user = User.objects.select_related("entity").exclude(entity=None).first()
+            if user is None:
+                raise CommandError("No hay usuarios con entidad")
+            return user.entity, user, cdp
+
+        entity = Entity(
+            name="Entidad de ejemplo",
+            nit="900000000-1",
+            address="Calle 1 # 2-3",
+            phone="3000000000",
+            email="entidad@example.com",
+        )
+        user = User(name="Usuario", last_name="Ejemplo", entity=entity)
+        cdp = Cdps(
+            number="CDP-001",
+            expedition_date=date.today(),
+            amount=Decimal("1500000.00"),
+            description="CDP de ejemplo",
+            rubro=Rubro(descripcion="Rubro de ejemplo"),
+        )
+        return entity, user, cdp
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.serialization import BestAvailableEncryption
+from cryptography.hazmat.primitives.serialization.pkcs12 import (
+    serialize_key_and_certificates,
+)
+from cryptography.x509.oid import NameOID
+from core.cdps.generate_pdf import GeneratePdf
+from core.cdps.signing import SigningSession
+from .benchmark_cdp_pdf import Command as PdfBenchmarkCommand
+
+SAMPLE_PASSWORD = "benchmark"
+
+
+def write_sample_pkcs12(path):
+    """
+    Crea una llave y un certificado autofirmado de prueba en formato PKCS#12.
+    """
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Firma de prueba CDP")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=30))
+        .sign(key, hashes.SHA256())
+    )
+    with open(path, "wb") as file:
+        file.write(
+            serialize_key_and_certificates(
+                b"cdp",
+                key,
+                cert,
+                None,
+                BestAvailableEncryption(SAMPLE_PASSWORD.encode()),
+            )
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara las firmas por segundo de los PDFs de CDP creando una sesión "
+        "de firma por documento y reutilizando una sola sesión"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=50,
+            help="Número de PDFs firmados por ruta",
+        )
+        parser.add_argument(
+            "--cdp-id",
+            help="CDP a firmar (por defecto uno de ejemplo que no se guarda)",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations debe ser mayor que 0")
+
+        entity, user, cdp = PdfBenchmarkCommand().get_data(options["cdp_id"])
+        pdf = GeneratePdf(entity, user, cdp).generate_pdf()
+
+        with tempfile.TemporaryDirectory() as directory:
+            if settings.CDP_SIGNING_PKCS12_PATH:
+                pkcs12_path = settings.CDP_SIGNING_PKCS12_PATH
+                passphrase = settings.CDP_SIGNING_PKCS12_PASSWORD
+            else:
+                self.stdout.write("Sin llave configurada, se usa una de prueba")
+                pkcs12_path = os.path.join(directory, "benchmark.p12")
+                passphrase = SAMPLE_PASSWORD
+                write_sample_pkcs12(pkcs12_path)
+
+            session = SigningSession(pkcs12_path, passphrase)
+            routes = {
+                "sin reuso": lambda: SigningSession(pkcs12_path, passphrase).sign(pdf),
+                "con reuso": lambda: session.sign(pdf),
+            }
+
+            results = {}
+            for name, sign in routes.items():
+                sign()
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                for _ in range(options["iterations"]):
+                    sign()
+                wall = (time.perf_counter() - wall_start) / options["iterations"]
+                cpu = (time.process_time() - cpu_start) / options["iterations"]
+                results[name] = wall
+                self.stdout.write(
+                    f"{name:>10}: {wall * 1000:8.2f} ms/firma, "
+                    f"CPU {cpu * 1000:8.2f} ms/firma, {1 / wall:8.1f} firmas/s"
+                )
+
+        speedup = results["sin reuso"] / results["con reuso"]
+        self.stdout.write(
+            self.style.SUCCESS(f"Mejora al reutilizar la sesión: {speedup:.2f}x")
+        )
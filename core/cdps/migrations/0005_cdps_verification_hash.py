@@ -0,0 +1,56 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:44
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.utils.crypto import salted_hmac
+
+
+def verification_hash(cdp):
+    # Copia de Cdps.compute_verification_hash al momento de esta migración
+    amount = cdp.amount
+    if amount is not None:
+        amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+    parts = (
+        cdp.id,
+        cdp.number,
+        cdp.expedition_date,
+        amount,
+        cdp.description,
+        cdp.rubro_id,
+        cdp.is_generated,
+        cdp.is_canceled,
+    )
+    return salted_hmac(
+        "cdps.verification", "|".join(map(str, parts)), algorithm="sha256"
+    ).hexdigest()[:32]
+
+
+def fill_verification_hash(apps, schema_editor):
+    Cdps = apps.get_model("cdps", "Cdps")
+    cdps = list(Cdps.objects.all())
+    for cdp in cdps:
+        cdp.verification_hash = verification_hash(cdp)
+    Cdps.objects.bulk_update(cdps, ["verification_hash"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cdps", "0004_alter_cdps_amount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cdps",
+            name="verification_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                unique=True,
+                verbose_name="verification_hash",
+            ),
+        ),
+        migrations.RunPython(fill_verification_hash, migrations.RunPython.noop),
+    ]
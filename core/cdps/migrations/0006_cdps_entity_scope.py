@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:15
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activities", "0003_activities_entity_scope"),
+        ("cdps", "0005_cdps_verification_hash"),
+        ("rubros", "0002_rubros_entity_scope"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="cdps",
+            options={"default_manager_name": "all_objects", "ordering": ["id"]},
+        ),
+        migrations.AlterModelManagers(
+            name="cdps",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="cdps",
+            index=models.Index(fields=["activity", "id"], name="cdps_activity_idx"),
+        ),
+    ]
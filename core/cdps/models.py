@@ -1,7 +1,10 @@
 import uuid
+from decimal import Decimal
 from django.db import models
+from django.utils.crypto import salted_hmac
 from core.rubros.models import Rubro
 from core.activities.models import Activity
+from core.entities.tenancy import EntityScopedManager
 
 
 # Create your models here.
@@ -21,10 +24,55 @@ class Cdps(models.Model):
     activity = models.ForeignKey(
         Activity, on_delete=models.SET_NULL, null=True, blank=True
     )
+    # Hash del contenido que va en el código QR del PDF; cambia con cada
+    # versión del CDP, así un PDF impreso solo se verifica si sigue vigente
+    verification_hash = models.CharField(
+        "verification_hash",
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    all_objects = models.Manager()
+    # Restringido a la entidad de la solicitud (core.entities.tenancy)
+    objects = EntityScopedManager("activity__project__entity")
+
     class Meta:
         db_table = "cdps"
         ordering = ["id"]
+        default_manager_name = "all_objects"
+        indexes = [models.Index(fields=["activity", "id"], name="cdps_activity_idx")]
+
+    def compute_verification_hash(self):
+        """
+        HMAC (con SECRET_KEY) de los datos que muestra el certificado, para que
+        los códigos no se puedan adivinar a partir de los datos del CDP.
+        """
+        amount = self.amount
+        if amount is not None:
+            amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+        parts = (
+            self.id,
+            self.number,
+            self.expedition_date,
+            amount,
+            self.description,
+            self.rubro_id,
+            self.is_generated,
+            self.is_canceled,
+        )
+        return salted_hmac(
+            "cdps.verification", "|".join(map(str, parts)), algorithm="sha256"
+        ).hexdigest()[:32]
+
+    def save(self, *args, **kwargs):
+        self.verification_hash = self.compute_verification_hash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "verification_hash"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,46 @@
+import hashlib
+import os
+from django.conf import settings
+from django.utils import timezone
+from .file_cache import FileCache
+from .generate_pdf import GeneratePdf
+
+
+class PdfCache(FileCache):
+    """
+    Caché en disco de los PDFs de CDP generados, bajo MEDIA_ROOT.
+
+    Cada archivo se nombra con un hash de todo lo que afecta al documento, así
+    un PDF solo se vuelve a generar cuando cambia alguno de sus datos.
+    """
+
+    EXTENSION = ".pdf"
+
+    def __init__(self, directory=None, max_bytes=None):
+        super().__init__(
+            directory or os.path.join(settings.MEDIA_ROOT, "cache", "cdps"),
+            max_bytes or settings.CDP_PDF_CACHE_MAX_BYTES,
+        )
+
+    def key(self, cdp, entity, user, signed=False):
+        """
+        Hash de las entradas del documento: el CDP y su rubro, la entidad, el
+        usuario (su nombre va en el pie), la fecha de impresión, el motor, la
+        URL de verificación del QR, la versión de la plantilla y si va firmado
+        (y con qué llave).
+        """
+        parts = (
+            cdp.id,
+            cdp.updated_at,
+            cdp.rubro.updated_at if cdp.rubro else None,
+            entity.id,
+            entity.updated_at,
+            user.id,
+            user.updated_at,
+            timezone.localdate(),
+            settings.CDP_PDF_ENGINE,
+            settings.CDP_VERIFY_BASE_URL,
+            GeneratePdf.TEMPLATE_VERSION,
+            settings.CDP_SIGNING_PKCS12_PATH if signed else "",
+        )
+        return hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
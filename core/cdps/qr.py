@@ -0,0 +1,64 @@
+import hashlib
+import os
+from io import BytesIO
+from urllib.parse import urlencode
+import qrcode
+from django.conf import settings
+from django.urls import reverse
+from .file_cache import FileCache
+
+
+class QrImageCache(FileCache):
+    """
+    Caché en disco de las imágenes PNG de los códigos QR de verificación.
+
+    La clave es un hash de la URL, que incluye el hash de verificación del
+    CDP, así cada imagen se genera una sola vez por versión del CDP y los PDFs
+    que se vuelven a generar solo la leen.
+    """
+
+    EXTENSION = ".png"
+
+    def __init__(self, directory=None, max_bytes=None):
+        super().__init__(
+            directory or os.path.join(settings.MEDIA_ROOT, "cache", "qr"),
+            max_bytes or settings.CDP_PDF_CACHE_MAX_BYTES,
+        )
+
+
+def get_verification_url(cdp):
+    """
+    URL pública de verificación con el hash de verificación y el número del CDP.
+    Los CDPs que no se han guardado (por ejemplo, en el benchmark) usan el hash
+    calculado al momento.
+    """
+    verification_hash = cdp.verification_hash or cdp.compute_verification_hash()
+    path = reverse("cdp_verify_view", args=[verification_hash])
+    query = urlencode({"number": cdp.number}) if cdp.number else ""
+    return f"{settings.CDP_VERIFY_BASE_URL}{path}{'?' if query else ''}{query}"
+
+
+def render_qr_png(data):
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=4, border=2
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    buffer = BytesIO()
+    qr.make_image().save(buffer)
+    return buffer.getvalue()
+
+
+def get_qr_image_path(url):
+    """
+    Ruta de la imagen del código QR de `url`, generándola si no está en caché.
+    """
+    qr_cache = QrImageCache()
+    key = hashlib.sha256(url.encode()).hexdigest()
+    cached_file = qr_cache.open_cached(key)
+    if cached_file is None:
+        qr_cache.store(key, render_qr_png(url))
+        qr_cache.evict()
+    else:
+        cached_file.close()
+    return qr_cache.path(key)
@@ -0,0 +1,220 @@
+from io import BytesIO
+from django.utils import timezone
+from django.utils.html import escape
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import (
+    BaseDocTemplate,
+    Frame,
+    HRFlowable,
+    Image,
+    PageTemplate,
+    Paragraph,
+    Table,
+    TableStyle,
+)
+from .qr import get_qr_image_path, get_verification_url
+
+# Medidas tomadas del PDF que genera xhtml2pdf con cdps/cdp.html (en puntos),
+# para que ambos motores produzcan el mismo diseño
+MARGIN = 2 * cm
+HEADER_STYLES = {
+    "title": ParagraphStyle(
+        "cdp-header-title",
+        fontName="Helvetica-Bold",
+        fontSize=12.465,
+        leading=18.6975,
+        alignment=TA_CENTER,
+        spaceAfter=12.465,
+    ),
+    "line": ParagraphStyle(
+        "cdp-header-line",
+        fontName="Helvetica",
+        fontSize=9,
+        leading=13.5,
+        alignment=TA_CENTER,
+        spaceAfter=9,
+    ),
+}
+TITLE_STYLE = ParagraphStyle(
+    "cdp-title",
+    fontName="Helvetica-Bold",
+    fontSize=9.2325,
+    leading=13.84875,
+    alignment=TA_CENTER,
+    spaceBefore=11.2325,
+)
+BODY_STYLE = ParagraphStyle(
+    "cdp-body",
+    fontName="Helvetica",
+    fontSize=7.5,
+    leading=11.25,
+    spaceBefore=17,
+)
+FIELDS_STYLE = ParagraphStyle("cdp-fields", parent=BODY_STYLE, spaceBefore=11.2325)
+RUBRO_STYLE = ParagraphStyle("cdp-rubro", parent=BODY_STYLE, spaceBefore=9.5)
+BULLET_STYLE = ParagraphStyle(
+    "cdp-bullet",
+    parent=BODY_STYLE,
+    leftIndent=11.25,
+    bulletIndent=0,
+    bulletFontName="Helvetica",
+    bulletFontSize=7.5,
+)
+FOOTER_STYLES = [
+    ParagraphStyle(
+        f"cdp-footer-{alignment}",
+        fontName="Helvetica",
+        fontSize=7.5,
+        leading=11.25,
+        alignment=alignment,
+    )
+    for alignment in (TA_LEFT, TA_CENTER, TA_CENTER, TA_RIGHT)
+]
+FOOTER_WIDTHS = (0.2, 0.2, 0.4, 0.2)
+QR_SIZE = 60
+VERIFICATION_WIDTHS = (0.25, 0.75)
+VERIFICATION_STYLE = ParagraphStyle(
+    "cdp-verification", parent=BODY_STYLE, spaceBefore=0, spaceAfter=7.5
+)
+NO_PADDING = TableStyle(
+    [
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+        ("TOPPADDING", (0, 0), (-1, -1), 0),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]
+)
+
+
+def field(label, value):
+    return f"<b>{escape(label)}:</b> {escape(value)}"
+
+
+class CdpReportlabPdf:
+    """
+    Dibuja el certificado del CDP directamente con flowables de ReportLab, sin
+    pasar por HTML. Reproduce el diseño de la plantilla cdps/cdp.html.
+    """
+
+    def __init__(self, entity, user, dataCdp):
+        self.entity = entity
+        self.user = user
+        self.dataCdp = dataCdp
+
+    def build(self):
+        buffer = BytesIO()
+        width, height = letter
+        frame = Frame(
+            MARGIN,
+            MARGIN,
+            width - 2 * MARGIN,
+            height - 2 * MARGIN,
+            leftPadding=0,
+            rightPadding=0,
+            topPadding=0,
+            bottomPadding=0,
+        )
+        doc = BaseDocTemplate(
+            buffer,
+            pagesize=letter,
+            pageTemplates=[PageTemplate(id="body", frames=[frame])],
+        )
+        doc.build(self.story(frame.width))
+        return buffer.getvalue()
+
+    def story(self, width):
+        cdp = self.dataCdp
+        expedition_date = (
+            cdp.expedition_date.strftime("%d/%m/%Y")
+            if cdp.expedition_date
+            else "No asignada"
+        )
+        return [
+            self.header(width),
+            Paragraph("Certificado de Disponibilidad Presupuestal (CDP)", TITLE_STYLE),
+            Paragraph(
+                "<br/>".join(
+                    [
+                        field("Número", cdp.number or "No asignado"),
+                        field("Fecha de Expedición", expedition_date),
+                        field("Monto", str(cdp.amount or "No especificado")),
+                    ]
+                ),
+                FIELDS_STYLE,
+            ),
+            Paragraph("<b>Descripción:</b>", BODY_STYLE),
+            Paragraph(escape(cdp.description or "No especificada"), BODY_STYLE),
+            Paragraph(
+                field("Rubro", cdp.rubro.descripcion if cdp.rubro else "No asignado"),
+                RUBRO_STYLE,
+            ),
+            Paragraph("<b>Estado:</b>", BODY_STYLE),
+            Paragraph(
+                field("Generado", "Sí" if cdp.is_generated else "No"),
+                BULLET_STYLE,
+                bulletText="•",
+            ),
+            Paragraph(
+                field("Cancelado", "Sí" if cdp.is_canceled else "No"),
+                BULLET_STYLE,
+                bulletText="•",
+            ),
+            self.verification(width),
+            HRFlowable(
+                width="100%",
+                thickness=1,
+                color=colors.black,
+                spaceBefore=7.5,
+                spaceAfter=7.5,
+            ),
+            self.footer(width),
+        ]
+
+    def header(self, width):
+        entity = self.entity
+        cell = [Paragraph(escape(entity.name), HEADER_STYLES["title"])] + [
+            Paragraph(escape(value), HEADER_STYLES["line"])
+            for value in (entity.nit, entity.address, entity.phone, entity.email)
+        ]
+        return Table([[cell]], colWidths=[width], style=NO_PADDING)
+
+    def verification(self, width):
+        verification_url = get_verification_url(self.dataCdp)
+        image = Image(get_qr_image_path(verification_url), QR_SIZE, QR_SIZE)
+        image.hAlign = "LEFT"
+        texts = [
+            Paragraph(
+                "Verifique la autenticidad de este CDP escaneando el código QR o en:",
+                VERIFICATION_STYLE,
+            ),
+            Paragraph(escape(verification_url), VERIFICATION_STYLE),
+        ]
+        return Table(
+            [[image, texts]],
+            colWidths=[width * share for share in VERIFICATION_WIDTHS],
+            style=TableStyle(
+                [*NO_PADDING.getCommands(), ("VALIGN", (0, 0), (-1, -1), "MIDDLE")]
+            ),
+            spaceBefore=31,
+        )
+
+    def footer(self, width):
+        texts = [
+            "Desarrollo",
+            f"Impresión {timezone.localdate().strftime('%d/%m/%Y')}",
+            f"Usuario: {self.user.name} {self.user.last_name}",
+            "Pagina: 1 de 1",
+        ]
+        row = [
+            Paragraph(escape(text), style) for text, style in zip(texts, FOOTER_STYLES)
+        ]
+        return Table(
+            [row],
+            colWidths=[width * share for share in FOOTER_WIDTHS],
+            style=NO_PADDING,
+        )
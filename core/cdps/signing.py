@@ -0,0 +1,111 @@
+import threading
+from io import BytesIO
+from django.conf import settings
+from pyhanko.keys import load_certs_from_pemder
+from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+from pyhanko.sign import fields, signers
+from pyhanko_certvalidator import ValidationContext
+
+SIGNATURE_FIELD = "FirmaCDP"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def is_signing_enabled():
+    return bool(settings.CDP_SIGNING_PKCS12_PATH)
+
+
+class SigningSession:
+    """
+    Firma PAdES con la llave PKCS#12 configurada.
+
+    Cargar el PKCS#12 (descifrar la llave) y armar el contexto de validación
+    es lo más costoso de firmar, así que una sesión se crea una vez por
+    proceso y se reutiliza para todos los documentos (ver
+    `get_signing_session`). El contexto de validación además guarda las
+    respuestas OCSP/CRL ya descargadas.
+
+    Para la firma LTV la cadena se valida contra las CA raíz de
+    CDP_SIGNING_TRUST_ROOTS, nunca contra el certificado firmante; los
+    certificados intermedios del PKCS#12 solo se usan para armar la cadena.
+    """
+
+    def __init__(
+        self,
+        pkcs12_path=None,
+        passphrase=None,
+        embed_validation_info=None,
+        trust_roots_path=None,
+    ):
+        pkcs12_path = pkcs12_path or settings.CDP_SIGNING_PKCS12_PATH
+        if passphrase is None:
+            passphrase = settings.CDP_SIGNING_PKCS12_PASSWORD
+        if embed_validation_info is None:
+            embed_validation_info = settings.CDP_SIGNING_EMBED_VALIDATION_INFO
+        trust_roots_path = trust_roots_path or settings.CDP_SIGNING_TRUST_ROOTS
+
+        self.signer = signers.SimpleSigner.load_pkcs12(
+            pkcs12_path, passphrase=passphrase.encode() if passphrase else None
+        )
+        if self.signer is None:
+            raise ValueError("No se pudo cargar la llave PKCS#12 de firma")
+
+        validation_context = None
+        if embed_validation_info:
+            if not trust_roots_path:
+                raise ValueError(
+                    "La firma con información de validación requiere "
+                    "CDP_SIGNING_TRUST_ROOTS"
+                )
+            trust_roots = list(load_certs_from_pemder([trust_roots_path]))
+            if not trust_roots:
+                raise ValueError("CDP_SIGNING_TRUST_ROOTS no tiene certificados")
+            validation_context = ValidationContext(
+                trust_roots=trust_roots,
+                other_certs=[
+                    cert
+                    for cert in self.signer.cert_registry
+                    if cert != self.signer.signing_cert
+                ],
+                allow_fetching=True,
+            )
+        self.pdf_signer = signers.PdfSigner(
+            signers.PdfSignatureMetadata(
+                field_name=SIGNATURE_FIELD,
+                md_algorithm="sha256",
+                subfilter=fields.SigSeedSubFilter.PADES,
+                embed_validation_info=embed_validation_info,
+                validation_context=validation_context,
+            ),
+            signer=self.signer,
+        )
+
+    def sign(self, pdf):
+        """
+        @param pdf: bytes del PDF sin firmar
+        @return: bytes del PDF firmado
+        """
+        output = BytesIO()
+        self.sign_file(BytesIO(pdf), output)
+        return output.getvalue()
+
+    def sign_file(self, input_file, output):
+        """
+        Firma un PDF que está en un archivo, sin leerlo completo en memoria.
+        @param input_file: archivo binario con el PDF sin firmar
+        @param output: archivo binario donde se escribe el PDF firmado
+        """
+        self.pdf_signer.sign_pdf(IncrementalPdfFileWriter(input_file), output=output)
+
+
+def get_signing_session():
+    """
+    Sesión de firma del proceso, creada la primera vez que se usa.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = SigningSession()
+    return _session
@@ -1,3 +1,106 @@
+import tempfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal
+from unittest import mock
 from django.test import TestCase
+from core.activities.models import Activity
+from core.entities.models import Entity
+from core.rubros.models import Rubro
+from core.users.models import User
+from . import batch
+from .models import Cdps
+from .pdf_cache import PdfCache
+from .utils import CdpsBulkProcessor
 
-# Create your tests here.
+
+class FakePool:
+    """
+    Pool que genera en el mismo proceso o, si está roto, falla como un
+    ProcessPoolExecutor cuyo proceso hijo terminó.
+    """
+
+    def __init__(self, broken):
+        self.broken = broken
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool("proceso terminado"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+def render(entity, user, cdp, sign=False):
+    return f"%PDF-{cdp.number}".encode()
+
+
+class CdpsBatchRendererPoolTests(TestCase):
+    def setUp(self):
+        self.entity = Entity.objects.create(name="Entidad")
+        self.user = User.objects.create(email="usuario@example.com", identification="1")
+        self.cdps = [Cdps.objects.create(number=str(index)) for index in range(3)]
+        batch._render_pool = None
+        self.addCleanup(setattr, batch, "_render_pool", None)
+
+    def render_all(self, pools):
+        renderer = batch.CdpsBatchRenderer(self.cdps, self.entity, self.user)
+        renderer.pdf_cache = PdfCache(tempfile.mkdtemp())
+        with mock.patch.object(
+            batch, "ProcessPoolExecutor", side_effect=pools
+        ), mock.patch.object(batch, "render_cdp_pdf", render):
+            return sorted(pdf for _, _, pdf in renderer.iter_pdfs())
+
+    def test_broken_pool_is_replaced(self):
+        healthy = FakePool(broken=False)
+        pdfs = self.render_all([FakePool(broken=True), healthy])
+        self.assertEqual(pdfs, [b"%PDF-0", b"%PDF-1", b"%PDF-2"])
+        self.assertIs(batch._render_pool, healthy)
+
+    def test_pool_broken_twice_fails_with_a_clear_error(self):
+        with self.assertRaises(batch.PdfRenderError):
+            self.render_all([FakePool(broken=True), FakePool(broken=True)])
+        self.assertIsNone(batch._render_pool)
+
+
+class CdpsBulkProcessorTests(TestCase):
+    def setUp(self):
+        self.rubro = Rubro.objects.create(value_sgr=1000)
+        self.activity = Activity.objects.create(rubro=self.rubro)
+
+    def item(self, **fields):
+        return {
+            "amount": "10",
+            "rubro_id": str(self.rubro.id),
+            "activity_id": str(self.activity.id),
+            **fields,
+        }
+
+    def test_invalid_items_fail_alone(self):
+        results = CdpsBulkProcessor(
+            [
+                self.item(amount="NaN"),
+                self.item(amount="1e30"),
+                self.item(amount="1.005"),
+                self.item(is_generated="maybe"),
+                self.item(amount="12.50", is_canceled=True),
+            ]
+        ).process()
+
+        self.assertEqual(
+            [result["errors"] for result in results[:4]],
+            [
+                ["El monto no es un número finito"],
+                ["El monto admite hasta 18 dígitos enteros"],
+                ["El monto admite hasta 2 decimales"],
+                ["El campo 'is_generated' debe ser true o false"],
+            ],
+        )
+        self.assertTrue(results[4]["success"])
+        cdp = Cdps.objects.get(id=results[4]["cdp_id"])
+        self.assertEqual(cdp.amount, Decimal("12.50"))
+        self.assertTrue(cdp.is_canceled)
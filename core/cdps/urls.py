@@ -3,10 +3,26 @@ from . import views
 
 urlpatterns = [
     path("cdps", views.CdpsView.as_view(), name="cdps_view"),
+    path("cdps/bulk", views.CdpsBulkView.as_view(), name="cdps_bulk_view"),
+    path(
+        "cdps/verify/<str:verification_hash>",
+        views.CdpsVerifyView.as_view(),
+        name="cdp_verify_view",
+    ),
     path("cdps/<uuid:cdp_id>", views.CdpsDetailView.as_view(), name="cdp_detail_view"),
     path(
         "cdps/<uuid:cdps_id>/user/<uuid:user_id>",
         views.CdpsGeneratePdf.as_view(),
         name="cdp_pdf_view",
     ),
+    path(
+        "projects/<uuid:project_id>/cdps.pdf",
+        views.CdpsProjectPdfView.as_view(),
+        name="cdps_project_pdf_view",
+    ),
+    path(
+        "projects/<uuid:project_id>/cdps.zip",
+        views.CdpsProjectZipView.as_view(),
+        name="cdps_project_zip_view",
+    ),
 ]
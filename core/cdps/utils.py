@@ -0,0 +1,185 @@
+import uuid
+from decimal import Decimal, InvalidOperation
+from django.core.exceptions import ValidationError
+from django.core.validators import DecimalValidator
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils.dateparse import parse_date
+from core.rubros.models import Rubro
+from core.activities.models import Activity
+from core.movements.models import Movement
+from .models import Cdps
+
+
+def clean_amount(value, field):
+    """
+    Convierte un monto al Decimal que guarda la columna de `field`.
+
+    @param field: DecimalField del modelo, p. ej. Cdps._meta.get_field("amount")
+    @raise ValueError: con el motivo, si no es un número finito o no cabe en
+    numeric(max_digits, decimal_places)
+    """
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError("no es un número válido")
+    if not amount.is_finite():
+        raise ValueError("no es un número finito")
+    try:
+        DecimalValidator(field.max_digits, field.decimal_places)(amount)
+    except ValidationError as e:
+        if e.code == "max_decimal_places":
+            raise ValueError(f"admite hasta {field.decimal_places} decimales")
+        whole_digits = field.max_digits - field.decimal_places
+        raise ValueError(f"admite hasta {whole_digits} dígitos enteros")
+    return amount
+
+
+class CdpsBulkProcessor:
+    """
+    Crea varios CDPs en una sola operación.
+
+    Las rubros y actividades referenciadas se validan con una consulta `id__in`
+    cada una, los CDPs y sus movimientos iniciales se insertan con `bulk_create`
+    y los descuentos de cada rubro se aplican agregados en un único UPDATE.
+    """
+
+    REQUIRED_FIELDS = ("amount", "rubro_id", "activity_id")
+    BOOLEAN_FIELDS = ("is_generated", "is_canceled")
+
+    def __init__(self, items):
+        self.items = items
+
+    def process(self):
+        """
+        Valida e inserta los CDPs.
+        @return: lista con el resultado de cada elemento, en el orden recibido
+        """
+        results = [None] * len(self.items)
+        parsed = {}
+
+        for index, item in enumerate(self.items):
+            errors = self.validate_item(item)
+            if errors:
+                results[index] = {"index": index, "success": False, "errors": errors}
+            else:
+                parsed[index] = self.parse_item(item)
+
+        rubro_ids = {data["rubro_id"] for data in parsed.values()}
+        activity_ids = {data["activity_id"] for data in parsed.values()}
+        existing_rubros = set(
+            Rubro.objects.filter(id__in=rubro_ids).values_list("id", flat=True)
+        )
+        existing_activities = set(
+            Activity.objects.filter(id__in=activity_ids).values_list("id", flat=True)
+        )
+
+        cdps = {}
+        for index, data in parsed.items():
+            errors = []
+            if data["rubro_id"] not in existing_rubros:
+                errors.append("Rubro no encontrado")
+            if data["activity_id"] not in existing_activities:
+                errors.append("Actividad no encontrada")
+            if errors:
+                results[index] = {"index": index, "success": False, "errors": errors}
+                continue
+            cdp = Cdps(**data)
+            # bulk_create no llama a save(), que es donde se calcula el hash
+            cdp.verification_hash = cdp.compute_verification_hash()
+            cdps[index] = cdp
+
+        if cdps:
+            with transaction.atomic():
+                Cdps.objects.bulk_create(cdps.values())
+                movements = Movement.objects.bulk_create(
+                    [
+                        Movement(
+                            amount=cdp.amount,
+                            description=cdp.description,
+                            type="I",
+                            cdp_id=cdp.id,
+                        )
+                        for cdp in cdps.values()
+                    ]
+                )
+                self.decrement_rubros(cdps.values())
+
+            for (index, cdp), movement in zip(cdps.items(), movements):
+                results[index] = {
+                    "index": index,
+                    "success": True,
+                    "cdp_id": cdp.id,
+                    "movement_id": movement.id,
+                }
+
+        return results
+
+    def validate_item(self, item):
+        """
+        Valida los campos de un elemento sin consultar la base de datos.
+        @return: lista de errores (vacía si el elemento es válido)
+        """
+        if not isinstance(item, dict):
+            return ["El elemento debe ser un objeto"]
+
+        errors = [
+            f"El campo '{field}' es obligatorio"
+            for field in self.REQUIRED_FIELDS
+            if item.get(field) in (None, "")
+        ]
+        if errors:
+            return errors
+
+        try:
+            clean_amount(item["amount"], Cdps._meta.get_field("amount"))
+        except ValueError as e:
+            errors.append(f"El monto {e}")
+        for field in self.BOOLEAN_FIELDS:
+            if not isinstance(item.get(field, False), bool):
+                errors.append(f"El campo '{field}' debe ser true o false")
+        if item.get("expedition_date"):
+            try:
+                if parse_date(str(item["expedition_date"])) is None:
+                    raise ValueError
+            except ValueError:
+                errors.append("La fecha de expedición no es válida (YYYY-MM-DD)")
+        for field in ("rubro_id", "activity_id"):
+            try:
+                uuid.UUID(str(item[field]))
+            except ValueError:
+                errors.append(f"El campo '{field}' no es un UUID válido")
+        return errors
+
+    def parse_item(self, item):
+        return {
+            "number": item.get("number"),
+            "expedition_date": item.get("expedition_date"),
+            "amount": clean_amount(item["amount"], Cdps._meta.get_field("amount")),
+            "description": item.get("description"),
+            "is_generated": item.get("is_generated", False),
+            "is_canceled": item.get("is_canceled", False),
+            "rubro_id": uuid.UUID(str(item["rubro_id"])),
+            "activity_id": uuid.UUID(str(item["activity_id"])),
+        }
+
+    def decrement_rubros(self, cdps):
+        """
+        Descuenta de cada rubro la suma de los montos de sus CDPs en un solo UPDATE.
+        """
+        totals = {}
+        for cdp in cdps:
+            totals[cdp.rubro_id] = totals.get(cdp.rubro_id, Decimal(0)) + cdp.amount
+
+        output_field = Rubro._meta.get_field("value_sgr")
+        Rubro.objects.filter(id__in=totals.keys()).update(
+            value_sgr=F("value_sgr")
+            - Case(
+                *[
+                    When(id=rubro_id, then=Value(total, output_field=output_field))
+                    for rubro_id, total in totals.items()
+                ],
+                default=Value(0, output_field=output_field),
+                output_field=output_field,
+            )
+        )
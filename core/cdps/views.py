@@ -1,3 +1,4 @@
+import os
 from rest_framework import status
 from rest_framework.response import Response
 from .models import Cdps
@@ -12,7 +13,17 @@ from core.users.models import User
 from core.entities.models import Entity
 from core.activities.models import Activity
 from .generate_pdf import GeneratePdf
-from django.http import HttpResponse
+from .utils import CdpsBulkProcessor
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .pdf_cache import PdfCache
+from .batch import CdpsBatchRenderer
+from .signing import is_signing_enabled
+from django.conf import settings
+from core.reports.models import ReportJob
+from core.reports.views import job_response_data
+from core.exports.csv_stream import CsvExportMixin, csv_format_parameter, csv_response
 
 
 # Definir el cuerpo de la solicitud para el POST
@@ -47,7 +58,20 @@ cdps_request_body = openapi.Schema(
 )
 
 
-class CdpsView(APIView):
+CDP_CSV_COLUMNS = [
+    ("ID", "id"),
+    ("Número", "number"),
+    ("Expedición", "expedition_date"),
+    ("Monto", "amount"),
+    ("Descripción", "description"),
+    ("Generado", "is_generated"),
+    ("Cancelado", "is_canceled"),
+    ("Rubro", "rubro__descripcion"),
+    ("Actividad", "activity__name"),
+]
+
+
+class CdpsView(CsvExportMixin, APIView):
     """
     Class to handle HTTP requests related to Cdps
 
@@ -59,6 +83,7 @@ class CdpsView(APIView):
     # Documentar el método GET para obtener todos los CDPs
     @swagger_auto_schema(
         operation_description="Obtener todos los CDPs",
+        manual_parameters=[csv_format_parameter],
         responses={
             200: openapi.Response(
                 description="CDPs recuperados correctamente",
@@ -76,6 +101,9 @@ class CdpsView(APIView):
 
         try:
             data = Cdps.objects.all()
+            if self.wants_csv(request):
+                return csv_response(data, CDP_CSV_COLUMNS, "cdps.csv")
+
             cdps_serializer = CdpsSerializer(data, many=True)
 
             return Response(cdps_serializer.data, status=status.HTTP_200_OK)
@@ -151,6 +179,66 @@ class CdpsView(APIView):
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class CdpsBulkView(APIView):
+    """
+    Class to handle the bulk issuance of CDPs
+
+    @methods:
+    - post: Create several CDPs in a single request
+    """
+
+    @swagger_auto_schema(
+        operation_description="Crear varios CDPs en una sola solicitud",
+        request_body=openapi.Schema(type=openapi.TYPE_ARRAY, items=cdps_request_body),
+        responses={
+            201: openapi.Response(description="Todos los CDPs creados correctamente"),
+            207: openapi.Response(
+                description="Algunos CDPs no se crearon, ver el resultado por elemento"
+            ),
+            400: openapi.Response(description="Ningún CDP pudo crearse"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def post(self, request):
+        """
+        Create several CDPs with their initial movements
+        @param request: HTTP request with a list of CDPs
+        @return: JSON response with the result of each CDP
+        """
+
+        data = request.data
+        if not isinstance(data, list) or not data:
+            response = {
+                "message": "Se esperaba una lista de CDPs",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = CdpsBulkProcessor(data).process()
+
+            created = sum(1 for result in results if result["success"])
+            if created == len(results):
+                response_status = status.HTTP_201_CREATED
+            elif created:
+                response_status = status.HTTP_207_MULTI_STATUS
+            else:
+                response_status = status.HTTP_400_BAD_REQUEST
+
+            response = {
+                "created": created,
+                "failed": len(results) - created,
+                "results": results,
+            }
+            return Response(response, status=response_status)
+        except Exception as e:
+            response = {
+                "message": f"Error al crear los cdps: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class CdpsDetailView(APIView):
     """
     Class to handle HTTP requests related to a specific CDP
@@ -295,6 +383,23 @@ class CdpsDetailView(APIView):
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+sign_parameter = openapi.Parameter(
+    "sign",
+    openapi.IN_QUERY,
+    type=openapi.TYPE_BOOLEAN,
+    description="Firmar digitalmente (PAdES) con la llave configurada",
+)
+
+signing_disabled_response = {
+    "message": "La firma digital no está configurada",
+    "status": status.HTTP_400_BAD_REQUEST,
+}
+
+
+def get_sign_param(request):
+    return request.query_params.get("sign", "").lower() in ("1", "true")
+
+
 class CdpsGeneratePdf(APIView):
     """
     Class to handle HTTP requests related to generate PDF from CDP
@@ -305,9 +410,12 @@ class CdpsGeneratePdf(APIView):
 
     @swagger_auto_schema(
         operation_description="Generar PDF a partir de un CDP",
+        manual_parameters=[sign_parameter],
         responses={
             200: openapi.Response(description="PDF generado correctamente"),
-            400: openapi.Response(description="CDP no encontrado"),
+            400: openapi.Response(
+                description="CDP no encontrado o firma digital no configurada"
+            ),
             500: openapi.Response(description="Error interno del servidor"),
         },
     )
@@ -320,16 +428,45 @@ class CdpsGeneratePdf(APIView):
         @return: PDF response
         """
 
-        try:
-            cdp = Cdps.objects.get(id=cdps_id)
-            user = User.objects.get(id=user_id)
-            entity = Entity.objects.get(id=user.entity_id)
+        sign = get_sign_param(request)
+        if sign and not is_signing_enabled():
+            return Response(
+                signing_disabled_response, status=status.HTTP_400_BAD_REQUEST
+            )
 
-            generatePdf = GeneratePdf(entity, user, cdp)
-            pdf = generatePdf.generate_pdf()
+        try:
+            cdp = Cdps.objects.select_related("rubro").get(id=cdps_id)
+            user = User.objects.select_related("entity").get(id=user_id)
+            entity = user.entity
+            if entity is None:
+                raise Entity.DoesNotExist
+
+            # El PDF se sirve desde el caché en disco y solo se genera cuando
+            # cambia alguno de sus datos
+            pdf_cache = PdfCache()
+            key = pdf_cache.key(cdp, entity, user, sign)
+            pdf_file = pdf_cache.open(
+                key, lambda: GeneratePdf(entity, user, cdp, sign=sign).generate_pdf()
+            )
+            etag = f'"{key}"'
+            last_modified = int(os.fstat(pdf_file.fileno()).st_mtime)
 
-            response = HttpResponse(pdf, content_type="application/pdf")
-            response["Content-Disposition"] = 'attachment; filename="cdp.pdf"'
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if not_modified is not None:
+                pdf_file.close()
+                return not_modified
+
+            response = FileResponse(
+                pdf_file,
+                as_attachment=True,
+                filename="cdp.pdf",
+                content_type="application/pdf",
+            )
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            response["Cache-Control"] = "private, no-cache"
             return response
         except Cdps.DoesNotExist:
             response = {
@@ -355,3 +492,251 @@ class CdpsGeneratePdf(APIView):
                 "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
             }
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+user_id_parameter = openapi.Parameter(
+    "user_id",
+    openapi.IN_QUERY,
+    type=openapi.TYPE_STRING,
+    format=openapi.FORMAT_UUID,
+    description="Usuario que aparece en el pie (por defecto el autenticado)",
+)
+
+
+def export_project_cdps(request, project_id, export):
+    """
+    Export every CDP of a project as a single file
+
+    The user printed in the footer is the authenticated user, or the one given
+    with the `user_id` query param.
+
+    @param request: HTTP request
+    @param project_id: Project ID
+    @param export: function that receives the CdpsBatchRenderer and returns
+    the response
+    @return: response of `export`, or JSON response with the error
+    """
+    sign = get_sign_param(request)
+    if sign and not is_signing_enabled():
+        return Response(signing_disabled_response, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        user_id = request.query_params.get("user_id")
+        if user_id:
+            user = User.objects.select_related("entity").get(id=user_id)
+        elif isinstance(request.user, User):
+            user = request.user
+        else:
+            response = {
+                "message": "Usuario no proporcionado",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+        entity = user.entity
+        if entity is None:
+            raise Entity.DoesNotExist
+
+        cdps = list(
+            Cdps.objects.select_related("rubro")
+            .filter(activity__project_id=project_id)
+            .order_by("number", "id")
+        )
+        if not cdps:
+            response = {
+                "message": "El proyecto no tiene cdps",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+
+        return export(CdpsBatchRenderer(cdps, entity, user, sign))
+    except User.DoesNotExist:
+        response = {
+            "message": "Usuario no encontrado",
+            "status": status.HTTP_400_BAD_REQUEST,
+        }
+        return Response(response, status=status.HTTP_400_BAD_REQUEST)
+    except Entity.DoesNotExist:
+        response = {
+            "message": "Entidad no encontrada",
+            "status": status.HTTP_400_BAD_REQUEST,
+        }
+        return Response(response, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        response = {
+            "message": f"Error al exportar los cdps: {str(e)}",
+            "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+        }
+        return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CdpsProjectPdfView(APIView):
+    """
+    Class to export every CDP of a project as one merged PDF
+
+    The merged PDF is built in memory, so projects with more than
+    CDPS_MERGED_PDF_SYNC_MAX CDPs are sent to the report queue and the
+    response is the queued job.
+
+    @methods:
+    - get: Merged PDF with the CDPs of a project
+    """
+
+    @swagger_auto_schema(
+        operation_description="Exportar todos los CDPs de un proyecto en un solo PDF",
+        manual_parameters=[user_id_parameter, sign_parameter],
+        responses={
+            200: openapi.Response(description="PDF generado correctamente"),
+            202: openapi.Response(
+                description="Proyecto con muchos CDPs: reporte encolado"
+            ),
+            400: openapi.Response(
+                description="Usuario o entidad no encontrados, o firma no configurada"
+            ),
+            404: openapi.Response(description="El proyecto no tiene cdps"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, project_id):
+        """
+        Merged PDF with the CDPs of a project
+        @param request: HTTP request
+        @param project_id: Project ID
+        @return: PDF file, or JSON response with the queued report
+        """
+
+        def export(renderer):
+            if len(renderer.cdps) > settings.CDPS_MERGED_PDF_SYNC_MAX:
+                params = {"project_id": str(project_id)}
+                if renderer.sign:
+                    params["sign"] = True
+                job = ReportJob.objects.create(
+                    kind="cdps_pdf", params=params, user=renderer.user
+                )
+                return Response(
+                    job_response_data(request, job), status=status.HTTP_202_ACCEPTED
+                )
+            return FileResponse(
+                renderer.merged_pdf(),
+                as_attachment=True,
+                filename=f"cdps_{project_id}.pdf",
+                content_type="application/pdf",
+            )
+
+        return export_project_cdps(request, project_id, export)
+
+
+class CdpsProjectZipView(APIView):
+    """
+    Class to export every CDP of a project as a ZIP of PDFs
+
+    @methods:
+    - get: ZIP with one PDF per CDP of a project
+    """
+
+    @swagger_auto_schema(
+        operation_description="Exportar todos los CDPs de un proyecto en un ZIP",
+        manual_parameters=[user_id_parameter, sign_parameter],
+        responses={
+            200: openapi.Response(description="ZIP generado correctamente"),
+            400: openapi.Response(
+                description="Usuario o entidad no encontrados, o firma no configurada"
+            ),
+            404: openapi.Response(description="El proyecto no tiene cdps"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, project_id):
+        """
+        ZIP with one PDF per CDP of a project
+        @param request: HTTP request
+        @param project_id: Project ID
+        @return: ZIP file streamed as each PDF is ready
+        """
+
+        def export(renderer):
+            response = StreamingHttpResponse(
+                renderer.iter_zip(), content_type="application/zip"
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="cdps_{project_id}.zip"'
+            )
+            return response
+
+        return export_project_cdps(request, project_id, export)
+
+
+class CdpsVerifyView(APIView):
+    """
+    Class to verify a CDP from the QR code printed on its PDF
+
+    The endpoint is public: the verification hash in the URL is the only
+    credential, and it changes whenever the CDP changes.
+
+    @methods:
+    - get: Verify a CDP
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    @swagger_auto_schema(
+        operation_description="Verificar un CDP a partir del código QR de su PDF",
+        manual_parameters=[
+            openapi.Parameter(
+                "number",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Número del CDP impreso en el código QR",
+            )
+        ],
+        responses={
+            200: openapi.Response(description="CDP vigente"),
+            404: openapi.Response(description="CDP no encontrado o modificado"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, verification_hash):
+        """
+        Verify a CDP
+        @param request: HTTP request
+        @param verification_hash: Verification hash of the CDP
+        @return: JSON response
+        """
+        try:
+            # Vista pública: sin usuario Cdps.objects no devuelve ningún CDP
+            cdp = Cdps.all_objects.select_related(
+                "rubro", "activity__project__entity"
+            ).get(verification_hash=verification_hash)
+            number = request.query_params.get("number")
+            if number is not None and number != (cdp.number or ""):
+                raise Cdps.DoesNotExist
+
+            project = cdp.activity.project if cdp.activity else None
+            entity = project.entity if project else None
+            data = {
+                "valid": True,
+                "number": cdp.number,
+                "expedition_date": cdp.expedition_date,
+                "amount": cdp.amount,
+                "rubro": cdp.rubro.descripcion if cdp.rubro else None,
+                "project": project.name if project else None,
+                "entity": entity.name if entity else None,
+                "is_generated": cdp.is_generated,
+                "is_canceled": cdp.is_canceled,
+            }
+            return Response(data, status=status.HTTP_200_OK)
+        except Cdps.DoesNotExist:
+            response = {
+                "valid": False,
+                "message": "CDP no encontrado o modificado después de su impresión",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response = {
+                "message": f"Error al verificar el cdp: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from core.checkpoints.utils import CheckpointBuilder, PERIODS
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera los checkpoints de saldos por rubro y contrapartida para los "
+        "periodos cerrados que aún no tienen uno"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--period",
+            choices=PERIODS.keys(),
+            default="month",
+            help="Tamaño del periodo entre checkpoints",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Elimina los checkpoints existentes y los recalcula desde el inicio",
+        )
+
+    def handle(self, *args, **options):
+        created = CheckpointBuilder(options["period"]).build(options["rebuild"])
+        self.stdout.write(self.style.SUCCESS(f"{created} checkpoints creados"))
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:25
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('counterparts', '0003_alter_counterpart_project'),
+        ('rubros', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BalanceCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('period_end', models.DateTimeField(verbose_name='period_end')),
+                ('committed', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='committed')),
+                ('executed', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='executed')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('counterpart', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='counterparts.counterpart')),
+                ('rubro', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='rubros.rubro')),
+            ],
+            options={
+                'db_table': 'balance_checkpoints',
+                'ordering': ['period_end'],
+                'constraints': [models.UniqueConstraint(fields=('rubro', 'period_end'), name='unique_rubro_checkpoint'), models.UniqueConstraint(fields=('counterpart', 'period_end'), name='unique_counterpart_checkpoint')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+import uuid
+from django.db import models
+from core.rubros.models import Rubro
+from core.counterparts.models import Counterpart
+
+
+# Create your models here.
+class BalanceCheckpoint(models.Model):
+    """
+    Totales acumulados de un rubro o de una contrapartida hasta `period_end`.
+
+    `committed` es la suma de los CDPs (o ejecuciones de contrapartida) y
+    `executed` la suma de los movimientos de egreso creados antes de esa fecha.
+    """
+
+    id = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False, unique=True
+    )
+    period_end = models.DateTimeField("period_end")
+    committed = models.DecimalField(
+        "committed", max_digits=20, decimal_places=2, default=0
+    )
+    executed = models.DecimalField(
+        "executed", max_digits=20, decimal_places=2, default=0
+    )
+    rubro = models.ForeignKey(Rubro, on_delete=models.CASCADE, null=True, blank=True)
+    counterpart = models.ForeignKey(
+        Counterpart, on_delete=models.CASCADE, null=True, blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "balance_checkpoints"
+        ordering = ["period_end"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["rubro", "period_end"], name="unique_rubro_checkpoint"
+            ),
+            models.UniqueConstraint(
+                fields=["counterpart", "period_end"],
+                name="unique_counterpart_checkpoint",
+            ),
+        ]
@@ -0,0 +1,78 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from core.cdps.models import Cdps
+from core.counterpartExecution.models import CounterpartExecution
+from core.movements.models import Movement
+from core.movementsCounterpart.models import MovementsCounterpart
+from .models import BalanceCheckpoint
+
+
+def cdp_rubro(cdp_id):
+    if cdp_id is None:
+        return None
+    return Cdps.all_objects.filter(id=cdp_id).values_list("rubro_id", flat=True).first()
+
+
+def execution_counterpart(execution_id):
+    if execution_id is None:
+        return None
+    return (
+        CounterpartExecution.objects.filter(id=execution_id)
+        .values_list("counterpart_id", flat=True)
+        .first()
+    )
+
+
+# Para cada modelo que alimenta los checkpoints: el saldo al que pertenece y
+# cómo obtener su rubro o contrapartida
+LEDGER_KEYS = {
+    Cdps: ("rubro", lambda cdp: cdp.rubro_id),
+    Movement: ("rubro", lambda movement: cdp_rubro(movement.cdp_id)),
+    CounterpartExecution: ("counterpart", lambda execution: execution.counterpart_id),
+    MovementsCounterpart: (
+        "counterpart",
+        lambda movement: execution_counterpart(movement.counterpart_execution_id),
+    ),
+}
+
+
+def invalidate_checkpoints(ledger, keys, since):
+    """
+    Elimina los checkpoints de los rubros o contrapartidas `keys` desde
+    `since`; BalanceCalculator usa el anterior más lo creado desde entonces y
+    CheckpointBuilder los vuelve a generar.
+    """
+    keys = {key for key in keys if key is not None}
+    if not keys or since is None:
+        return
+    BalanceCheckpoint.objects.filter(
+        **{f"{ledger}_id__in": keys}, period_end__gte=since
+    ).delete()
+
+
+@receiver(pre_save, sender=Cdps)
+@receiver(pre_save, sender=Movement)
+@receiver(pre_save, sender=CounterpartExecution)
+@receiver(pre_save, sender=MovementsCounterpart)
+def remember_previous_ledger_key(sender, instance, **kwargs):
+    # Al cambiar de rubro o contrapartida también se invalida el anterior
+    instance._previous_ledger_key = None
+    if instance._state.adding:
+        return
+    previous = sender._base_manager.filter(pk=instance.pk).first()
+    if previous is not None:
+        instance._previous_ledger_key = LEDGER_KEYS[sender][1](previous)
+
+
+@receiver(post_save, sender=Cdps)
+@receiver(post_save, sender=Movement)
+@receiver(post_save, sender=CounterpartExecution)
+@receiver(post_save, sender=MovementsCounterpart)
+@receiver(post_delete, sender=Cdps)
+@receiver(post_delete, sender=Movement)
+@receiver(post_delete, sender=CounterpartExecution)
+@receiver(post_delete, sender=MovementsCounterpart)
+def invalidate_ledger_checkpoints(sender, instance, **kwargs):
+    ledger, get_key = LEDGER_KEYS[sender]
+    keys = {get_key(instance), getattr(instance, "_previous_ledger_key", None)}
+    invalidate_checkpoints(ledger, keys, instance.created_at)
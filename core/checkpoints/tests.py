@@ -0,0 +1,55 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.utils import timezone
+from core.cdps.models import Cdps
+from core.movements.models import Movement
+from core.rubros.models import Rubro
+from .models import BalanceCheckpoint
+from .utils import BalanceCalculator, CheckpointBuilder
+
+
+class CheckpointInvalidationTests(TestCase):
+    def setUp(self):
+        self.rubro = Rubro.objects.create(descripcion="Rubro", value_sgr=1000)
+        self.other = Rubro.objects.create(descripcion="Otro", value_sgr=1000)
+        self.cdp = Cdps.objects.create(number="1", amount=100, rubro=self.rubro)
+        self.movement = Movement.objects.create(amount=40, type="E", cdp=self.cdp)
+        past = timezone.now() - timedelta(days=90)
+        Cdps.all_objects.filter(id=self.cdp.id).update(created_at=past)
+        Movement.all_objects.filter(id=self.movement.id).update(created_at=past)
+        self.cdp.refresh_from_db()
+        self.movement.refresh_from_db()
+        CheckpointBuilder(period="month").build()
+
+    def totals(self, rubro):
+        return BalanceCalculator("rubro", rubro).totals_at(timezone.now())
+
+    def test_editing_past_entries_deletes_later_checkpoints(self):
+        self.assertTrue(BalanceCheckpoint.objects.filter(rubro=self.rubro).exists())
+        self.cdp.amount = 150
+        self.cdp.save()
+        self.assertFalse(BalanceCheckpoint.objects.filter(rubro=self.rubro).exists())
+        self.assertEqual(self.totals(self.rubro)["committed"], Decimal(150))
+
+        CheckpointBuilder(period="month").build()
+        self.movement.delete()
+        self.assertEqual(self.totals(self.rubro)["executed"], Decimal(0))
+
+    def test_moving_a_cdp_invalidates_both_rubros(self):
+        self.cdp.rubro = self.other
+        self.cdp.save()
+        self.assertEqual(self.totals(self.rubro)["committed"], Decimal(0))
+        self.assertEqual(self.totals(self.other)["committed"], Decimal(100))
+        self.assertEqual(self.totals(self.other)["executed"], Decimal(40))
+
+    def test_builder_continues_from_historic_totals(self):
+        Cdps.objects.create(number="2", amount=10, rubro=self.rubro)
+        self.cdp.amount = 150
+        self.cdp.save()
+        CheckpointBuilder(
+            period="day", until=timezone.now() + timedelta(days=2)
+        ).build()
+        checkpoint = BalanceCheckpoint.objects.filter(rubro=self.rubro).last()
+        self.assertEqual(checkpoint.committed, Decimal(160))
+        self.assertEqual(checkpoint.executed, Decimal(40))
@@ -0,0 +1,15 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path(
+        "balances/rubros/<uuid:rubro_id>",
+        views.RubroBalanceView.as_view(),
+        name="rubro_balance_view",
+    ),
+    path(
+        "balances/counterparts/<uuid:counterpart_id>",
+        views.CounterpartBalanceView.as_view(),
+        name="counterpart_balance_view",
+    ),
+]
@@ -0,0 +1,220 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from core.cdps.models import Cdps
+from core.movements.models import Movement
+from core.counterpartExecution.models import CounterpartExecution
+from core.movementsCounterpart.models import MovementsCounterpart
+from .models import BalanceCheckpoint
+
+# Para cada tipo de saldo, las consultas que alimentan los totales "committed" y
+# "executed" junto con el campo por el que se agrupan.
+LEDGERS = {
+    "rubro": {
+        "committed": (lambda: Cdps.all_objects.all(), "rubro_id"),
+        "executed": (
+            lambda: Movement.all_objects.filter(type="E"),
+            "cdp__rubro_id",
+        ),
+    },
+    "counterpart": {
+        "committed": (lambda: CounterpartExecution.objects.all(), "counterpart_id"),
+        "executed": (
+            lambda: MovementsCounterpart.objects.filter(type="E"),
+            "counterpart_execution__counterpart_id",
+        ),
+    },
+}
+
+PERIODS = {
+    "day": relativedelta(days=1),
+    "week": relativedelta(weeks=1),
+    "month": relativedelta(months=1),
+}
+
+
+def end_of_day(date):
+    """
+    Devuelve el inicio del día siguiente a `date` en la zona horaria local,
+    que es el límite exclusivo para "saldo al cierre de `date`".
+    """
+    return timezone.make_aware(datetime.combine(date + timedelta(days=1), time.min))
+
+
+def period_boundaries(first, last, period):
+    """
+    Límites de periodo (inicio de día, mes o semana) entre `first` y `last`.
+    """
+    step = PERIODS[period]
+    current = timezone.localtime(first).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    if period == "month":
+        current = current.replace(day=1)
+    elif period == "week":
+        current -= timedelta(days=current.weekday())
+    current += step
+    while current <= last:
+        yield current
+        current += step
+
+
+def sum_by(ledger, kind, start, end, key_value=None):
+    """
+    Suma los montos creados en [start, end) agrupados por rubro o contrapartida.
+    @return: diccionario {id: total}
+    """
+    get_queryset, key = LEDGERS[ledger][kind]
+    queryset = get_queryset().filter(created_at__lt=end)
+    if start is not None:
+        queryset = queryset.filter(created_at__gte=start)
+    if key_value is not None:
+        queryset = queryset.filter(**{key: key_value})
+    rows = queryset.values(key).annotate(total=Sum("amount")).order_by()
+    return {row[key]: row["total"] or Decimal(0) for row in rows if row[key]}
+
+
+class CheckpointBuilder:
+    """
+    Genera los checkpoints que faltan desde el último registrado hasta `until`.
+
+    Cada checkpoint se calcula como el anterior más lo creado durante el
+    periodo, con una consulta agrupada por tabla y periodo. Los rubros o
+    contrapartidas sin checkpoint en el último periodo (p. ej. porque los
+    signals los invalidaron) parten de su total histórico hasta ese periodo.
+    """
+
+    def __init__(self, period="month", until=None):
+        self.period = period
+        self.until = until or timezone.now()
+
+    def build(self, rebuild=False):
+        """
+        @return: número de checkpoints creados
+        """
+        created = 0
+        with transaction.atomic():
+            if rebuild:
+                BalanceCheckpoint.objects.all().delete()
+            for ledger in LEDGERS:
+                created += self.build_ledger(ledger)
+        return created
+
+    def build_ledger(self, ledger):
+        last = (
+            BalanceCheckpoint.objects.filter(**{f"{ledger}__isnull": False})
+            .order_by("-period_end")
+            .first()
+        )
+        if last:
+            start = last.period_end
+            totals = {
+                checkpoint[f"{ledger}_id"]: checkpoint
+                for checkpoint in BalanceCheckpoint.objects.filter(
+                    period_end=last.period_end, **{f"{ledger}__isnull": False}
+                ).values(f"{ledger}_id", "committed", "executed")
+            }
+        else:
+            start = self.first_entry(ledger)
+            if start is None:
+                return 0
+            totals = {}
+
+        checkpoints = []
+        previous = start if last else None
+        for boundary in period_boundaries(start, self.until, self.period):
+            for kind in ("committed", "executed"):
+                for key, amount in sum_by(ledger, kind, previous, boundary).items():
+                    if key not in totals:
+                        totals[key] = self.totals_before(
+                            ledger, key, start if last else None
+                        )
+                    totals[key][kind] += amount
+            checkpoints.extend(
+                BalanceCheckpoint(
+                    period_end=boundary,
+                    committed=total["committed"],
+                    executed=total["executed"],
+                    **{f"{ledger}_id": key},
+                )
+                for key, total in totals.items()
+            )
+            previous = boundary
+
+        BalanceCheckpoint.objects.bulk_create(checkpoints, batch_size=1000)
+        return len(checkpoints)
+
+    def totals_before(self, ledger, key, end):
+        """
+        @return: totales de `key` creados antes de `end`, o en cero sin `end`
+        """
+        totals = {"committed": Decimal(0), "executed": Decimal(0)}
+        if end is not None:
+            for kind in totals:
+                totals[kind] = sum_by(ledger, kind, None, end, key).get(key, Decimal(0))
+        return totals
+
+    def first_entry(self, ledger):
+        dates = [
+            get_queryset()
+            .order_by("created_at")
+            .values_list("created_at", flat=True)
+            .first()
+            for get_queryset, _ in LEDGERS[ledger].values()
+        ]
+        dates = [date for date in dates if date is not None]
+        return min(dates) if dates else None
+
+
+class BalanceCalculator:
+    """
+    Calcula los totales acumulados de un rubro o contrapartida en una fecha
+    como el último checkpoint anterior más lo creado desde entonces.
+    """
+
+    def __init__(self, ledger, obj):
+        self.ledger = ledger
+        self.obj = obj
+
+    def totals_at(self, moment):
+        checkpoint = (
+            BalanceCheckpoint.objects.filter(
+                period_end__lte=moment, **{self.ledger: self.obj}
+            )
+            .order_by("-period_end")
+            .first()
+        )
+        start = checkpoint.period_end if checkpoint else None
+        totals = {}
+        for kind in ("committed", "executed"):
+            base = getattr(checkpoint, kind) if checkpoint else Decimal(0)
+            delta = sum_by(self.ledger, kind, start, moment, self.obj.id)
+            totals[kind] = base + delta.get(self.obj.id, Decimal(0))
+        return totals
+
+    def balance_at(self, date):
+        """
+        Saldo al cierre del día `date`.
+        @return: diccionario con comprometido, ejecutado y disponible
+        """
+        totals = self.totals_at(end_of_day(date))
+        if self.ledger == "rubro":
+            # `value_sgr` ya tiene descontados todos los CDPs emitidos (ver
+            # CdpsView.post), así que se le suma lo comprometido después de `date`.
+            current = self.totals_at(timezone.now())
+            available = self.obj.value_sgr + current["committed"] - totals["committed"]
+        else:
+            available = (
+                self.obj.value_species + self.obj.value_chash - totals["committed"]
+            )
+
+        return {
+            "id": self.obj.id,
+            "date": date,
+            "committed": totals["committed"],
+            "executed": totals["executed"],
+            "available": available,
+        }
@@ -0,0 +1,150 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from core.rubros.models import Rubro
+from core.counterparts.models import Counterpart
+from .utils import BalanceCalculator
+
+date_parameter = openapi.Parameter(
+    "date",
+    openapi.IN_QUERY,
+    type=openapi.TYPE_STRING,
+    format=openapi.FORMAT_DATE,
+    description="Fecha de corte (YYYY-MM-DD), por defecto hoy",
+)
+
+balance_response = openapi.Response(
+    description="Saldo recuperado correctamente",
+    schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "id": openapi.Schema(type=openapi.TYPE_STRING),
+            "date": openapi.Schema(
+                type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE
+            ),
+            "committed": openapi.Schema(type=openapi.TYPE_NUMBER),
+            "executed": openapi.Schema(type=openapi.TYPE_NUMBER),
+            "available": openapi.Schema(type=openapi.TYPE_NUMBER),
+        },
+    ),
+)
+
+
+def get_balance_date(request):
+    """
+    Obtiene la fecha de corte del query param `date`.
+    @return: fecha o None si el valor no es válido
+    """
+    value = request.query_params.get("date")
+    if not value:
+        return timezone.localdate()
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+class RubroBalanceView(APIView):
+    """
+    Class to get the balance of a rubro at a given date
+
+    @methods:
+    - get: Get the balance of a rubro at a given date
+    """
+
+    @swagger_auto_schema(
+        operation_description="Obtener el saldo de un rubro a una fecha",
+        manual_parameters=[date_parameter],
+        responses={
+            200: balance_response,
+            400: openapi.Response(description="Fecha inválida"),
+            404: openapi.Response(description="Rubro no encontrado"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, rubro_id):
+        """
+        Get the balance of a rubro at a given date
+        @param request: HTTP request
+        @param rubro_id: Rubro ID
+        @return: JSON response
+        """
+        date = get_balance_date(request)
+        if date is None:
+            response = {
+                "message": "Fecha inválida, use el formato YYYY-MM-DD",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            rubro = Rubro.objects.get(id=rubro_id)
+            balance = BalanceCalculator("rubro", rubro).balance_at(date)
+            return Response(balance, status=status.HTTP_200_OK)
+        except Rubro.DoesNotExist:
+            response = {
+                "message": "Rubro no encontrado",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response = {
+                "message": f"Error obteniendo el saldo del rubro: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CounterpartBalanceView(APIView):
+    """
+    Class to get the balance of a counterpart at a given date
+
+    @methods:
+    - get: Get the balance of a counterpart at a given date
+    """
+
+    @swagger_auto_schema(
+        operation_description="Obtener el saldo de una contrapartida a una fecha",
+        manual_parameters=[date_parameter],
+        responses={
+            200: balance_response,
+            400: openapi.Response(description="Fecha inválida"),
+            404: openapi.Response(description="Contrapartida no encontrada"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, counterpart_id):
+        """
+        Get the balance of a counterpart at a given date
+        @param request: HTTP request
+        @param counterpart_id: Counterpart ID
+        @return: JSON response
+        """
+        date = get_balance_date(request)
+        if date is None:
+            response = {
+                "message": "Fecha inválida, use el formato YYYY-MM-DD",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            counterpart = Counterpart.objects.get(id=counterpart_id)
+            balance = BalanceCalculator("counterpart", counterpart).balance_at(date)
+            return Response(balance, status=status.HTTP_200_OK)
+        except Counterpart.DoesNotExist:
+            response = {
+                "message": "Contrapartida no encontrada",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response = {
+                "message": f"Error obteniendo el saldo de la contrapartida: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,3 +1,32 @@
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.entities.models import Entity
+from core.metrics.testing import QueryBudgetMixin
+from core.roles.models import Role
+from core.users.models import User
+from .models import Comment
 
-# Create your tests here.
+
+class CommentUserQueryBudgetTests(QueryBudgetMixin, TestCase):
+    query_budgets = {"user_comments_view": 1}
+
+    def setUp(self):
+        self.user = User.objects.create(
+            email="usuario@example.com",
+            identification="1",
+            is_superuser=True,
+            role=Role.objects.create(name="Rol"),
+            entity=Entity.objects.create(name="Entidad"),
+        )
+        for index in range(6):
+            Comment.objects.create(comment_text=f"Comentario {index}", user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_by_user(self):
+        url = reverse("user_comments_view", args=[self.user.id])
+        with self.assertQueryBudget("user_comments_view"):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 6)
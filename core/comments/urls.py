@@ -9,7 +9,7 @@ urlpatterns = [
         name="comment_detail_view",
     ),
     path(
-        "comments/<uuid:user_id>/",
+        "comments/user/<uuid:user_id>/",
         views.CommentUserView.as_view(),
         name="user_comments_view",
     ),
@@ -166,7 +166,9 @@ class CommentUserView(APIView):
         """
         
         try:
-            comments = Comment.objects.filter(user_id=user_id)
+            comments = Comment.objects.filter(user_id=user_id).select_related(
+                "user__role", "user__entity"
+            )
             comments.serializer = CommentSerializer(comments, many=True)
 
             return Response(comments.serializer.data, status=status.HTTP_200_OK)
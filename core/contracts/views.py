@@ -6,6 +6,7 @@ from .serializers import ContractSerializer
 from core.cdps.models import Cdps
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from core.exports.csv_stream import CsvExportMixin, csv_format_parameter, csv_response
 
 # Definir el cuerpo de la solicitud para el POST en ContractView
 contract_request_body = openapi.Schema(
@@ -57,7 +58,24 @@ contract_request_body = openapi.Schema(
 )
 
 
-class ContractView(APIView):
+CONTRACT_CSV_COLUMNS = [
+    ("ID", "id"),
+    ("Número", "contract_number"),
+    ("NIT contratante", "contracting_nit"),
+    ("NIT contratista", "contracted_nit"),
+    ("Contratante", "contracting_name"),
+    ("Inicio", "start_date"),
+    ("Fin", "end_date"),
+    ("Monto", "amount"),
+    ("Supervisor", "supervisor_name"),
+    ("Identificación supervisor", "supervisor_identification"),
+    ("CDP", "cpds__number"),
+    ("Información", "contract_info"),
+    ("Observaciones", "observations"),
+]
+
+
+class ContractView(CsvExportMixin, APIView):
 
     """
     Class to handle HTTP requests related to contracts
@@ -70,6 +88,7 @@ class ContractView(APIView):
     # Documentar el método GET para obtener todos los contratos
     @swagger_auto_schema(
         operation_description="Obtener todos los contratos",
+        manual_parameters=[csv_format_parameter],
         responses={
             200: openapi.Response(
                 description="Contratos recuperados correctamente",
@@ -88,6 +107,9 @@ class ContractView(APIView):
 
         try:
             data = Contract.objects.all()
+            if self.wants_csv(request):
+                return csv_response(data, CONTRACT_CSV_COLUMNS, "contratos.csv")
+
             contract_serializer = ContractSerializer(data, many=True)
 
             return Response(contract_serializer.data, status=status.HTTP_200_OK)
@@ -1,12 +1,12 @@
 from rest_framework import serializers
 from .models import CounterpartExecution
 from core.counterparts.serializers import CounterpartSerializer
-from core.cdps.serializers import CdpsSerializer
+from core.activities.serializers import ActivitySerializer
 
 
 class CounterpartExecutionSerializer(serializers.ModelSerializer):
     counterpart = CounterpartSerializer(many=False)
-    cdp = CdpsSerializer(many=False)
+    activity = ActivitySerializer(many=False)
 
     class Meta:
         model = CounterpartExecution
@@ -16,11 +16,11 @@ class CounterpartExecutionSerializer(serializers.ModelSerializer):
     def to_internal_value(self, data):
         representation = super().to_internal_value(data)
         if data.get("counterpart"):
-            representation["counterpart_id"] = data.counterpart.get("id")
+            representation["counterpart_id"] = data["counterpart"].get("id")
         else:
             representation["counterpart_id"] = None
-        if data.get("cdp"):
-            representation["cdp_id"] = data.cdp.get("id")
+        if data.get("activity"):
+            representation["activity_id"] = data["activity"].get("id")
         else:
-            representation["cdp_id"] = None
+            representation["activity_id"] = None
         return representation
@@ -1,4 +1,20 @@
 from django.urls import path
 from . import views
 
-urlpatterns = []
+urlpatterns = [
+    path(
+        "counterpartExecution",
+        views.CounterpartExecutionView.as_view(),
+        name="counterpart_execution_view",
+    ),
+    path(
+        "counterpartExecution/<uuid:id>",
+        views.CounterpartExecutionDetailView.as_view(),
+        name="counterpart_execution_detail_view",
+    ),
+    path(
+        "counterpartExecution/project/<uuid:project_id>",
+        views.CounterpartExecutionsByProjectId.as_view(),
+        name="counterpart_execution-by-project",
+    ),
+]
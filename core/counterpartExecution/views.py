@@ -8,6 +8,7 @@ from .models import CounterpartExecution
 from core.counterparts.models import Counterpart
 from core.activities.models import Activity
 from core.movementsCounterpart.models import MovementsCounterpart
+from core.exports.csv_stream import CsvExportMixin, csv_format_parameter, csv_response
 
 # Create your views here.
 counter_execution_request_body = openapi.Schema(
@@ -48,7 +49,20 @@ counter_execution_request_body = openapi.Schema(
 )
 
 
-class CounterpartExecutionView(APIView):
+COUNTERPART_EXECUTION_CSV_COLUMNS = [
+    ("ID", "id"),
+    ("Número", "number"),
+    ("Expedición", "expedition_date"),
+    ("Monto", "amount"),
+    ("Descripción", "description"),
+    ("Generado", "is_generated"),
+    ("Cancelado", "is_canceled"),
+    ("Contrapartida", "counterpart__name"),
+    ("Actividad", "activity__name"),
+]
+
+
+class CounterpartExecutionView(CsvExportMixin, APIView):
     """
     Class to handle HTTP requests related to Counterpart Execution
 
@@ -59,8 +73,9 @@ class CounterpartExecutionView(APIView):
 
     @swagger_auto_schema(
         operation_description="Obtener todas las ejecuciones de contrapartida",
+        manual_parameters=[csv_format_parameter],
         responses={
-            200: openapi.Schema(
+            200: openapi.Response(
                 description="Lista de ejecuciones de contrapartida",
                 schema=CounterpartExecutionSerializer(many=True),
             ),
@@ -75,6 +90,13 @@ class CounterpartExecutionView(APIView):
         """
         try:
             counterpart_executions = CounterpartExecution.objects.all()
+            if self.wants_csv(request):
+                return csv_response(
+                    counterpart_executions,
+                    COUNTERPART_EXECUTION_CSV_COLUMNS,
+                    "ejecuciones_contrapartida.csv",
+                )
+
             serializer = CounterpartExecutionSerializer(
                 counterpart_executions, many=True
             )
@@ -166,7 +188,7 @@ class CounterpartExecutionDetailView(APIView):
     @swagger_auto_schema(
         operation_description="Obtener una ejecución de contrapartida específica",
         responses={
-            200: openapi.Schema(
+            200: openapi.Response(
                 description="Ejecución de contrapartida",
                 schema=CounterpartExecutionSerializer,
             ),
@@ -202,7 +224,7 @@ class CounterpartExecutionDetailView(APIView):
 
     @swagger_auto_schema(
         operation_description="Actualizar una ejecución de contrapartida específica",
-        request_body=movement_request_body,
+        request_body=counter_execution_request_body,
         responses={
             200: openapi.Response(description="Ejecución de contrapartida actualizada"),
             404: openapi.Response(
@@ -315,7 +337,7 @@ class CounterpartExecutionDetailView(APIView):
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class CounterpartExecutionsByProjectId(APIView):
+class CounterpartExecutionsByProjectId(CsvExportMixin, APIView):
     """
     Class to handle HTTP requests related to counterpart executions
 
@@ -325,8 +347,9 @@ class CounterpartExecutionsByProjectId(APIView):
 
     @swagger_auto_schema(
         operation_description="Obtener todas las ejecuciones de contrapartida por ID de proyecto",
+        manual_parameters=[csv_format_parameter],
         responses={
-            200: openapi.Schema(
+            200: openapi.Response(
                 description="Lista de ejecuciones de contrapartida",
                 schema=CounterpartExecutionSerializer(many=True),
             ),
@@ -354,6 +377,13 @@ class CounterpartExecutionsByProjectId(APIView):
             counterpart_executions = CounterpartExecution.objects.filter(
                 activity__in=activities
             )
+            if self.wants_csv(request):
+                return csv_response(
+                    counterpart_executions,
+                    COUNTERPART_EXECUTION_CSV_COLUMNS,
+                    f"ejecuciones_contrapartida_{project_id}.csv",
+                )
+
             serializer = CounterpartExecutionSerializer(
                 counterpart_executions, many=True
             )
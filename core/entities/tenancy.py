@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import models
+from django.http import HttpRequest
+
+# Alcance de la entidad vigente: la solicitud en curso (la entidad sale de su
+# usuario), el id de una entidad fija o None para no restringir
+_scope = ContextVar("entity_scope", default=None)
+
+# Solicitud anónima o de un usuario sin entidad: no ve ningún registro
+NO_ENTITY = object()
+
+
+def request_entity(request):
+    """
+    Entidad del usuario de la solicitud, una vez autenticado por DRF.
+
+    @param request: HttpRequest
+    @return: id de la entidad, None si la solicitud es de un superusuario o
+    NO_ENTITY si no tiene un usuario de la aplicación con entidad
+    """
+    from core.users.models import User
+
+    # DRF asigna el usuario al HttpRequest al autenticar; antes de eso, o con
+    # el AnonymousUser, no se ve ningún registro: el filtro no queda abierto
+    # cuando la vista permite solicitudes sin token
+    user = request.__dict__.get("user")
+    if type(user) is not User:
+        return NO_ENTITY
+    if user.is_superuser:
+        return None
+    return user.entity_id or NO_ENTITY
+
+
+def get_current_entity():
+    """
+    @return: id de la entidad que restringe las consultas, NO_ENTITY o None
+    """
+    scope = _scope.get()
+    if isinstance(scope, HttpRequest):
+        return request_entity(scope)
+    return scope
+
+
+def current_entity_id():
+    """
+    @return: id de la entidad vigente, o None si no hay una
+    """
+    entity = get_current_entity()
+    return None if entity is NO_ENTITY else entity
+
+
+def allows_entity(entity_id):
+    """
+    @param entity_id: id de una entidad
+    @return: si el alcance vigente permite asignarle registros
+    """
+    entity = get_current_entity()
+    if entity is None:
+        return True
+    return entity is not NO_ENTITY and str(entity) == str(entity_id)
+
+
+@contextmanager
+def entity_scope(scope):
+    """
+    Restringe las consultas de los modelos con EntityScopedManager dentro del
+    bloque, p. ej. en comandos o tareas en segundo plano.
+
+    @param scope: HttpRequest, id de una entidad o None para no restringir
+    """
+    token = _scope.set(scope)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+class EntityScopedManager(models.Manager):
+    """
+    Manager que filtra por la entidad vigente a través de `entity_path`, el
+    camino hasta la entidad del proyecto (p. ej. "project__entity").
+
+    Se evalúa al construir el queryset, así los querysets creados en la
+    vista quedan restringidos aunque se recorran después. Sin alcance (fuera
+    de una solicitud, con `entity_scope(None)` o para superusuarios) devuelve
+    todos los registros; en una solicitud sin usuario no devuelve ninguno, así
+    que las vistas públicas consultan `all_objects`.
+
+    Los modelos lo usan como `objects` y dejan `all_objects` como manager por
+    defecto (`default_manager_name`): los managers de relaciones inversas,
+    los serializers y dumpdata parten de registros ya autorizados.
+    """
+
+    def __init__(self, entity_path):
+        super().__init__()
+        self.entity_path = entity_path
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        entity = get_current_entity()
+        if entity is None:
+            return queryset
+        if entity is NO_ENTITY:
+            return queryset.none()
+        return queryset.filter(**{self.entity_path: entity})
@@ -1,3 +1,89 @@
-from django.test import TestCase
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from core.cdps.models import Cdps
+from core.projects.models import Project
+from core.users.models import User
+from .models import Entity
+from core.tasks.tests import TEST_CACHES
+from .tenancy import NO_ENTITY, allows_entity, entity_scope, request_entity
 
-# Create your tests here.
+
+class EntityScopeTests(TestCase):
+    def setUp(self):
+        self.entity = Entity.objects.create(name="Entidad")
+        self.other = Entity.objects.create(name="Otra")
+        self.project = Project.objects.create(name="Proyecto", entity=self.entity)
+        self.other_project = Project.objects.create(name="Otro", entity=self.other)
+
+    def projects(self):
+        return set(Project.objects.values_list("id", flat=True))
+
+    def request_for(self, **user_fields):
+        request = RequestFactory().get("/")
+        request.user = User(email="usuario@example.com", **user_fields)
+        return request
+
+    def test_scoped_manager_filters_by_entity(self):
+        with entity_scope(self.entity.id):
+            self.assertEqual(self.projects(), {self.project.id})
+            self.assertEqual(Project.all_objects.count(), 2)
+        with entity_scope(NO_ENTITY):
+            self.assertEqual(self.projects(), set())
+        with entity_scope(None):
+            self.assertEqual(self.projects(), {self.project.id, self.other_project.id})
+
+    def test_request_scope_uses_the_user_entity(self):
+        with entity_scope(self.request_for(entity=self.other)):
+            self.assertEqual(self.projects(), {self.other_project.id})
+        with entity_scope(self.request_for()):
+            self.assertEqual(self.projects(), set())
+        with entity_scope(self.request_for(is_superuser=True, entity=self.other)):
+            self.assertEqual(len(self.projects()), 2)
+
+    def test_request_without_user_sees_nothing(self):
+        self.assertIs(request_entity(RequestFactory().get("/")), NO_ENTITY)
+        with entity_scope(RequestFactory().get("/")):
+            self.assertEqual(self.projects(), set())
+
+    def test_allows_entity(self):
+        self.assertTrue(allows_entity(self.other.id))
+        with entity_scope(self.entity.id):
+            self.assertTrue(allows_entity(self.entity.id))
+            self.assertTrue(allows_entity(str(self.entity.id)))
+            self.assertFalse(allows_entity(self.other.id))
+        with entity_scope(NO_ENTITY):
+            self.assertFalse(allows_entity(self.entity.id))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class EntityScopedViewTests(TestCase):
+    def setUp(self):
+        self.entity = Entity.objects.create(name="Entidad")
+        self.other = Entity.objects.create(name="Otra")
+        self.project = Project.objects.create(name="Proyecto", entity=self.entity)
+        Project.objects.create(name="Otro", entity=self.other)
+        self.user = User.objects.create(
+            email="usuario@example.com", identification="1", entity=self.entity
+        )
+
+    def list_projects(self, **headers):
+        response = self.client.get("/api/projects/", **headers)
+        return {project["id"] for project in response.json()}
+
+    def test_list_without_token_returns_no_projects(self):
+        self.assertEqual(self.list_projects(), set())
+
+    def test_list_with_token_returns_the_user_entity(self):
+        token = AccessToken.for_user(self.user)
+        self.assertEqual(
+            self.list_projects(HTTP_AUTHORIZATION=f"Bearer {token}"),
+            {str(self.project.id)},
+        )
+
+    def test_public_verification_finds_any_cdp(self):
+        cdp = Cdps.objects.create(number="1", amount=100)
+        response = self.client.get(
+            reverse("cdp_verify_view", args=[cdp.verification_hash])
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,89 @@
+import tempfile
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from core.metrics.store import MetricsStore
+from core.middleware.metrics import MetricsMiddleware
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el costo por solicitud de MetricsMiddleware comparando una vista "
+        "sin middleware y con middleware, sin consultas y con consultas"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20000,
+            help="Número de solicitudes por ruta",
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=5,
+            help="Consultas por solicitud en la vista con consultas",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations debe ser mayor que 0")
+
+        request = RequestFactory().get(reverse("users_view"))
+        request.resolver_match = resolve(request.path)
+        body = b"x" * 1000
+
+        def plain_view(request):
+            return HttpResponse(body)
+
+        def query_view(request):
+            with connection.cursor() as cursor:
+                for _ in range(options["queries"]):
+                    cursor.execute("SELECT 1")
+            return HttpResponse(body)
+
+        with tempfile.TemporaryDirectory() as directory:
+            results = {}
+            for name, view in (
+                ("sin consultas", plain_view),
+                ("con consultas", query_view),
+            ):
+                middleware = MetricsMiddleware(view)
+                # Escrituras con el intervalo por defecto, en un directorio aparte
+                middleware.store = MetricsStore(directory, 5)
+                for label, handler in (
+                    ("sin middleware", view),
+                    ("con middleware", middleware),
+                ):
+                    handler(request)
+                    start = time.perf_counter()
+                    for _ in range(options["iterations"]):
+                        handler(request)
+                    elapsed = time.perf_counter() - start
+                    results[(name, label)] = elapsed / options["iterations"]
+
+            flush_store = MetricsStore(directory, 5)
+            flush_store.observe("benchmark", "GET", 200, {})
+            start = time.perf_counter()
+            for _ in range(100):
+                flush_store.flush()
+            flush = (time.perf_counter() - start) / 100
+
+        for name in ("sin consultas", "con consultas"):
+            without = results[(name, "sin middleware")]
+            with_metrics = results[(name, "con middleware")]
+            self.stdout.write(
+                f"{name:>14}: {without * 1e6:8.2f} µs sin middleware, "
+                f"{with_metrics * 1e6:8.2f} µs con middleware, "
+                f"costo {(with_metrics - without) * 1e6:8.2f} µs/solicitud"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Escritura del archivo del worker (una vez por intervalo): "
+                f"{flush * 1e6:.2f} µs"
+            )
+        )
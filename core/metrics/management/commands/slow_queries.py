@@ -0,0 +1,107 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from core.metrics.slow_queries import slow_query_log
+
+SORT_KEYS = {
+    "total": lambda group: group["total_ms"],
+    "count": lambda group: group["count"],
+    "max": lambda group: group["max_ms"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Resume el registro de consultas lentas agrupando por huella: "
+        "ejecuciones, tiempos, vistas, serializers y el último plan"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=float,
+            help="Solo las consultas de las últimas horas",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=list(SORT_KEYS),
+            default="total",
+            help="Orden de las huellas (por defecto tiempo total)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Número de huellas a mostrar",
+        )
+        parser.add_argument(
+            "--no-plan",
+            action="store_true",
+            help="No mostrar los planes de EXPLAIN",
+        )
+
+    def handle(self, *args, **options):
+        if options["limit"] < 1:
+            raise CommandError("--limit debe ser mayor que 0")
+        since = None
+        if options["hours"] is not None:
+            since = timezone.now() - timedelta(hours=options["hours"])
+
+        groups = {}
+        for entry in slow_query_log.read():
+            if since is not None:
+                captured_at = parse_datetime(entry.get("time", ""))
+                if captured_at is None or captured_at < since:
+                    continue
+            group = groups.setdefault(
+                entry["fingerprint"],
+                {
+                    "sql": entry["sql"],
+                    "count": 0,
+                    "total_ms": 0,
+                    "max_ms": 0,
+                    "sites": {},
+                    "plan": None,
+                },
+            )
+            group["count"] += 1
+            group["total_ms"] += entry["duration_ms"]
+            group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+            site = " / ".join(
+                str(entry.get(key) or "-")
+                for key in ("route", "view", "serializer", "location")
+            )
+            group["sites"][site] = group["sites"].get(site, 0) + 1
+            group["plan"] = entry.get("plan") or group["plan"]
+
+        if not groups:
+            self.stdout.write("No hay consultas lentas registradas")
+            return
+
+        ranked = sorted(
+            groups.items(),
+            key=lambda item: SORT_KEYS[options["sort"]](item[1]),
+            reverse=True,
+        )
+        for fingerprint, group in ranked[: options["limit"]]:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{fingerprint}: {group['count']} ejecuciones, "
+                    f"total {group['total_ms']:.1f} ms, "
+                    f"media {group['total_ms'] / group['count']:.1f} ms, "
+                    f"máximo {group['max_ms']:.1f} ms"
+                )
+            )
+            self.stdout.write(f"  {group['sql']}")
+            for site, count in sorted(
+                group["sites"].items(), key=lambda item: -item[1]
+            ):
+                self.stdout.write(
+                    f"  {count}x ruta / vista / serializer / línea: {site}"
+                )
+            if group["plan"] and not options["no_plan"]:
+                self.stdout.write("  Plan:")
+                for line in group["plan"]:
+                    self.stdout.write(f"    {line}")
+            self.stdout.write("")
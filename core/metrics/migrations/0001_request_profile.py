@@ -0,0 +1,78 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:02
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestProfile",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("cprofile", "Llamadas de Python (cProfile)"),
+                            ("sql", "Consultas SQL con sus planes"),
+                        ],
+                        max_length=20,
+                        verbose_name="kind",
+                    ),
+                ),
+                ("method", models.CharField(max_length=10, verbose_name="method")),
+                ("path", models.TextField(verbose_name="path")),
+                (
+                    "view_name",
+                    models.CharField(
+                        blank=True, max_length=200, null=True, verbose_name="view_name"
+                    ),
+                ),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(verbose_name="status_code"),
+                ),
+                ("duration_ms", models.FloatField(verbose_name="duration_ms")),
+                (
+                    "query_count",
+                    models.PositiveIntegerField(default=0, verbose_name="query_count"),
+                ),
+                ("result", models.JSONField(default=dict, verbose_name="result")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "request_profiles",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
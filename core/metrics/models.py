@@ -0,0 +1,39 @@
+import uuid
+from django.db import models
+from core.users.models import User
+
+
+class RequestProfile(models.Model):
+    """
+    Perfil de una solicitud tomado con `?_profile=` por un administrador.
+
+    Se conservan solo los últimos PROFILE_BUFFER_SIZE perfiles: al guardar uno
+    nuevo se borran los más antiguos.
+    """
+
+    CPROFILE = "cprofile"
+    SQL = "sql"
+    KINDS = [
+        (CPROFILE, "Llamadas de Python (cProfile)"),
+        (SQL, "Consultas SQL con sus planes"),
+    ]
+
+    id = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False, unique=True
+    )
+    kind = models.CharField("kind", max_length=20, choices=KINDS)
+    method = models.CharField("method", max_length=10)
+    path = models.TextField("path")
+    view_name = models.CharField("view_name", max_length=200, null=True, blank=True)
+    status_code = models.PositiveSmallIntegerField("status_code")
+    duration_ms = models.FloatField("duration_ms")
+    query_count = models.PositiveIntegerField("query_count", default=0)
+    result = models.JSONField("result", default=dict)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "request_profiles"
+        ordering = ["-created_at"]
@@ -0,0 +1,89 @@
+import cProfile
+import pstats
+from django.conf import settings
+from .models import RequestProfile
+from .queries import explain
+
+
+def function_name(key):
+    filename, line, name = key
+    return f"{filename}:{line}({name})" if line else name
+
+
+def run_cprofile(get_response, request):
+    """
+    Ejecuta la solicitud con cProfile.
+    @return: (respuesta, resultado con las funciones ordenadas por tiempo
+    acumulado y, en cada una, las funciones que llama)
+    """
+    profiler = cProfile.Profile()
+    response = profiler.runcall(get_response, request)
+    stats = pstats.Stats(profiler).stats
+
+    # pstats guarda quién llama a cada función; se invierte para el árbol
+    callees = {}
+    for key, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumtime) in callers.items():
+            callees.setdefault(caller, []).append((cumtime, key))
+
+    limit = settings.PROFILE_STATS_LIMIT
+    functions = []
+    for key, (primitive_calls, calls, tottime, cumtime, _) in sorted(
+        stats.items(), key=lambda item: item[1][3], reverse=True
+    )[:limit]:
+        functions.append(
+            {
+                "function": function_name(key),
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+                "callees": [
+                    {"function": function_name(callee), "cumtime": round(time, 6)}
+                    for time, callee in sorted(callees.get(key, []), reverse=True)
+                ][:limit],
+            }
+        )
+    return response, {"functions": functions}
+
+
+def sql_profile(recorder):
+    """
+    Consultas registradas con sus tiempos y el plan de EXPLAIN ANALYZE de las
+    primeras PROFILE_EXPLAIN_LIMIT consultas SELECT.
+    @param recorder: QueryRecorder de la solicitud
+    """
+    explained = 0
+    queries = []
+    for query in recorder.queries:
+        plan = None
+        if not query["many"] and explained < settings.PROFILE_EXPLAIN_LIMIT:
+            try:
+                plan = explain(query["alias"], query["sql"], query["params"], True)
+            except Exception as e:
+                plan = [f"Error al obtener el plan: {str(e)}"]
+            explained += plan is not None
+        queries.append(
+            {
+                "sql": query["sql"],
+                "params": [str(param) for param in query["params"] or []],
+                "duration_ms": round(query["duration"] * 1000, 3),
+                "plan": plan,
+            }
+        )
+    return {
+        "duration_ms": round(recorder.duration * 1000, 3),
+        "queries": queries,
+    }
+
+
+def save_profile(**fields):
+    """
+    Guarda un perfil y borra los que quedan fuera del buffer.
+    """
+    profile = RequestProfile.objects.create(**fields)
+    stale = RequestProfile.objects.values_list("id", flat=True)[
+        settings.PROFILE_BUFFER_SIZE :
+    ]
+    RequestProfile.objects.filter(id__in=list(stale)).delete()
+    return profile
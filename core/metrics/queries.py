@@ -0,0 +1,112 @@
+import hashlib
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from django.db import connections
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER = re.compile(r"%s|\?")
+PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """
+    Forma de una sentencia SQL sin los valores: los literales y parámetros se
+    reemplazan por `?` y las listas de `IN` por `(...)`, así las consultas que
+    solo cambian de valores tienen la misma forma.
+    """
+    shape = STRING_LITERAL.sub("?", sql)
+    shape = NUMBER_LITERAL.sub("?", shape)
+    shape = PLACEHOLDER.sub("?", shape)
+    shape = PLACEHOLDER_LIST.sub("(...)", shape)
+    return WHITESPACE.sub(" ", shape).strip()
+
+
+def fingerprint(shape):
+    return hashlib.sha1(shape.encode()).hexdigest()[:12]
+
+
+def explain(alias, sql, params, analyze=False):
+    """
+    Plan de ejecución de una consulta SELECT; con `analyze` en PostgreSQL la
+    consulta se ejecuta de nuevo para medir los tiempos reales.
+    @return: lista de líneas del plan, o None si la sentencia no es un SELECT
+    """
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    connection = connections[alias]
+    if connection.vendor == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS)" if analyze else "EXPLAIN"
+    elif connection.vendor == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN"
+    else:
+        prefix = "EXPLAIN"
+    with connection.cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}", params)
+        return [" ".join(str(value) for value in row) for row in cursor.fetchall()]
+
+
+class QueryRecorder:
+    """
+    execute_wrapper que guarda cada sentencia con sus parámetros y su duración.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "sql": sql,
+                    "params": params,
+                    "many": many,
+                    "alias": context["connection"].alias,
+                    "duration": time.perf_counter() - start,
+                }
+            )
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(query["duration"] for query in self.queries)
+
+    def shapes(self):
+        """
+        @return: Counter {forma normalizada: número de ejecuciones}
+        """
+        return Counter(normalize_sql(query["sql"]) for query in self.queries)
+
+    def repeated_shapes(self, threshold):
+        """
+        Formas ejecutadas `threshold` veces o más en la misma solicitud, el
+        síntoma de una relación que se carga fila por fila (N+1).
+        @return: lista de (forma, ejecuciones), de mayor a menor
+        """
+        return [
+            (shape, count)
+            for shape, count in self.shapes().most_common()
+            if count >= threshold
+        ]
+
+
+@contextmanager
+def record_queries():
+    """
+    Registra las consultas de todas las conexiones dentro del bloque.
+    @return: QueryRecorder
+    """
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
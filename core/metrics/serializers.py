@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from .models import RequestProfile
+
+
+class RequestProfileListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RequestProfile
+        exclude = ["result", "updated_at", "deleted_at"]
+
+
+class RequestProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RequestProfile
+        exclude = ["updated_at", "deleted_at"]
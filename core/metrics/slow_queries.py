@@ -0,0 +1,197 @@
+import fcntl
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.serializers import BaseSerializer
+from rest_framework.views import APIView
+from .queries import explain, fingerprint, normalize_sql
+
+# Archivos de este paquete y del middleware, que no son el origen de la consulta
+INTERNAL_DIRS = (
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.join(settings.BASE_DIR, "core", "middleware"),
+)
+
+
+def params_shape(params, many):
+    """
+    Tipos de los parámetros, sin sus valores.
+    """
+    if params is None:
+        return []
+    if many:
+        params = next(iter(params), ())
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [
+        (
+            f"{type(value).__name__}[{len(value)}]"
+            if isinstance(value, (list, tuple))
+            else type(value).__name__
+        )
+        for value in params
+    ]
+
+
+def find_call_site():
+    """
+    Vista, serializer y primera línea del proyecto en la pila de la consulta.
+    """
+    view = serializer = location = None
+    frame = sys._getframe(2)
+    while frame is not None and not (view and serializer and location):
+        owner = frame.f_locals.get("self")
+        if serializer is None and isinstance(owner, BaseSerializer):
+            serializer = type(owner).__name__
+        if view is None and isinstance(owner, APIView):
+            view = type(owner).__name__
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if (
+            location is None
+            and filename.startswith(str(settings.BASE_DIR))
+            and not filename.startswith(INTERNAL_DIRS)
+        ):
+            location = (
+                f"{os.path.relpath(filename, settings.BASE_DIR)}:"
+                f"{frame.f_lineno} ({frame.f_code.co_name})"
+            )
+        frame = frame.f_back
+    return {"view": view, "serializer": serializer, "location": location}
+
+
+class SlowQueryLog:
+    """
+    Registro en disco de las consultas lentas, una línea JSON por consulta.
+
+    Cuando el archivo supera `max_bytes` se renombra a `.1` (y los anteriores
+    a `.2`, ...) conservando `backups` archivos. Los workers comparten el
+    archivo: la comprobación del tamaño, la rotación y la escritura se hacen
+    con un `flock` sobre `<path>.lock`, así dos procesos no rotan a la vez ni
+    escriben en un archivo que otro acaba de renombrar.
+    """
+
+    def __init__(self, path, max_bytes, backups):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lock = threading.Lock()
+
+    def paths(self):
+        """
+        @return: archivos del registro, del más antiguo al más reciente
+        """
+        paths = [f"{self.path}.{index}" for index in range(self.backups, 0, -1)]
+        return [path for path in [*paths, self.path] if os.path.exists(path)]
+
+    def write(self, entry):
+        line = (json.dumps(entry, default=str) + "\n").encode()
+        with self.lock, self.file_lock():
+            try:
+                if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    self.rotate()
+            except FileNotFoundError:
+                pass
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    @contextmanager
+    def file_lock(self):
+        """
+        Bloqueo exclusivo entre procesos mientras dura el bloque.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(f"{self.path}.lock", os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def rotate(self):
+        # Solo con file_lock tomado
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def read(self):
+        """
+        @return: iterador de las consultas registradas, de la más antigua a la
+        más reciente
+        """
+        for path in self.paths():
+            with open(path) as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+
+class SlowQueryCapture:
+    """
+    execute_wrapper que registra las consultas que tardan más de
+    SLOW_QUERY_THRESHOLD_MS con su forma normalizada, su huella, su origen,
+    los tipos de sus parámetros y su plan de EXPLAIN.
+    """
+
+    def __init__(self, log, threshold_ms, request=None):
+        self.log = log
+        self.threshold = threshold_ms / 1000
+        self.request = request
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            if duration >= self.threshold and not self.explaining:
+                self.capture(sql, params, many, context, duration)
+
+    def capture(self, sql, params, many, context, duration):
+        shape = normalize_sql(sql)
+        entry = {
+            "time": timezone.now().isoformat(),
+            "fingerprint": fingerprint(shape),
+            "duration_ms": round(duration * 1000, 3),
+            "sql": shape,
+            "params": params_shape(params, many),
+            "alias": context["connection"].alias,
+            **find_call_site(),
+        }
+        match = getattr(self.request, "resolver_match", None)
+        if match is not None:
+            entry["route"] = match.view_name
+        if not many:
+            # El EXPLAIN también pasa por este wrapper
+            self.explaining = True
+            try:
+                entry["plan"] = explain(entry["alias"], sql, params)
+            except Exception as e:
+                entry["plan"] = [f"Error al obtener el plan: {str(e)}"]
+            finally:
+                self.explaining = False
+        try:
+            self.log.write(entry)
+        except OSError:
+            pass
+
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_LOG,
+    settings.SLOW_QUERY_LOG_MAX_BYTES,
+    settings.SLOW_QUERY_LOG_BACKUPS,
+)
@@ -0,0 +1,221 @@
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from django.conf import settings
+
+# Límites superiores de los buckets de cada histograma (el último es +Inf)
+HISTOGRAMS = {
+    "request_duration_seconds": (
+        "Duración de las solicitudes",
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    "response_size_bytes": (
+        "Tamaño de las respuestas",
+        (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+    ),
+    "db_queries": (
+        "Consultas a la base de datos por solicitud",
+        (0, 1, 2, 5, 10, 20, 50, 100, 500),
+    ),
+    "db_duration_seconds": (
+        "Tiempo en la base de datos por solicitud",
+        (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+    ),
+}
+
+
+def empty_histogram(name):
+    return {
+        "buckets": [0] * (len(HISTOGRAMS[name][1]) + 1),
+        "sum": 0,
+        "count": 0,
+    }
+
+
+class MetricsStore:
+    """
+    Métricas por ruta y método de este proceso, guardadas periódicamente en un
+    archivo propio dentro de METRICS_DIR.
+
+    Cada worker de gunicorn escribe solo su archivo (con reemplazo atómico),
+    así no hay que bloquear entre procesos; `collect()` suma los archivos de
+    todos los workers y borra los de los procesos terminados. Al borrarlos los
+    contadores bajan: Prometheus lo trata como un reinicio del contador en
+    rate() e increase().
+    """
+
+    def __init__(self, directory, flush_interval):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.series = {}
+        self.pid = None
+        self.path = None
+        self.flushed_at = 0
+
+    def reset(self):
+        # Nuevo proceso (o primer uso): archivo propio, sin heredar del padre
+        self.pid = os.getpid()
+        self.path = os.path.join(self.directory, f"{self.pid}-{time.time_ns()}.json")
+        self.series = {}
+        self.flushed_at = time.monotonic()
+
+    def observe(self, view, method, status_code, values):
+        """
+        @param values: {nombre del histograma: valor observado}; los valores
+        None no se registran
+        """
+        with self.lock:
+            if self.pid != os.getpid():
+                self.reset()
+            series = self.series.get((view, method))
+            if series is None:
+                series = self.series[(view, method)] = {
+                    "statuses": {},
+                    "histograms": {name: empty_histogram(name) for name in HISTOGRAMS},
+                }
+            status_code = str(status_code)
+            series["statuses"][status_code] = series["statuses"].get(status_code, 0) + 1
+            for name, value in values.items():
+                if value is None:
+                    continue
+                histogram = series["histograms"][name]
+                histogram["buckets"][bisect_left(HISTOGRAMS[name][1], value)] += 1
+                histogram["sum"] += value
+                histogram["count"] += 1
+
+            if time.monotonic() - self.flushed_at >= self.flush_interval:
+                self.flush_locked()
+
+    def flush(self):
+        with self.lock:
+            if self.pid == os.getpid():
+                self.flush_locked()
+
+    def flush_locked(self):
+        self.flushed_at = time.monotonic()
+        data = [
+            {"view": view, "method": method, **series}
+            for (view, method), series in self.series.items()
+        ]
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            json.dump(data, file)
+        os.replace(file.name, self.path)
+
+    def is_alive(self, path):
+        """
+        @param path: archivo de métricas "<pid>-<marca de tiempo>.json"
+        @return: si el proceso que lo escribe sigue en ejecución
+        """
+        try:
+            pid = int(os.path.basename(path).split("-", 1)[0])
+        except ValueError:
+            return False
+        if pid == self.pid:
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # Existe, pero es de otro usuario
+            return True
+        return True
+
+    def collect(self):
+        """
+        Suma las métricas de todos los workers.
+        @return: {(vista, método): {"statuses": ..., "histograms": ...}}
+        """
+        self.flush()
+        merged = {}
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            if not self.is_alive(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path) as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for item in data:
+                series = merged.setdefault(
+                    (item["view"], item["method"]),
+                    {
+                        "statuses": {},
+                        "histograms": {
+                            name: empty_histogram(name) for name in HISTOGRAMS
+                        },
+                    },
+                )
+                for status_code, count in item["statuses"].items():
+                    series["statuses"][status_code] = (
+                        series["statuses"].get(status_code, 0) + count
+                    )
+                for name, histogram in item["histograms"].items():
+                    if name not in HISTOGRAMS:
+                        continue
+                    total = series["histograms"][name]
+                    if len(histogram["buckets"]) != len(total["buckets"]):
+                        continue
+                    total["buckets"] = [
+                        a + b for a, b in zip(total["buckets"], histogram["buckets"])
+                    ]
+                    total["sum"] += histogram["sum"]
+                    total["count"] += histogram["count"]
+        return merged
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_bound(bound):
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+def render_prometheus(merged, prefix="sgr_http"):
+    """
+    Métricas en el formato de texto de Prometheus (versión 0.0.4).
+    """
+    series = sorted(merged.items())
+    lines = [
+        f"# HELP {prefix}_requests_total Solicitudes atendidas",
+        f"# TYPE {prefix}_requests_total counter",
+    ]
+    for (view, method), data in series:
+        labels = f'view="{escape_label(view)}",method="{escape_label(method)}"'
+        for status_code, count in sorted(data["statuses"].items()):
+            lines.append(
+                f'{prefix}_requests_total{{{labels},status="{status_code}"}} {count}'
+            )
+
+    for name, (description, bounds) in HISTOGRAMS.items():
+        metric = f"{prefix}_{name}"
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} histogram")
+        for (view, method), data in series:
+            labels = f'view="{escape_label(view)}",method="{escape_label(method)}"'
+            histogram = data["histograms"][name]
+            cumulative = 0
+            for bound, count in zip((*bounds, "+Inf"), histogram["buckets"]):
+                cumulative += count
+                lines.append(
+                    f'{metric}_bucket{{{labels},le="{format_bound(bound)}"}} {cumulative}'
+                )
+            lines.append(f"{metric}_sum{{{labels}}} {histogram['sum']}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+metrics_store = MetricsStore(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+from django.conf import settings
+from .queries import record_queries
+
+
+class QueryBudgetMixin:
+    """
+    Mixin para los TestCase que limita las consultas de cada endpoint.
+
+    Las pruebas declaran el máximo por nombre de ruta en `query_budgets` y
+    envuelven la solicitud con `assertQueryBudget`:
+
+        class MovementsTests(QueryBudgetMixin, TestCase):
+            query_budgets = {"movements_by_project": 4}
+
+            def test_list(self):
+                with self.assertQueryBudget("movements_by_project"):
+                    self.client.get(url)
+
+    La prueba falla si se supera el presupuesto o si una misma forma de
+    consulta se repite NPLUSONE_THRESHOLD veces o más.
+    """
+
+    query_budgets = {}
+
+    @contextmanager
+    def assertQueryBudget(self, budget, threshold=None):
+        """
+        @param budget: nombre de ruta de `query_budgets` o número de consultas
+        @param threshold: repeticiones de una forma que se consideran N+1
+        """
+        limit = self.query_budgets[budget] if isinstance(budget, str) else budget
+        threshold = threshold or settings.NPLUSONE_THRESHOLD
+        with record_queries() as recorder:
+            yield recorder
+
+        statements = "\n".join(
+            f"  {index}. {query['sql']}"
+            for index, query in enumerate(recorder.queries, start=1)
+        )
+        if recorder.count > limit:
+            self.fail(
+                f"{budget}: {recorder.count} consultas, el presupuesto es "
+                f"{limit}:\n{statements}"
+            )
+        repeated = recorder.repeated_shapes(threshold)
+        if repeated:
+            shapes = "\n".join(f"  {count}x {shape}" for shape, count in repeated)
+            self.fail(f"{budget}: consultas repetidas (N+1):\n{shapes}")
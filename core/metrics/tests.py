@@ -0,0 +1,51 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from core.projects.models import Project
+from core.tasks.tests import TEST_CACHES
+from core.users.models import User
+from .models import RequestProfile
+from .testing import QueryBudgetMixin
+
+
+class QueryBudgetMixinTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.projects = [Project.objects.create(name=f"P{index}") for index in range(6)]
+
+    def test_repeated_query_shape_fails(self):
+        with self.assertRaisesMessage(AssertionError, "consultas repetidas (N+1)"):
+            with self.assertQueryBudget(100):
+                for project in self.projects:
+                    Project.objects.get(id=project.id)
+
+    def test_exceeding_the_budget_fails(self):
+        with self.assertRaisesMessage(AssertionError, "el presupuesto es 1"):
+            with self.assertQueryBudget(1):
+                Project.objects.count()
+                Project.objects.exists()
+
+    def test_single_query_passes(self):
+        with self.assertQueryBudget(1):
+            Project.objects.filter(id__in=[p.id for p in self.projects]).count()
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ProfilerMiddlewareTests(TestCase):
+    def get(self, user=None):
+        headers = {}
+        if user is not None:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(user)}"
+        return self.client.get(
+            reverse("profiles_view"), {"_profile": RequestProfile.SQL}, **headers
+        )
+
+    def test_only_staff_requests_are_profiled(self):
+        user = User.objects.create(email="usuario@example.com", identification="1")
+        self.assertNotIn("kind", self.get().json())
+        self.assertNotIn("kind", self.get(user).json())
+        self.assertFalse(RequestProfile.objects.exists())
+
+        user.is_staff = True
+        user.save()
+        self.assertEqual(self.get(user).json()["kind"], RequestProfile.SQL)
+        self.assertEqual(RequestProfile.objects.count(), 1)
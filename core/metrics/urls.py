@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("metrics", views.MetricsView.as_view(), name="metrics_view"),
+    path("profiles/", views.RequestProfileView.as_view(), name="profiles_view"),
+    path(
+        "profiles/<uuid:profile_id>/",
+        views.RequestProfileDetailView.as_view(),
+        name="profile_detail_view",
+    ),
+]
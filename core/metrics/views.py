@@ -0,0 +1,185 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from .models import RequestProfile
+from .serializers import RequestProfileListSerializer, RequestProfileSerializer
+from .store import metrics_store, render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsView(APIView):
+    """
+    Class to expose the request metrics in Prometheus text format
+
+    The metrics collector is not a user of the application: if METRICS_TOKEN
+    is set, the request must send it as `Authorization: Bearer <token>`;
+    otherwise only administrators can get the metrics.
+
+    @methods:
+    - get: Get the metrics of all the workers
+    """
+
+    # Solo el token de métricas o administradores: la vista lo verifica
+    permission_classes = []
+
+    def get_authenticators(self):
+        # Con METRICS_TOKEN el encabezado Authorization lleva ese token y no un JWT
+        if settings.METRICS_TOKEN:
+            return []
+        return super().get_authenticators()
+
+    @swagger_auto_schema(
+        operation_description="Métricas por ruta en formato de texto de Prometheus",
+        responses={
+            200: openapi.Response(description="Métricas"),
+            403: openapi.Response(
+                description="Token inválido o usuario que no es administrador"
+            ),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request):
+        """
+        Get the metrics of all the workers
+        @param request: HTTP request
+        @return: Prometheus text response
+        """
+        try:
+            if settings.METRICS_TOKEN and not hmac.compare_digest(
+                request.headers.get("Authorization", ""),
+                f"Bearer {settings.METRICS_TOKEN}",
+            ):
+                response = {
+                    "message": "Token de métricas inválido",
+                    "status": status.HTTP_403_FORBIDDEN,
+                }
+                return Response(response, status=status.HTTP_403_FORBIDDEN)
+            if not settings.METRICS_TOKEN:
+                forbidden = staff_only_response(
+                    request, "Solo los administradores pueden consultar las métricas"
+                )
+                if forbidden:
+                    return forbidden
+            return HttpResponse(
+                render_prometheus(metrics_store.collect()),
+                content_type=PROMETHEUS_CONTENT_TYPE,
+            )
+        except Exception as e:
+            response = {
+                "message": f"Error al obtener las métricas: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def staff_only_response(
+    request, message="Solo los administradores pueden consultar los perfiles"
+):
+    """
+    Respuesta 403 si el usuario no es administrador, o None.
+    """
+    if getattr(request.user, "is_staff", False):
+        return None
+    response = {
+        "message": message,
+        "status": status.HTTP_403_FORBIDDEN,
+    }
+    return Response(response, status=status.HTTP_403_FORBIDDEN)
+
+
+class RequestProfileView(APIView):
+    """
+    Class to list the request profiles taken with `?_profile=`
+
+    @methods:
+    - get: List the profiles, newest first
+    """
+
+    # Solo administradores: la vista lo verifica con staff_only_response
+    permission_classes = []
+
+    @swagger_auto_schema(
+        operation_description="Listar los perfiles de solicitudes guardados",
+        responses={
+            200: openapi.Response(
+                description="Perfiles", schema=RequestProfileListSerializer(many=True)
+            ),
+            403: openapi.Response(description="Solo para administradores"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request):
+        """
+        List the profiles, newest first
+        @param request: HTTP request
+        @return: JSON response
+        """
+        try:
+            forbidden = staff_only_response(request)
+            if forbidden:
+                return forbidden
+            profiles = RequestProfile.objects.all()
+            serializer = RequestProfileListSerializer(profiles, many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except Exception as e:
+            response = {
+                "message": f"Error al obtener los perfiles: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class RequestProfileDetailView(APIView):
+    """
+    Class to get a request profile with its result
+
+    @methods:
+    - get: Get a profile
+    """
+
+    # Solo administradores: la vista lo verifica con staff_only_response
+    permission_classes = []
+
+    @swagger_auto_schema(
+        operation_description="Obtener un perfil de solicitud con su resultado",
+        responses={
+            200: openapi.Response(
+                description="Perfil", schema=RequestProfileSerializer
+            ),
+            403: openapi.Response(description="Solo para administradores"),
+            404: openapi.Response(description="Perfil no encontrado"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, profile_id):
+        """
+        Get a profile
+        @param request: HTTP request
+        @param profile_id: Profile ID
+        @return: JSON response
+        """
+        try:
+            forbidden = staff_only_response(request)
+            if forbidden:
+                return forbidden
+            profile = RequestProfile.objects.get(id=profile_id)
+            serializer = RequestProfileSerializer(profile)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except RequestProfile.DoesNotExist:
+            response = {
+                "message": "Perfil no encontrado",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response = {
+                "message": f"Error al obtener el perfil: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
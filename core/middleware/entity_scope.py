@@ -0,0 +1,16 @@
+from core.entities.tenancy import entity_scope
+
+
+class EntityScopeMiddleware:
+    """
+    Asocia la solicitud al alcance de entidad: una vez que DRF autentica al
+    usuario, las consultas de los modelos con EntityScopedManager se
+    restringen a los proyectos de su entidad.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with entity_scope(request):
+            return self.get_response(request)
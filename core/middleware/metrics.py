@@ -0,0 +1,71 @@
+import time
+from contextlib import ExitStack
+from django.db import connections
+from core.metrics.store import metrics_store
+
+
+class QueryCounter:
+    """
+    execute_wrapper que cuenta las consultas y el tiempo en la base de datos.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Registra por nombre de ruta y método la duración de la solicitud, el tamaño
+    de la respuesta y el número y tiempo de las consultas a la base de datos.
+    Las métricas se consultan en /api/metrics. En las respuestas en streaming
+    no se cuenta el tiempo ni las consultas de generar el contenido.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.store = metrics_store
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        self.store.observe(
+            self.get_view_name(request),
+            request.method,
+            response.status_code,
+            {
+                "request_duration_seconds": duration,
+                "response_size_bytes": self.get_size(response),
+                "db_queries": counter.count,
+                "db_duration_seconds": counter.duration,
+            },
+        )
+        return response
+
+    def get_view_name(self, request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unmatched"
+        return match.view_name or match.route
+
+    def get_size(self, response):
+        # En las respuestas en streaming solo se conoce si traen Content-Length
+        if not response.streaming:
+            return len(response.content)
+        if response.has_header("Content-Length"):
+            return int(response["Content-Length"])
+        return None
@@ -0,0 +1,80 @@
+import time
+from django.http import JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+from core.metrics.models import RequestProfile
+from core.metrics.profiling import run_cprofile, save_profile, sql_profile
+from core.metrics.queries import record_queries
+from core.users.authentication import CachedJWTAuthentication
+
+PROFILE_PARAMETER = "_profile"
+
+
+class ProfilerMiddleware:
+    """
+    Con `?_profile=cprofile` o `?_profile=sql` un administrador recibe el
+    perfil de la solicitud en lugar de la respuesta: las llamadas de Python
+    ordenadas por tiempo acumulado, o las consultas SQL con sus tiempos y sus
+    planes. El perfil también se guarda en RequestProfile.
+
+    Antes de perfilar se autentica el token de la solicitud con
+    CachedJWTAuthentication: si no es de un administrador la solicitud se
+    atiende sin perfilar.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def authenticate(self, request):
+        """
+        @return: usuario del token de la solicitud, o None si no tiene uno
+        válido
+        """
+        try:
+            authenticated = CachedJWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        return authenticated[0] if authenticated else None
+
+    def __call__(self, request):
+        kind = request.GET.get(PROFILE_PARAMETER)
+        if kind not in (RequestProfile.CPROFILE, RequestProfile.SQL):
+            return self.get_response(request)
+
+        user = self.authenticate(request)
+        if not getattr(user, "is_staff", False):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with record_queries() as recorder:
+            if kind == RequestProfile.CPROFILE:
+                response, result = run_cprofile(self.get_response, request)
+            else:
+                response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        if kind == RequestProfile.SQL:
+            result = sql_profile(recorder)
+
+        match = getattr(request, "resolver_match", None)
+        profile = save_profile(
+            kind=kind,
+            method=request.method,
+            path=request.get_full_path(),
+            view_name=match.view_name if match else None,
+            status_code=response.status_code,
+            duration_ms=round(duration * 1000, 3),
+            query_count=recorder.count,
+            result=result,
+            user=user,
+        )
+        return JsonResponse(
+            {
+                "id": str(profile.id),
+                "kind": kind,
+                "view_name": profile.view_name,
+                "status_code": profile.status_code,
+                "duration_ms": profile.duration_ms,
+                "query_count": recorder.count,
+                **result,
+            }
+        )
@@ -0,0 +1,50 @@
+import logging
+from django.conf import settings
+from core.metrics.queries import record_queries
+
+logger = logging.getLogger("sgr.queries")
+
+
+class RepeatedQueriesError(Exception):
+    pass
+
+
+class QueryInspectorMiddleware:
+    """
+    Middleware de desarrollo y pruebas que detecta consultas N+1: agrupa las
+    consultas de cada solicitud por forma normalizada y reporta las formas que
+    se repiten NPLUSONE_THRESHOLD veces o más.
+
+    El reporte va al logger sgr.queries y a los headers X-Query-Count y
+    X-Repeated-Queries; con NPLUSONE_RAISE la solicitud falla, para que las
+    pruebas no lo pasen por alto. Solo se instala con NPLUSONE_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = settings.NPLUSONE_THRESHOLD
+        self.raise_errors = settings.NPLUSONE_RAISE
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        repeated = recorder.repeated_shapes(self.threshold)
+        response["X-Query-Count"] = str(recorder.count)
+        response["X-Repeated-Queries"] = str(len(repeated))
+        if repeated:
+            match = getattr(request, "resolver_match", None)
+            view = match.view_name if match else request.path
+            message = "\n".join(f"  {count}x {shape}" for shape, count in repeated)
+            logger.warning(
+                "%s %s: %s consultas, formas repetidas:\n%s",
+                request.method,
+                view,
+                recorder.count,
+                message,
+            )
+            if self.raise_errors:
+                raise RepeatedQueriesError(
+                    f"{request.method} {view} repite consultas:\n{message}"
+                )
+        return response
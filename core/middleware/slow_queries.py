@@ -0,0 +1,22 @@
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from core.metrics.slow_queries import SlowQueryCapture, slow_query_log
+
+
+class SlowQueryMiddleware:
+    """
+    Registra en SLOW_QUERY_LOG las consultas de la solicitud que tardan más de
+    SLOW_QUERY_THRESHOLD_MS; se resumen con `manage.py slow_queries`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS
+
+    def __call__(self, request):
+        capture = SlowQueryCapture(slow_query_log, self.threshold_ms, request)
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(capture))
+            return self.get_response(request)
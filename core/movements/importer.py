@@ -0,0 +1,258 @@
+import csv
+import io
+import json
+import time
+import uuid
+from django.db import connection, transaction
+from core.cdps.models import Cdps
+from core.cdps.utils import clean_amount
+from .models import Movement, choices
+
+MOVEMENT_TYPES = {value for value, _ in choices}
+DESCRIPTION_MAX_LENGTH = Movement._meta.get_field("description").max_length
+AMOUNT_FIELD = Movement._meta.get_field("amount")
+
+
+class MovementImporter:
+    """
+    Importa movimientos desde un archivo CSV o NDJSON.
+
+    El archivo se recorre como un flujo, los números de CDP se resuelven con un
+    único diccionario cargado en una consulta y las filas válidas se insertan
+    por lotes. En PostgreSQL cada lote se carga con COPY en una tabla temporal
+    y al final se pasa a `movements` con un solo INSERT ... SELECT.
+
+    Columnas esperadas: cdp_number (o cdp_id), amount, type, description.
+
+    Los números de CDP no son únicos entre proyectos: con `project_id` solo se
+    aceptan CDP de ese proyecto, y un número que corresponde a varios CDP se
+    reporta como error de la fila en lugar de elegir uno.
+    """
+
+    FORMATS = ("csv", "ndjson")
+    MAX_REPORTED_ERRORS = 100
+
+    def __init__(self, stream, file_format="csv", batch_size=5000, project_id=None):
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Formato no soportado: {file_format}")
+        self.stream = stream
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.project_id = project_id
+        self.errors = []
+        self.error_count = 0
+        self.total_rows = 0
+
+    def process(self):
+        """
+        Ejecuta la importación.
+        @return: diccionario con el resumen de la importación
+        """
+        start = time.perf_counter()
+        cdps_by_number, cdp_ids = self.load_cdps()
+        use_copy = connection.vendor == "postgresql"
+        imported = 0
+
+        with transaction.atomic():
+            if use_copy:
+                self.create_staging_table()
+
+            batch = []
+            for line, row in self.iter_rows():
+                movement = self.parse_row(line, row, cdps_by_number, cdp_ids)
+                if movement is None:
+                    continue
+                batch.append(movement)
+                if len(batch) >= self.batch_size:
+                    self.flush(batch, use_copy)
+                    imported += len(batch)
+                    batch = []
+
+            if batch:
+                self.flush(batch, use_copy)
+                imported += len(batch)
+
+            if use_copy:
+                imported = self.merge_staging_table()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "total_rows": self.total_rows,
+            "imported": imported,
+            "failed": self.error_count,
+            "errors": self.errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.total_rows / elapsed, 1) if elapsed else None,
+        }
+
+    def load_cdps(self):
+        """
+        @return: (diccionario número -> id, con None para los números que
+        corresponden a varios CDP; conjunto de ids de los CDP)
+        """
+        cdps = Cdps.objects.all()
+        if self.project_id:
+            cdps = cdps.filter(activity__project_id=self.project_id)
+        cdps_by_number = {}
+        cdp_ids = set()
+        for number, cdp_id in cdps.values_list("number", "id").iterator():
+            cdp_ids.add(cdp_id)
+            if number is None:
+                continue
+            cdps_by_number[number] = None if number in cdps_by_number else cdp_id
+        return cdps_by_number, cdp_ids
+
+    def iter_rows(self):
+        """
+        Recorre el archivo sin cargarlo completo en memoria.
+        @return: generador de tuplas (número de línea, fila)
+        """
+        if self.file_format == "csv":
+            reader = csv.DictReader(self.stream)
+            for row in reader:
+                self.total_rows += 1
+                yield reader.line_num, row
+        else:
+            for line, text in enumerate(self.stream, start=1):
+                if not text.strip():
+                    continue
+                self.total_rows += 1
+                try:
+                    row = json.loads(text)
+                except ValueError:
+                    self.add_error(line, "JSON inválido")
+                    continue
+                if not isinstance(row, dict):
+                    self.add_error(line, "La línea debe ser un objeto JSON")
+                    continue
+                yield line, row
+
+    def parse_row(self, line, row, cdps_by_number, cdp_ids):
+        """
+        Valida una fila y la convierte en una tupla lista para insertar.
+        @return: (id, amount, description, type, cdp_id) o None si la fila es inválida
+        """
+        cdp_number = str(row.get("cdp_number") or "").strip()
+        cdp_id = row.get("cdp_id")
+        if cdp_number:
+            if cdp_number not in cdps_by_number:
+                self.add_error(line, f"CDP {cdp_number} no encontrado")
+                return None
+            cdp_id = cdps_by_number[cdp_number]
+            if cdp_id is None:
+                self.add_error(
+                    line,
+                    f"El número {cdp_number} corresponde a varios CDP: "
+                    "indique project_id o use cdp_id",
+                )
+                return None
+        elif cdp_id:
+            try:
+                cdp_id = uuid.UUID(str(cdp_id))
+            except ValueError:
+                self.add_error(line, "cdp_id no es un UUID válido")
+                return None
+            if cdp_id not in cdp_ids:
+                self.add_error(line, f"CDP {cdp_id} no encontrado")
+                return None
+        else:
+            self.add_error(line, "La fila no tiene cdp_number ni cdp_id")
+            return None
+
+        try:
+            amount = clean_amount(
+                str(row.get("amount", "")).replace(",", ""), AMOUNT_FIELD
+            )
+        except ValueError as e:
+            self.add_error(line, f"Monto inválido: {row.get('amount')} ({e})")
+            return None
+
+        movement_type = str(row.get("type") or "I").strip().upper()
+        if movement_type not in MOVEMENT_TYPES:
+            self.add_error(line, f"Tipo de movimiento inválido: {movement_type}")
+            return None
+
+        description = row.get("description") or None
+        if description is not None and not isinstance(description, str):
+            self.add_error(line, "La descripción debe ser un texto")
+            return None
+        if description and len(description) > DESCRIPTION_MAX_LENGTH:
+            self.add_error(
+                line,
+                f"La descripción supera los {DESCRIPTION_MAX_LENGTH} caracteres",
+            )
+            return None
+
+        return (uuid.uuid4(), amount, description, movement_type, cdp_id)
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < self.MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "message": message})
+
+    def flush(self, batch, use_copy):
+        if use_copy:
+            self.copy_to_staging_table(batch)
+        else:
+            Movement.objects.bulk_create(
+                [
+                    Movement(
+                        id=movement_id,
+                        amount=amount,
+                        description=description,
+                        type=movement_type,
+                        cdp_id=cdp_id,
+                    )
+                    for movement_id, amount, description, movement_type, cdp_id in batch
+                ],
+                batch_size=self.batch_size,
+            )
+
+    def create_staging_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                CREATE TEMP TABLE movements_staging (
+                    id uuid NOT NULL,
+                    amount numeric(20, 2) NOT NULL,
+                    description varchar(500),
+                    type varchar(1) NOT NULL,
+                    cdp_id uuid NOT NULL
+                ) ON COMMIT DROP
+                """
+            )
+
+    def copy_to_staging_table(self, batch):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for movement_id, amount, description, movement_type, cdp_id in batch:
+            writer.writerow(
+                [movement_id, amount, description or "", movement_type, cdp_id]
+            )
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                "COPY movements_staging (id, amount, description, type, cdp_id) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+
+    def merge_staging_table(self):
+        """
+        Inserta en `movements` todas las filas de la tabla temporal con un solo
+        INSERT ... SELECT. El JOIN con `cdps` descarta filas cuyo CDP se haya
+        eliminado durante la importación.
+        @return: número de movimientos insertados
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO movements
+                    (id, amount, description, type, cdp_id, created_at, updated_at)
+                SELECT s.id, s.amount, NULLIF(s.description, ''), s.type, s.cdp_id,
+                       now(), now()
+                FROM movements_staging s
+                JOIN cdps c ON c.id = s.cdp_id
+                """
+            )
+            return cursor.rowcount
@@ -0,0 +1,60 @@
+import os
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from core.movements.importer import MovementImporter
+
+
+class Command(BaseCommand):
+    help = "Importa movimientos desde un archivo CSV o NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Ruta del archivo a importar")
+        parser.add_argument(
+            "--format",
+            choices=MovementImporter.FORMATS,
+            help="Formato del archivo (por defecto se deduce de la extensión)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Número de filas por lote",
+        )
+        parser.add_argument(
+            "--project-id",
+            help="Proyecto de los CDP; necesario si un número de CDP se repite entre proyectos",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"]
+        if not file_format:
+            extension = os.path.splitext(path)[1].lower()
+            file_format = "ndjson" if extension in (".ndjson", ".jsonl") else "csv"
+
+        project_id = options["project_id"]
+        if project_id:
+            try:
+                project_id = uuid.UUID(project_id)
+            except ValueError:
+                raise CommandError("project_id no es un UUID válido")
+
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as stream:
+                report = MovementImporter(
+                    stream, file_format, options["batch_size"], project_id=project_id
+                ).process()
+        except OSError as e:
+            raise CommandError(f"No se pudo leer el archivo: {str(e)}")
+
+        for error in report["errors"]:
+            self.stderr.write(f"Línea {error['line']}: {error['message']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report['imported']} movimientos importados de "
+                f"{report['total_rows']} filas ({report['failed']} con errores) "
+                f"en {report['elapsed_seconds']}s "
+                f"({report['rows_per_second']} filas/s)"
+            )
+        )
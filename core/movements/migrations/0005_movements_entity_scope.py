@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:15
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cdps", "0006_cdps_entity_scope"),
+        ("movements", "0004_alter_movement_amount"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="movement",
+            options={"default_manager_name": "all_objects", "ordering": ["id"]},
+        ),
+        migrations.AlterModelManagers(
+            name="movement",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="movement",
+            index=models.Index(fields=["cdp", "id"], name="movements_cdp_idx"),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from core.cdps.models import Cdps
+from core.entities.tenancy import EntityScopedManager
 
 choices = (("I", "Income"), ("E", "Expense"))
 
@@ -18,6 +19,12 @@ class Movement(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    all_objects = models.Manager()
+    # Restringido a la entidad de la solicitud (core.entities.tenancy)
+    objects = EntityScopedManager("cdp__activity__project__entity")
+
     class Meta:
         db_table = "movements"
         ordering = ["id"]
+        default_manager_name = "all_objects"
+        indexes = [models.Index(fields=["cdp", "id"], name="movements_cdp_idx")]
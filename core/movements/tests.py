@@ -1,3 +1,104 @@
+import io
+import tempfile
+from decimal import Decimal
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.activities.models import Activity
+from core.cdps.models import Cdps
+from core.entities.models import Entity
+from core.metrics.testing import QueryBudgetMixin
+from core.projects.models import Project
+from core.rubros.models import Rubro
+from core.users.models import User
+from .importer import MovementImporter
+from .models import Movement
 
-# Create your tests here.
+
+class MovementsByProjectQueryBudgetTests(QueryBudgetMixin, TestCase):
+    query_budgets = {"movement-by-project": 1}
+
+    def setUp(self):
+        self.project = Project.objects.create(
+            name="Proyecto", entity=Entity.objects.create(name="Entidad")
+        )
+        for index in range(6):
+            rubro = Rubro.objects.create(
+                descripcion=f"Rubro {index}", value_sgr=1000, project=self.project
+            )
+            activity = Activity.objects.create(
+                name=f"Actividad {index}", project=self.project, rubro=rubro
+            )
+            cdp = Cdps.objects.create(
+                number=str(index), amount=100, rubro=rubro, activity=activity
+            )
+            Movement.objects.create(amount=40, type="E", cdp=cdp)
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create(
+                email="admin@example.com", identification="1", is_superuser=True
+            )
+        )
+
+    def test_list_by_project(self):
+        url = reverse("movement-by-project", args=[self.project.id])
+        with self.assertQueryBudget("movement-by-project"):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 6)
+
+
+class MovementImporterTests(TestCase):
+    CSV = 'cdp_number,amount,type\n1,1e30,I\n1,NaN,I\n1,10.005,I\n1,"1,234.50",E\n'
+
+    def setUp(self):
+        # El mismo número de CDP en dos proyectos
+        self.cdps = {}
+        for name in ("A", "B"):
+            project = Project.objects.create(name=name)
+            rubro = Rubro.objects.create(value_sgr=1000, project=project)
+            activity = Activity.objects.create(project=project, rubro=rubro)
+            self.cdps[name] = Cdps.objects.create(
+                number="1", amount=100, rubro=rubro, activity=activity
+            )
+
+    def test_invalid_amounts_are_row_errors(self):
+        report = MovementImporter(
+            io.StringIO(self.CSV), project_id=self.cdps["A"].activity.project_id
+        ).process()
+
+        self.assertEqual(report["imported"], 1)
+        self.assertEqual(
+            report["errors"],
+            [
+                {
+                    "line": 2,
+                    "message": "Monto inválido: 1e30 (admite hasta 18 dígitos enteros)",
+                },
+                {"line": 3, "message": "Monto inválido: NaN (no es un número finito)"},
+                {
+                    "line": 4,
+                    "message": "Monto inválido: 10.005 (admite hasta 2 decimales)",
+                },
+            ],
+        )
+        movement = Movement.objects.get()
+        self.assertEqual(movement.amount, Decimal("1234.50"))
+        self.assertEqual(movement.cdp, self.cdps["A"])
+
+    def test_command_accepts_project_id(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write(self.CSV)
+            file.flush()
+            with self.assertRaises(CommandError):
+                call_command("import_movements", file.name, project_id="x")
+            call_command(
+                "import_movements",
+                file.name,
+                project_id=str(self.cdps["B"].activity.project_id),
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+        self.assertEqual(Movement.objects.get().cdp, self.cdps["B"])
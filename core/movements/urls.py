@@ -3,6 +3,11 @@ from . import views
 
 urlpatterns = [
     path("movements", views.MovementView.as_view(), name="movements_view"),
+    path(
+        "movements/import",
+        views.MovementImportView.as_view(),
+        name="movements_import_view",
+    ),
     path(
         "movements/<uuid:id>",
         views.MovementDetailView.as_view(),
@@ -1,4 +1,8 @@
+import io
+import os
+import uuid
 from rest_framework import status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from core.activities.models import Activity
 from .models import Movement
@@ -8,6 +12,8 @@ from .serializers import MovementSerializer
 from core.cdps.models import Cdps
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from .importer import MovementImporter
+from core.exports.csv_stream import CsvExportMixin, csv_format_parameter, csv_response
 
 
 # Definir el cuerpo de la solicitud para el POST en MovementView
@@ -118,6 +124,105 @@ class MovementView(APIView):
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class MovementImportView(APIView):
+    """
+    Class to handle the bulk import of movements from a file
+
+    @methods:
+    - post: Import movements from a CSV or NDJSON file
+    """
+
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description="Importar movimientos desde un archivo CSV o NDJSON",
+        manual_parameters=[
+            openapi.Parameter(
+                "file",
+                openapi.IN_FORM,
+                type=openapi.TYPE_FILE,
+                required=True,
+                description="Archivo con columnas cdp_number (o cdp_id), amount, type y description",
+            ),
+            openapi.Parameter(
+                "format",
+                openapi.IN_FORM,
+                type=openapi.TYPE_STRING,
+                enum=list(MovementImporter.FORMATS),
+                description="Formato del archivo (por defecto se deduce de la extensión)",
+            ),
+            openapi.Parameter(
+                "project_id",
+                openapi.IN_FORM,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_UUID,
+                description="Proyecto de los CDP; necesario si un número de CDP se repite entre proyectos",
+            ),
+        ],
+        responses={
+            201: openapi.Response(description="Movimientos importados"),
+            400: openapi.Response(description="Archivo no enviado o formato inválido"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+        consumes=["multipart/form-data"],
+    )
+    def post(self, request):
+        """
+        Import movements from a CSV or NDJSON file
+        @param request: HTTP request
+        @return: JSON response with the import report
+        """
+
+        file = request.FILES.get("file")
+        if not file:
+            response = {
+                "message": "No se envió el archivo",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get("format")
+        if not file_format:
+            extension = os.path.splitext(file.name)[1].lower()
+            file_format = "ndjson" if extension in (".ndjson", ".jsonl") else "csv"
+        if file_format not in MovementImporter.FORMATS:
+            response = {
+                "message": f"Formato no soportado: {file_format}",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+        project_id = request.data.get("project_id") or None
+        if project_id:
+            try:
+                project_id = uuid.UUID(str(project_id))
+            except ValueError:
+                response = {
+                    "message": "project_id no es un UUID válido",
+                    "status": status.HTTP_400_BAD_REQUEST,
+                }
+                return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+            report = MovementImporter(
+                stream, file_format, project_id=project_id
+            ).process()
+            return Response(report, status=status.HTTP_201_CREATED)
+        except UnicodeDecodeError:
+            response = {
+                "message": "El archivo debe estar codificado en UTF-8",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            response = {
+                "message": f"Error importando los movimientos: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class MovementDetailView(APIView):
     """
     Class to handle HTTP requests related to a specific movement
@@ -237,7 +342,17 @@ class MovementDetailView(APIView):
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class MovementsByProjectId(APIView):
+MOVEMENT_CSV_COLUMNS = [
+    ("ID", "id"),
+    ("Fecha", "created_at"),
+    ("CDP", "cdp__number"),
+    ("Tipo", "type"),
+    ("Monto", "amount"),
+    ("Descripción", "description"),
+]
+
+
+class MovementsByProjectId(CsvExportMixin, APIView):
     """
     Class to handle HTTP requests related to movements
 
@@ -250,6 +365,7 @@ class MovementsByProjectId(APIView):
     # Endpoint para obtener movimientos por proyecto
     @swagger_auto_schema(
         operation_description="Obtener movimientos filtrados por ID de proyecto",
+        manual_parameters=[csv_format_parameter],
         responses={
             200: openapi.Response(
                 description="Movimientos recuperados correctamente",
@@ -276,7 +392,16 @@ class MovementsByProjectId(APIView):
             )
 
             # Filtramos los movimientos relacionados con los CDPs obtenidos
-            movements = Movement.objects.filter(cdp_id__in=cdps_ids)
+            movements = Movement.objects.filter(cdp_id__in=cdps_ids).select_related(
+                "cdp__rubro__project__entity",
+                "cdp__activity__project",
+                "cdp__activity__rubro__project__entity",
+            )
+
+            if self.wants_csv(request):
+                return csv_response(
+                    movements, MOVEMENT_CSV_COLUMNS, f"movimientos_{project_id}.csv"
+                )
 
             # Serializamos los movimientos encontrados
             movement_serializer = MovementSerializer(movements, many=True)
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:55
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movementsCounterpart", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="movementscounterpart",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid4,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+                unique=True,
+            ),
+        ),
+    ]
@@ -7,7 +7,9 @@ choices = (("I", "Income"), ("E", "Expense"))
 
 # Create your models here.
 class MovementsCounterpart(models.Model):
-    id = models.UUIDField(primary_key=True, editable=False, unique=True)
+    id = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False, unique=True
+    )
     amount = models.DecimalField(max_digits=20, decimal_places=2)
     description = models.CharField(max_length=250, null=True, blank=True)
     type = models.CharField(max_length=1, choices=choices, default="I")
@@ -1,10 +1,10 @@
 from rest_framework import serializers
-from .models import MovementCounterpart
+from .models import MovementsCounterpart
 
 
 class MovementCounterpartSerializer(serializers.ModelSerializer):
     class Meta:
-        model = MovementCounterpart
+        model = MovementsCounterpart
         exclude = ["created_at", "updated_at", "deleted_at"]
 
     def to_internal_value(self, data):
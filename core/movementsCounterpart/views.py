@@ -9,6 +9,7 @@ from .serializers import MovementCounterpartSerializer
 from core.counterpartExecution.models import CounterpartExecution
 from core.activities.models import Activity
 from django.db.models import Sum
+from core.exports.csv_stream import CsvExportMixin, csv_format_parameter, csv_response
 
 # Create your views here.
 movement_counterpart_request_body = openapi.Schema(
@@ -181,9 +182,9 @@ class MovementsCounterpartDetailView(APIView):
             500: openapi.Response(description="Error interno del servidor"),
         },
     )
-    def put(self, request, pk):
+    def put(self, request, id):
         try:
-            movement = MovementsCounterpart.objects.get(id=pk)
+            movement = MovementsCounterpart.objects.get(id=id)
 
             data = request.data
 
@@ -229,9 +230,9 @@ class MovementsCounterpartDetailView(APIView):
             500: openapi.Response(description="Error interno del servidor"),
         },
     )
-    def delete(self, request, pk):
+    def delete(self, request, id):
         try:
-            movement = MovementsCounterpart.objects.get(id=pk)
+            movement = MovementsCounterpart.objects.get(id=id)
             movement.delete()
 
             return Response(status=status.HTTP_200_OK)
@@ -249,7 +250,17 @@ class MovementsCounterpartDetailView(APIView):
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class MovementsCounterpartByProjectId(APIView):
+MOVEMENT_COUNTERPART_CSV_COLUMNS = [
+    ("ID", "id"),
+    ("Fecha", "created_at"),
+    ("Ejecución de contrapartida", "counterpart_execution__number"),
+    ("Tipo", "type"),
+    ("Monto", "amount"),
+    ("Descripción", "description"),
+]
+
+
+class MovementsCounterpartByProjectId(CsvExportMixin, APIView):
     """
     Class to handle HTTP requests related to movements
 
@@ -262,6 +273,7 @@ class MovementsCounterpartByProjectId(APIView):
     # Endpoint para obtener movimientos por proyecto
     @swagger_auto_schema(
         operation_description="Obtener movimientos filtrados por ID de proyecto",
+        manual_parameters=[csv_format_parameter],
         responses={
             200: openapi.Response(
                 description="Movimientos recuperados correctamente",
@@ -290,6 +302,13 @@ class MovementsCounterpartByProjectId(APIView):
                 counterpart_execution_id__in=counterpart_execution
             )
 
+            if self.wants_csv(request):
+                return csv_response(
+                    movements,
+                    MOVEMENT_COUNTERPART_CSV_COLUMNS,
+                    f"movimientos_contrapartida_{project_id}.csv",
+                )
+
             movement_serializer = MovementCounterpartSerializer(movements, many=True)
 
             return Response(movement_serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,244 @@
+import tempfile
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from core.cdps.models import Cdps
+from core.items.models import Item
+from core.movements.models import Movement
+from core.persons.models import Person
+from core.rubros.models import Rubro
+from core.travels.models import Travel
+
+# Filas por consulta a la base de datos
+CHUNK_SIZE = 2000
+HEADER_FONT = Font(bold=True)
+MONEY_FORMAT = "#,##0.00"
+DATE_FORMAT = "DD/MM/YYYY"
+DATETIME_FORMAT = "DD/MM/YYYY HH:MM"
+
+
+def local_datetime(value):
+    # openpyxl no acepta fechas con zona horaria
+    return timezone.localtime(value).replace(tzinfo=None) if value else None
+
+
+class ProjectWorkbookExport:
+    """
+    Exporta el presupuesto y la ejecución de un proyecto a Excel: rubros,
+    items, personas, viajes, CDPs y movimientos, cada uno en su hoja.
+
+    El libro se crea en modo `write_only`, que escribe cada fila a disco al
+    agregarla, y las filas se leen de la base de datos por bloques, así la
+    memoria no depende del número de registros. El libro se arma completo en
+    un archivo temporal antes de enviarlo: openpyxl necesita un archivo con
+    seek para escribir el índice del ZIP al final.
+    """
+
+    def __init__(self, project):
+        self.project = project
+
+    def build(self):
+        """
+        @return: archivo temporal con el libro, posicionado al inicio
+        """
+        workbook = Workbook(write_only=True)
+        for title, columns, rows in self.sheets():
+            self.write_sheet(workbook, title, columns, rows)
+
+        output = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+        workbook.save(output)
+        output.seek(0)
+        return output
+
+    def write_sheet(self, workbook, title, columns, rows):
+        """
+        @param columns: tuplas (encabezado, ancho, formato numérico o None)
+        @param rows: iterador de filas con un valor por columna
+        """
+        sheet = workbook.create_sheet(title)
+        for index, (_, width, _) in enumerate(columns):
+            sheet.column_dimensions[get_column_letter(index + 1)].width = width
+        sheet.freeze_panes = "A2"
+
+        header = []
+        for name, _, _ in columns:
+            cell = WriteOnlyCell(sheet, value=name)
+            cell.font = HEADER_FONT
+            header.append(cell)
+        sheet.append(header)
+
+        # Una celda con formato y una de texto por columna, reutilizadas en
+        # todas las filas: en modo write_only cada fila se escribe a disco
+        # dentro de append()
+        styled = []
+        texts = []
+        for _, _, number_format in columns:
+            cell = None
+            if number_format is not None:
+                cell = WriteOnlyCell(sheet)
+                cell.number_format = number_format
+            styled.append(cell)
+            texts.append(WriteOnlyCell(sheet))
+
+        for row in rows:
+            cells = list(row)
+            for index, value in enumerate(cells):
+                if isinstance(value, str):
+                    # openpyxl guarda como fórmula todo texto que empieza con
+                    # "="; los textos del usuario van siempre como texto
+                    cell = texts[index]
+                    cell.value = value
+                    cell.data_type = "s"
+                    cells[index] = cell
+                elif styled[index] is not None and value is not None:
+                    styled[index].value = value
+                    cells[index] = styled[index]
+            sheet.append(cells)
+
+    def sheets(self):
+        project = self.project
+        yield (
+            "Rubros",
+            [("Rubro", 50, None), ("Valor SGR", 18, MONEY_FORMAT)],
+            Rubro.objects.filter(project=project)
+            .order_by("descripcion", "id")
+            .values_list("descripcion", "value_sgr")
+            .iterator(chunk_size=CHUNK_SIZE),
+        )
+        yield (
+            "Items",
+            [
+                ("Rubro", 40, None),
+                ("Descripción", 50, None),
+                ("Justificación", 50, None),
+                ("Cantidad", 12, None),
+                ("Valor unitario", 18, MONEY_FORMAT),
+                ("Valor total", 18, MONEY_FORMAT),
+            ],
+            Item.objects.filter(rubro__project=project)
+            .order_by("rubro__descripcion", "id")
+            .values_list(
+                "rubro__descripcion",
+                "description",
+                "justificacion",
+                "quantity",
+                "unit_value",
+                "total_value",
+            )
+            .iterator(chunk_size=CHUNK_SIZE),
+        )
+        yield (
+            "Personas",
+            [
+                ("Rubro", 40, None),
+                ("Cargo", 40, None),
+                ("Dedicación", 14, None),
+                ("Semanas", 12, None),
+                ("Honorarios", 14, None),
+                ("Valor hora", 18, MONEY_FORMAT),
+                ("Total", 18, MONEY_FORMAT),
+            ],
+            Person.objects.filter(rubro__project=project)
+            .order_by("rubro__descripcion", "id")
+            .values_list(
+                "rubro__descripcion",
+                "job_title",
+                "dedication",
+                "weeks",
+                "fees",
+                "value_hour",
+                "total",
+            )
+            .iterator(chunk_size=CHUNK_SIZE),
+        )
+        yield (
+            "Viajes",
+            [
+                ("Rubro", 40, None),
+                ("Origen", 24, None),
+                ("Destino", 24, None),
+                ("Transporte", 18, None),
+                ("Cantidad", 12, None),
+                ("Personas", 12, None),
+                ("Días", 12, None),
+                ("Total", 18, MONEY_FORMAT),
+            ],
+            Travel.objects.filter(rubro__project=project)
+            .order_by("rubro__descripcion", "id")
+            .values_list(
+                "rubro__descripcion",
+                "origin",
+                "destination",
+                "transport",
+                "quantity",
+                "cant_persons",
+                "cant_days",
+                "total",
+            )
+            .iterator(chunk_size=CHUNK_SIZE),
+        )
+        yield (
+            "CDPs",
+            [
+                ("Número", 16, None),
+                ("Expedición", 14, DATE_FORMAT),
+                ("Rubro", 40, None),
+                ("Actividad", 40, None),
+                ("Monto", 18, MONEY_FORMAT),
+                ("Descripción", 50, None),
+                ("Generado", 12, None),
+                ("Cancelado", 12, None),
+            ],
+            self.cdps(),
+        )
+        yield (
+            "Movimientos",
+            [
+                ("Fecha", 18, DATETIME_FORMAT),
+                ("CDP", 16, None),
+                ("Tipo", 10, None),
+                ("Monto", 18, MONEY_FORMAT),
+                ("Descripción", 60, None),
+            ],
+            self.movements(),
+        )
+
+    def cdps(self):
+        for row in (
+            Cdps.objects.filter(activity__project=self.project)
+            .order_by("number", "id")
+            .values_list(
+                "number",
+                "expedition_date",
+                "rubro__descripcion",
+                "activity__name",
+                "amount",
+                "description",
+                "is_generated",
+                "is_canceled",
+            )
+            .iterator(chunk_size=CHUNK_SIZE)
+        ):
+            *values, is_generated, is_canceled = row
+            yield (
+                *values,
+                "Sí" if is_generated else "No",
+                "Sí" if is_canceled else "No",
+            )
+
+    def movements(self):
+        for created_at, cdp_number, movement_type, amount, description in (
+            Movement.objects.filter(cdp__activity__project=self.project)
+            .order_by("created_at", "id")
+            .values_list("created_at", "cdp__number", "type", "amount", "description")
+            .iterator(chunk_size=CHUNK_SIZE)
+        ):
+            yield (
+                local_datetime(created_at),
+                cdp_number,
+                "Ingreso" if movement_type == "I" else "Egreso",
+                amount,
+                description,
+            )
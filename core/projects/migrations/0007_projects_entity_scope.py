@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:15
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("entities", "0001_initial"),
+        ("projects", "0006_remove_project_duration"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="project",
+            options={"default_manager_name": "all_objects", "ordering": ["id"]},
+        ),
+        migrations.AlterModelManagers(
+            name="project",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(fields=["entity", "id"], name="projects_entity_idx"),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.db import models
 from django.utils import timezone
 from django.core.validators import FileExtensionValidator
 from core.entities.models import Entity
+from core.entities.tenancy import EntityScopedManager
 from .helpers import RenameFileWithProjectID
 
 
@@ -33,6 +34,12 @@ class Project(models.Model):
     updated_at = models.DateTimeField("updated_at", auto_now=True)
     deleted_at = models.DateTimeField("deleted_at", blank=True, null=True)
 
+    all_objects = models.Manager()
+    # Restringido a la entidad de la solicitud (core.entities.tenancy)
+    objects = EntityScopedManager("entity")
+
     class Meta:
         db_table = "projects"
         ordering = ["id"]
+        default_manager_name = "all_objects"
+        indexes = [models.Index(fields=["entity", "id"], name="projects_entity_idx")]
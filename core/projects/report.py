@@ -0,0 +1,384 @@
+import tempfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+from django.db.models import Sum
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import (
+    BaseDocTemplate,
+    Frame,
+    PageTemplate,
+    Paragraph,
+    Spacer,
+    Table,
+    TableStyle,
+)
+from core.cdps.models import Cdps
+from core.counterpartExecution.models import CounterpartExecution
+from core.counterparts.models import Counterpart
+from core.movements.models import Movement
+from core.rubros.models import Rubro
+
+# Filas por consulta a la base de datos y filas por tabla del PDF. Cada tabla
+# cabe en una página, así ReportLab nunca tiene que dividir tablas grandes.
+CHUNK_SIZE = 2000
+ROWS_PER_TABLE = 50
+STORY_BUFFER = 20
+MAX_TEXT = 60
+
+TITLE_STYLE = ParagraphStyle(
+    "report-title", fontName="Helvetica-Bold", fontSize=14, leading=18
+)
+SECTION_STYLE = ParagraphStyle(
+    "report-section",
+    fontName="Helvetica-Bold",
+    fontSize=11,
+    leading=14,
+    spaceBefore=14,
+    spaceAfter=6,
+)
+TEXT_STYLE = ParagraphStyle("report-text", fontName="Helvetica", fontSize=8, leading=11)
+TABLE_STYLE = TableStyle(
+    [
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 7),
+        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 7),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e6e6e6")),
+        ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.HexColor("#cccccc")),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ]
+)
+TOTAL_STYLE = TableStyle(
+    [
+        ("FONT", (0, 0), (-1, -1), "Helvetica-Bold", 7),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ]
+)
+
+
+def text(value):
+    if value is None:
+        return ""
+    value = str(value)
+    return value if len(value) <= MAX_TEXT else value[: MAX_TEXT - 1] + "…"
+
+
+def money(value):
+    return f"{value or 0:,.2f}"
+
+
+def state(is_generated, is_canceled):
+    if is_canceled:
+        return "Cancelado"
+    return "Generado" if is_generated else "Pendiente"
+
+
+class LazyStory(list):
+    """
+    Lista de flowables que se va llenando desde un generador a medida que
+    ReportLab consume los primeros elementos, para que el documento completo
+    nunca esté en memoria.
+
+    `BaseDocTemplate.build` solo revisa los primeros elementos de la lista
+    (y su longitud), así que basta con mantener `STORY_BUFFER` por delante.
+    """
+
+    def __init__(self, flowables):
+        super().__init__()
+        self.flowables = iter(flowables)
+        self.exhausted = False
+
+    def fill(self):
+        while not self.exhausted and super().__len__() < STORY_BUFFER:
+            try:
+                self.append(next(self.flowables))
+            except StopIteration:
+                self.exhausted = True
+
+    def __len__(self):
+        self.fill()
+        return super().__len__()
+
+    def __getitem__(self, index):
+        self.fill()
+        return super().__getitem__(index)
+
+
+class ProjectReportPdf:
+    """
+    Reporte de ejecución de un proyecto: rubros, CDPs, movimientos,
+    contrapartidas y ejecuciones de contrapartida.
+
+    Las filas se leen de la base de datos por bloques y se dibujan en tablas
+    de una página que ReportLab escribe a medida que se llenan las páginas,
+    así la memoria no depende del número de registros.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.generated_at = timezone.localtime()
+
+    def build(self):
+        """
+        @return: archivo temporal con el PDF, posicionado al inicio
+        """
+        output = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+        width, height = letter
+        frame = Frame(1.5 * cm, 1.5 * cm, width - 3 * cm, height - 3 * cm, id="body")
+        doc = BaseDocTemplate(
+            output,
+            pagesize=letter,
+            title=f"Reporte de ejecución - {self.project.name or self.project.id}",
+            pageTemplates=[
+                PageTemplate(id="body", frames=[frame], onPage=self.draw_footer)
+            ],
+        )
+        self.width = frame.width - frame.leftPadding - frame.rightPadding
+        doc.build(LazyStory(self.story()))
+        output.seek(0)
+        return output
+
+    def draw_footer(self, canvas, doc):
+        canvas.saveState()
+        canvas.setFont("Helvetica", 7)
+        canvas.drawString(
+            1.5 * cm,
+            0.9 * cm,
+            f"{self.project.name or ''} - "
+            f"Generado {self.generated_at.strftime('%d/%m/%Y %H:%M')}",
+        )
+        canvas.drawRightString(letter[0] - 1.5 * cm, 0.9 * cm, f"Página {doc.page}")
+        canvas.restoreState()
+
+    def story(self):
+        project = self.project
+        yield Paragraph(escape(text(project.name) or "Proyecto"), TITLE_STYLE)
+        yield Spacer(1, 6)
+        for label, value in (
+            ("Entidad", project.entity.name if project.entity else ""),
+            ("Valor", money(project.value)),
+            (
+                "Fechas",
+                f"{project.start_date or ''} a {project.end_date or ''}",
+            ),
+        ):
+            yield Paragraph(f"<b>{label}:</b> {escape(text(value))}", TEXT_STYLE)
+
+        yield from self.rubros()
+        yield from self.cdps()
+        yield from self.movements()
+        yield from self.counterparts()
+        yield from self.counterpart_executions()
+
+    def section(self, title, headers, shares, rows, totals=None):
+        """
+        Genera el título y las tablas de una sección a partir de un iterador
+        de filas.
+        @param shares: proporción del ancho de cada columna
+        @param totals: función que devuelve la fila de totales al terminar
+        """
+        widths = [self.width * share for share in shares]
+        yield Paragraph(escape(title), SECTION_STYLE)
+
+        chunk = []
+        count = 0
+        for row in rows:
+            chunk.append(row)
+            count += 1
+            if len(chunk) == ROWS_PER_TABLE:
+                yield Table([headers, *chunk], colWidths=widths, style=TABLE_STYLE)
+                chunk = []
+        if chunk:
+            yield Table([headers, *chunk], colWidths=widths, style=TABLE_STYLE)
+        if not count:
+            yield Paragraph("Sin registros", TEXT_STYLE)
+        elif totals:
+            yield Table([totals()], colWidths=widths, style=TOTAL_STYLE)
+
+    def rubros(self):
+        rubros = Rubro.objects.filter(project=self.project)
+        committed = {
+            row["rubro_id"]: row["total"]
+            for row in Cdps.objects.filter(rubro__project=self.project)
+            .values("rubro_id")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        }
+        executed = {
+            row["cdp__rubro_id"]: row["total"]
+            for row in Movement.objects.filter(
+                type="E", cdp__rubro__project=self.project
+            )
+            .values("cdp__rubro_id")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        }
+        totals = {
+            "available": Decimal(0),
+            "committed": Decimal(0),
+            "executed": Decimal(0),
+        }
+
+        def rows():
+            for rubro_id, descripcion, value_sgr in (
+                rubros.order_by("descripcion")
+                .values_list("id", "descripcion", "value_sgr")
+                .iterator(chunk_size=CHUNK_SIZE)
+            ):
+                rubro_committed = committed.get(rubro_id) or 0
+                rubro_executed = executed.get(rubro_id) or 0
+                totals["available"] += value_sgr or 0
+                totals["committed"] += rubro_committed
+                totals["executed"] += rubro_executed
+                yield [
+                    text(descripcion),
+                    money(value_sgr),
+                    money(rubro_committed),
+                    money(rubro_executed),
+                ]
+
+        yield from self.section(
+            "Rubros",
+            ["Rubro", "Disponible", "Comprometido", "Ejecutado"],
+            (0.46, 0.18, 0.18, 0.18),
+            rows(),
+            lambda: [
+                "Total",
+                money(totals["available"]),
+                money(totals["committed"]),
+                money(totals["executed"]),
+            ],
+        )
+
+    def cdps(self):
+        total = {"amount": Decimal(0)}
+
+        def rows():
+            for row in (
+                Cdps.objects.filter(activity__project=self.project)
+                .order_by("number", "id")
+                .values_list(
+                    "number",
+                    "expedition_date",
+                    "rubro__descripcion",
+                    "amount",
+                    "is_generated",
+                    "is_canceled",
+                )
+                .iterator(chunk_size=CHUNK_SIZE)
+            ):
+                number, expedition_date, rubro, amount, is_generated, is_canceled = row
+                total["amount"] += amount or 0
+                yield [
+                    text(number),
+                    expedition_date.strftime("%d/%m/%Y") if expedition_date else "",
+                    text(rubro),
+                    money(amount),
+                    state(is_generated, is_canceled),
+                ]
+
+        yield from self.section(
+            "CDPs",
+            ["Número", "Expedición", "Rubro", "Monto", "Estado"],
+            (0.14, 0.12, 0.44, 0.16, 0.14),
+            rows(),
+            lambda: ["Total", "", "", money(total["amount"]), ""],
+        )
+
+    def movements(self):
+        totals = {"I": Decimal(0), "E": Decimal(0)}
+
+        def rows():
+            for created_at, cdp_number, movement_type, amount, description in (
+                Movement.objects.filter(cdp__activity__project=self.project)
+                .order_by("created_at", "id")
+                .values_list(
+                    "created_at", "cdp__number", "type", "amount", "description"
+                )
+                .iterator(chunk_size=CHUNK_SIZE)
+            ):
+                totals[movement_type] = totals.get(movement_type, 0) + (amount or 0)
+                yield [
+                    timezone.localtime(created_at).strftime("%d/%m/%Y"),
+                    text(cdp_number),
+                    "Ingreso" if movement_type == "I" else "Egreso",
+                    money(amount),
+                    text(description),
+                ]
+
+        yield from self.section(
+            "Movimientos",
+            ["Fecha", "CDP", "Tipo", "Monto", "Descripción"],
+            (0.12, 0.14, 0.1, 0.16, 0.48),
+            rows(),
+            lambda: [
+                "Totales",
+                "",
+                "",
+                "",
+                f"Ingresos {money(totals['I'])} / Egresos {money(totals['E'])}",
+            ],
+        )
+
+    def counterparts(self):
+        totals = {"species": Decimal(0), "cash": Decimal(0)}
+
+        def rows():
+            for name, value_species, value_chash in (
+                Counterpart.objects.filter(project=self.project)
+                .order_by("name")
+                .values_list("name", "value_species", "value_chash")
+                .iterator(chunk_size=CHUNK_SIZE)
+            ):
+                totals["species"] += value_species or 0
+                totals["cash"] += value_chash or 0
+                yield [text(name), money(value_species), money(value_chash)]
+
+        yield from self.section(
+            "Contrapartidas",
+            ["Contrapartida", "Especie", "Efectivo"],
+            (0.6, 0.2, 0.2),
+            rows(),
+            lambda: ["Total", money(totals["species"]), money(totals["cash"])],
+        )
+
+    def counterpart_executions(self):
+        total = {"amount": Decimal(0)}
+
+        def rows():
+            for row in (
+                CounterpartExecution.objects.filter(counterpart__project=self.project)
+                .order_by("number", "id")
+                .values_list(
+                    "number",
+                    "expedition_date",
+                    "counterpart__name",
+                    "amount",
+                    "is_generated",
+                    "is_canceled",
+                )
+                .iterator(chunk_size=CHUNK_SIZE)
+            ):
+                number, expedition_date, counterpart, amount, is_generated, canceled = (
+                    row
+                )
+                total["amount"] += amount or 0
+                yield [
+                    text(number),
+                    expedition_date.strftime("%d/%m/%Y") if expedition_date else "",
+                    text(counterpart),
+                    money(amount),
+                    state(is_generated, canceled),
+                ]
+
+        yield from self.section(
+            "Ejecuciones de contrapartida",
+            ["Número", "Expedición", "Contrapartida", "Monto", "Estado"],
+            (0.14, 0.12, 0.44, 0.16, 0.14),
+            rows(),
+            lambda: ["Total", "", "", money(total["amount"]), ""],
+        )
@@ -1,3 +1,30 @@
+import zipfile
 from django.test import TestCase
+from openpyxl import load_workbook
+from core.entities.models import Entity
+from core.rubros.models import Rubro
+from .export import ProjectWorkbookExport
+from .models import Project
+from .report import ProjectReportPdf
 
-# Create your tests here.
+
+class ProjectReportPdfTests(TestCase):
+    def test_markup_in_user_text_is_escaped(self):
+        entity = Entity.objects.create(name="Entidad <b>")
+        project = Project.objects.create(name="Proyecto <i>x & y", entity=entity)
+        with ProjectReportPdf(project).build() as pdf:
+            self.assertEqual(pdf.read(5), b"%PDF-")
+
+
+class ProjectWorkbookExportTests(TestCase):
+    def test_user_text_is_not_written_as_formula(self):
+        project = Project.objects.create(name="Proyecto")
+        text = '=HYPERLINK("http://example.com","Ver")'
+        Rubro.objects.create(descripcion=text, value_sgr=1000, project=project)
+        output = ProjectWorkbookExport(project).build()
+        with zipfile.ZipFile(output) as archive:
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        self.assertNotIn("<f>", sheet)
+        output.seek(0)
+        cell = load_workbook(output)["Rubros"]["A2"]
+        self.assertEqual((cell.value, cell.data_type), (text, "s"))
@@ -9,4 +9,14 @@ urlpatterns = [
         views.ProjectByEntityView.as_view(),
         name="projects-by-entity",
     ),
+    path(
+        "projects/<uuid:project_id>/report.pdf",
+        views.ProjectReportView.as_view(),
+        name="project-report",
+    ),
+    path(
+        "projects/<uuid:project_id>/export.xlsx",
+        views.ProjectExportView.as_view(),
+        name="project-export",
+    ),
 ]
@@ -3,7 +3,10 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db import transaction
+from django.http import FileResponse
+from .export import ProjectWorkbookExport
 from .models import Project
+from .report import ProjectReportPdf
 from .serializers import ProjectSerializer, ProjectValidator, ProjectFileSerializer
 from .utils import (
     BudgetProcessor,
@@ -13,9 +16,24 @@ from .utils import (
     CounterPartsProcessor,
 )
 from core.entities.models import Entity
+from core.entities.tenancy import allows_entity, current_entity_id
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def entity_forbidden_response():
+    """
+    Respuesta 403 para un proyecto de una entidad distinta a la del usuario.
+    """
+    response = {
+        "message": "No puede asignar proyectos a otra entidad",
+        "status": status.HTTP_403_FORBIDDEN,
+    }
+    return Response(response, status=status.HTTP_403_FORBIDDEN)
+
+
 project_request_body = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
@@ -122,11 +140,10 @@ class ProjectView(APIView):
         try:
             # Obtener los datos del formulario (sin los archivos)
             data = request.data
-            entity = (
-                Entity.objects.get(id=data["entity_id"])
-                if data.get("entity_id")
-                else None
-            )
+            entity_id = data.get("entity_id") or current_entity_id()
+            if entity_id and not allows_entity(entity_id):
+                return entity_forbidden_response()
+            entity = Entity.objects.get(id=entity_id) if entity_id else None
 
             # Validar los datos del proyecto (sin los archivos)
             project_validator = ProjectValidator(data)
@@ -287,6 +304,8 @@ class ProjectDetail(APIView):
             # Validar el campo entity_id
             entity_id = data.get("entity_id")
             if entity_id:
+                if not allows_entity(entity_id):
+                    return entity_forbidden_response()
                 try:
                     entity = Entity.objects.get(id=entity_id)
                 except Entity.DoesNotExist:
@@ -417,3 +436,93 @@ class ProjectByEntityView(APIView):
                 {"message": f"Error retrieving projects: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class ProjectReportView(APIView):
+    """
+    View to download the execution report of a project as PDF
+
+    For large projects prefer the background report queue (POST /api/reports/
+    with kind "project"), which generates the same document.
+    """
+
+    @swagger_auto_schema(
+        operation_description="Descargar el reporte de ejecución de un proyecto en PDF",
+        responses={
+            200: openapi.Response(description="PDF generado correctamente"),
+            404: openapi.Response(description="Proyecto no encontrado"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, project_id):
+        """
+        Get the execution report of a project
+        @param request: HTTP request
+        @param project_id: Project ID
+        @return: PDF file response
+        """
+        try:
+            project = Project.objects.select_related("entity").get(id=project_id)
+            return FileResponse(
+                ProjectReportPdf(project).build(),
+                as_attachment=True,
+                filename=f"reporte_{project_id}.pdf",
+                content_type="application/pdf",
+            )
+        except Project.DoesNotExist:
+            response = {
+                "message": "Proyecto no encontrado",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response = {
+                "message": f"Error al generar el reporte: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ProjectExportView(APIView):
+    """
+    View to download the budget and execution of a project as an Excel file
+
+    For large projects prefer the background report queue (POST /api/reports/
+    with kind "project_xlsx"), which generates the same workbook.
+    """
+
+    @swagger_auto_schema(
+        operation_description="Exportar el presupuesto y la ejecución de un proyecto a Excel",
+        responses={
+            200: openapi.Response(description="Archivo generado correctamente"),
+            404: openapi.Response(description="Proyecto no encontrado"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, project_id):
+        """
+        Export the budget and execution of a project
+        @param request: HTTP request
+        @param project_id: Project ID
+        @return: Excel file response
+        """
+        try:
+            project = Project.objects.get(id=project_id)
+            return FileResponse(
+                ProjectWorkbookExport(project).build(),
+                as_attachment=True,
+                filename=f"proyecto_{project_id}.xlsx",
+                content_type=XLSX_CONTENT_TYPE,
+            )
+        except Project.DoesNotExist:
+            response = {
+                "message": "Proyecto no encontrado",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response = {
+                "message": f"Error al exportar el proyecto: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,103 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from core.reports.models import ReportJob
+from core.reports.utils import (
+    claim_next_job,
+    purge_expired_jobs,
+    requeue_stale_jobs,
+    run_job,
+    send_heartbeat,
+)
+
+
+def process_job(job):
+    try:
+        return run_job(job)
+    finally:
+        # Cada hilo tiene su propia conexión; se cierra al terminar el trabajo
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Procesa los trabajos de reportes pendientes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.REPORT_WORKERS,
+            help="Número máximo de trabajos en curso a la vez",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Segundos de espera cuando la cola está vacía",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Termina cuando no quedan trabajos pendientes",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        if concurrency < 1:
+            raise CommandError("--concurrency debe ser mayor que 0")
+
+        running = {}
+        next_heartbeat = next_maintenance = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                now = time.monotonic()
+                if now >= next_heartbeat:
+                    send_heartbeat(list(running.values()))
+                    next_heartbeat = now + settings.REPORT_JOB_HEARTBEAT_INTERVAL
+                if now >= next_maintenance:
+                    self.maintenance()
+                    next_maintenance = now + settings.REPORT_MAINTENANCE_INTERVAL
+
+                while len(running) < concurrency:
+                    job = claim_next_job()
+                    if job is None:
+                        break
+                    running[executor.submit(process_job, job)] = job.id
+
+                if not running:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                done, _ = wait(
+                    running,
+                    timeout=options["poll_interval"],
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    del running[future]
+                    self.report(future.result())
+
+    def maintenance(self):
+        """
+        Devuelve a la cola los trabajos abandonados y elimina los vencidos.
+        """
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"{requeued} trabajos abandonados devueltos a la cola")
+        purged = purge_expired_jobs()
+        if purged:
+            self.stdout.write(f"{purged} reportes vencidos eliminados")
+
+    def report(self, job):
+        message = (
+            f"{job.id} {job.kind}: {job.get_status_display()} "
+            f"(espera {job.wait_seconds:.2f}s, generación {job.render_seconds:.2f}s)"
+        )
+        if job.status == ReportJob.DONE:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stderr.write(f"{message}: {job.error}")
@@ -0,0 +1,119 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:36
+
+import core.reports.models
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("cdp", "PDF de un CDP"),
+                            ("cdps_zip", "ZIP con los CDPs de un proyecto"),
+                            ("cdps_pdf", "PDF con los CDPs de un proyecto"),
+                        ],
+                        max_length=20,
+                        verbose_name="kind",
+                    ),
+                ),
+                ("params", models.JSONField(default=dict, verbose_name="params")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendiente"),
+                            ("running", "En progreso"),
+                            ("done", "Finalizado"),
+                            ("failed", "Fallido"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True,
+                        null=True,
+                        upload_to=core.reports.models.report_upload_to,
+                        verbose_name="file",
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, null=True, verbose_name="error"),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="started_at"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="finished_at"
+                    ),
+                ),
+                (
+                    "wait_seconds",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="wait_seconds"
+                    ),
+                ),
+                (
+                    "render_seconds",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="render_seconds"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "report_jobs",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"], name="report_job_queue_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0002_report_job_project_kind"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="reportjob",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("cdp", "PDF de un CDP"),
+                    ("cdps_zip", "ZIP con los CDPs de un proyecto"),
+                    ("cdps_pdf", "PDF con los CDPs de un proyecto"),
+                    ("project", "Reporte de ejecución de un proyecto"),
+                    ("project_xlsx", "Excel de presupuesto y ejecución de un proyecto"),
+                ],
+                max_length=20,
+                verbose_name="kind",
+            ),
+        ),
+    ]
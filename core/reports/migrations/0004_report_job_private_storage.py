@@ -0,0 +1,48 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:28
+
+import os
+import shutil
+import core.reports.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def move_reports_out_of_media(apps, schema_editor):
+    # Los archivos generados antes quedaron en MEDIA_ROOT/reports, que se sirve
+    # sin autenticación; se mueven a REPORTS_ROOT conservando su nombre
+    source = os.path.join(settings.MEDIA_ROOT, "reports")
+    if not os.path.isdir(source):
+        return
+    target = os.path.join(settings.REPORTS_ROOT, "reports")
+    os.makedirs(target, exist_ok=True)
+    for name in os.listdir(source):
+        shutil.move(os.path.join(source, name), os.path.join(target, name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0003_report_job_project_xlsx_kind"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reportjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="heartbeat_at"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="reportjob",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=core.reports.models.report_storage,
+                upload_to=core.reports.models.report_upload_to,
+                verbose_name="file",
+            ),
+        ),
+        migrations.RunPython(move_reports_out_of_media, migrations.RunPython.noop),
+    ]
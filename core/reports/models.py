@@ -0,0 +1,80 @@
+import uuid
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from core.users.models import User
+
+
+def report_upload_to(instance, filename):
+    return f"reports/{instance.id}/{filename}"
+
+
+def report_storage():
+    """
+    Almacenamiento de los reportes en REPORTS_ROOT, fuera de MEDIA_ROOT: los
+    archivos solo se descargan con el enlace firmado de ReportJobDownloadView.
+    """
+    return FileSystemStorage(location=settings.REPORTS_ROOT)
+
+
+# Create your models here.
+class ReportJob(models.Model):
+    """
+    Generación de un reporte en segundo plano.
+
+    Los trabajos se crean en estado "pending" y los toma el comando
+    `process_report_jobs`. `wait_seconds` es el tiempo en cola y
+    `render_seconds` el tiempo de generación. Mientras un trabajo está en
+    curso su worker actualiza `heartbeat_at`.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = [
+        (PENDING, "Pendiente"),
+        (RUNNING, "En progreso"),
+        (DONE, "Finalizado"),
+        (FAILED, "Fallido"),
+    ]
+    KINDS = [
+        ("cdp", "PDF de un CDP"),
+        ("cdps_zip", "ZIP con los CDPs de un proyecto"),
+        ("cdps_pdf", "PDF con los CDPs de un proyecto"),
+        ("project", "Reporte de ejecución de un proyecto"),
+        ("project_xlsx", "Excel de presupuesto y ejecución de un proyecto"),
+    ]
+
+    id = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False, unique=True
+    )
+    kind = models.CharField("kind", max_length=20, choices=KINDS)
+    params = models.JSONField("params", default=dict)
+    status = models.CharField(
+        "status", max_length=20, choices=STATUSES, default=PENDING
+    )
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    file = models.FileField(
+        "file",
+        upload_to=report_upload_to,
+        storage=report_storage,
+        null=True,
+        blank=True,
+    )
+    error = models.TextField("error", null=True, blank=True)
+    started_at = models.DateTimeField("started_at", null=True, blank=True)
+    heartbeat_at = models.DateTimeField("heartbeat_at", null=True, blank=True)
+    finished_at = models.DateTimeField("finished_at", null=True, blank=True)
+    wait_seconds = models.FloatField("wait_seconds", null=True, blank=True)
+    render_seconds = models.FloatField("render_seconds", null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "report_jobs"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="report_job_queue_idx")
+        ]
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+from .models import ReportJob
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ReportJob
+        exclude = ["file", "user", "updated_at", "deleted_at"]
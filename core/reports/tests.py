@@ -0,0 +1,78 @@
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from core.entities.models import Entity
+from core.projects.models import Project
+from core.tasks.tests import TEST_CACHES
+from core.users.models import User
+from .models import ReportJob
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ReportJobAccessTests(TestCase):
+    def setUp(self):
+        entity = Entity.objects.create(name="Entidad")
+        self.project = Project.objects.create(name="Proyecto", entity=entity)
+        self.owner = User.objects.create(
+            email="duenio@example.com", identification="1", entity=entity
+        )
+        self.other = User.objects.create(
+            email="otro@example.com", identification="2", entity=entity
+        )
+        self.job = ReportJob.objects.create(
+            kind="project",
+            params={"project_id": str(self.project.id)},
+            user=self.owner,
+            status=ReportJob.DONE,
+        )
+        self.job.file.save("reporte.pdf", ContentFile(b"%PDF-"), save=True)
+        self.addCleanup(self.job.file.delete, save=False)
+
+    def auth(self, user):
+        return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    def detail(self, **headers):
+        return self.client.get(
+            reverse("report_job_detail_view", args=[self.job.id]), **headers
+        )
+
+    def test_only_the_owner_gets_the_job(self):
+        response = self.detail(**self.auth(self.owner))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("download_url", response.json())
+        self.assertEqual(self.detail(**self.auth(self.other)).status_code, 404)
+        self.assertEqual(self.detail().status_code, 404)
+
+    def test_job_belongs_to_the_authenticated_user(self):
+        response = self.client.post(
+            reverse("report_jobs_view"),
+            {
+                "kind": "project",
+                "project_id": str(self.project.id),
+                "user_id": str(self.other.id),
+            },
+            content_type="application/json",
+            **self.auth(self.owner),
+        )
+        self.assertEqual(response.status_code, 202)
+        job = ReportJob.objects.get(id=response.json()["id"])
+        self.assertEqual(job.user, self.owner)
+
+    def test_anonymous_requests_cannot_enqueue(self):
+        response = self.client.post(
+            reverse("report_jobs_view"),
+            {"kind": "project", "project_id": str(self.project.id)},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_download_link_expires(self):
+        download_url = self.detail(**self.auth(self.owner)).json()["download_url"]
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF-")
+        with override_settings(REPORT_DOWNLOAD_MAX_AGE=-1):
+            self.assertEqual(self.client.get(download_url).status_code, 403)
+        tampered = download_url.replace("token=", "token=x")
+        self.assertEqual(self.client.get(tampered).status_code, 403)
@@ -0,0 +1,16 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("reports/", views.ReportJobView.as_view(), name="report_jobs_view"),
+    path(
+        "reports/<uuid:job_id>/",
+        views.ReportJobDetailView.as_view(),
+        name="report_job_detail_view",
+    ),
+    path(
+        "reports/<uuid:job_id>/download/",
+        views.ReportJobDownloadView.as_view(),
+        name="report_job_download_view",
+    ),
+]
@@ -0,0 +1,205 @@
+import tempfile
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.utils import timezone
+from core.cdps.batch import CdpsBatchRenderer
+from core.cdps.generate_pdf import GeneratePdf
+from core.cdps.models import Cdps
+from core.cdps.pdf_cache import PdfCache
+from core.projects.export import ProjectWorkbookExport
+from core.projects.models import Project
+from core.projects.report import ProjectReportPdf
+from .models import ReportJob
+
+DOWNLOAD_SALT = "reports.download"
+
+
+def get_project_cdps(project_id):
+    cdps = list(
+        Cdps.objects.select_related("rubro")
+        .filter(activity__project_id=project_id)
+        .order_by("number", "id")
+    )
+    if not cdps:
+        raise ValueError("El proyecto no tiene cdps")
+    return cdps
+
+
+def render_cdp(job, entity):
+    cdp = Cdps.objects.select_related("rubro").get(id=job.params["cdp_id"])
+    sign = job.params.get("sign", False)
+    pdf_cache = PdfCache()
+    pdf_file = pdf_cache.open(
+        pdf_cache.key(cdp, entity, job.user, sign),
+        lambda: GeneratePdf(entity, job.user, cdp, sign=sign).generate_pdf(),
+    )
+    return f"cdp_{cdp.number or cdp.id}.pdf", pdf_file
+
+
+def render_cdps_zip(job, entity):
+    project_id = job.params["project_id"]
+    renderer = CdpsBatchRenderer(
+        get_project_cdps(project_id), entity, job.user, job.params.get("sign", False)
+    )
+    output = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+    for chunk in renderer.iter_zip():
+        output.write(chunk)
+    output.seek(0)
+    return f"cdps_{project_id}.zip", output
+
+
+def render_cdps_pdf(job, entity):
+    project_id = job.params["project_id"]
+    renderer = CdpsBatchRenderer(
+        get_project_cdps(project_id), entity, job.user, job.params.get("sign", False)
+    )
+    return f"cdps_{project_id}.pdf", renderer.merged_pdf()
+
+
+def render_project_report(job, entity):
+    project = Project.objects.select_related("entity").get(id=job.params["project_id"])
+    return f"reporte_{project.id}.pdf", ProjectReportPdf(project).build()
+
+
+def render_project_xlsx(job, entity):
+    project = Project.objects.get(id=job.params["project_id"])
+    return f"proyecto_{project.id}.xlsx", ProjectWorkbookExport(project).build()
+
+
+# Para cada tipo de reporte, el parámetro que necesita y la función que lo
+# genera. Cada función devuelve el nombre del archivo y un archivo abierto.
+# Los reportes de CDPs aceptan además el parámetro opcional "sign".
+SIGNABLE_KINDS = ("cdp", "cdps_zip", "cdps_pdf")
+
+RENDERERS = {
+    "cdp": ("cdp_id", render_cdp),
+    "cdps_zip": ("project_id", render_cdps_zip),
+    "cdps_pdf": ("project_id", render_cdps_pdf),
+    "project": ("project_id", render_project_report),
+    "project_xlsx": ("project_id", render_project_xlsx),
+}
+
+
+def claim_next_job():
+    """
+    Toma el trabajo pendiente más antiguo. La actualización condicional del
+    estado garantiza que dos workers no tomen el mismo trabajo.
+    @return: trabajo en estado "running" o None si la cola está vacía
+    """
+    while True:
+        job = (
+            ReportJob.objects.filter(status=ReportJob.PENDING)
+            .order_by("created_at")
+            .only("id", "created_at")
+            .first()
+        )
+        if job is None:
+            return None
+
+        now = timezone.now()
+        claimed = ReportJob.objects.filter(id=job.id, status=ReportJob.PENDING).update(
+            status=ReportJob.RUNNING,
+            started_at=now,
+            heartbeat_at=now,
+            wait_seconds=(now - job.created_at).total_seconds(),
+            updated_at=now,
+        )
+        if claimed:
+            return ReportJob.objects.select_related("user__entity").get(id=job.id)
+
+
+def run_job(job):
+    """
+    Genera el archivo del trabajo y registra el resultado y la duración.
+    """
+    start = time.perf_counter()
+    try:
+        entity = job.user.entity if job.user else None
+        if entity is None:
+            raise ValueError("El usuario del reporte no tiene entidad")
+
+        _, render = RENDERERS[job.kind]
+        filename, content = render(job, entity)
+        with content:
+            job.file.save(filename, File(content), save=False)
+        job.status = ReportJob.DONE
+    except Exception as e:
+        job.status = ReportJob.FAILED
+        job.error = str(e)
+
+    job.render_seconds = time.perf_counter() - start
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=[
+            "file",
+            "status",
+            "error",
+            "render_seconds",
+            "finished_at",
+            "updated_at",
+        ]
+    )
+    return job
+
+
+def send_heartbeat(job_ids):
+    """
+    Marca como vivos los trabajos en curso de este worker.
+    """
+    if job_ids:
+        ReportJob.objects.filter(id__in=job_ids, status=ReportJob.RUNNING).update(
+            heartbeat_at=timezone.now()
+        )
+
+
+def requeue_stale_jobs():
+    """
+    Devuelve a la cola los trabajos en curso sin latido desde hace más de
+    REPORT_JOB_TIMEOUT segundos (por ejemplo, si su worker se detuvo). Los
+    trabajos que otro worker sigue generando tienen un latido reciente.
+    @return: número de trabajos devueltos a la cola
+    """
+    limit = timezone.now() - timedelta(seconds=settings.REPORT_JOB_TIMEOUT)
+    return ReportJob.objects.filter(
+        status=ReportJob.RUNNING, heartbeat_at__lt=limit
+    ).update(
+        status=ReportJob.PENDING, started_at=None, heartbeat_at=None, wait_seconds=None
+    )
+
+
+def purge_expired_jobs():
+    """
+    Elimina los trabajos terminados hace más de REPORT_RETENTION segundos y
+    sus archivos.
+    @return: número de trabajos eliminados
+    """
+    limit = timezone.now() - timedelta(seconds=settings.REPORT_RETENTION)
+    jobs = ReportJob.objects.filter(
+        status__in=[ReportJob.DONE, ReportJob.FAILED], finished_at__lt=limit
+    )
+    purged = 0
+    for job in jobs.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        purged += 1
+    return purged
+
+
+def get_download_token(job):
+    return signing.TimestampSigner(salt=DOWNLOAD_SALT).sign(str(job.id))
+
+
+def check_download_token(job_id, token):
+    """
+    @raise signing.SignatureExpired: si el enlace venció
+    @raise signing.BadSignature: si el token no es válido o es de otro trabajo
+    """
+    value = signing.TimestampSigner(salt=DOWNLOAD_SALT).unsign(
+        token, max_age=settings.REPORT_DOWNLOAD_MAX_AGE
+    )
+    if value != str(job_id):
+        raise signing.BadSignature("El token no corresponde al reporte")
@@ -0,0 +1,284 @@
+import os
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.http import FileResponse
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from core.cdps.models import Cdps
+from core.projects.models import Project
+from core.cdps.signing import is_signing_enabled
+from core.users.models import User
+from .models import ReportJob
+from .serializers import ReportJobSerializer
+from .utils import (
+    RENDERERS,
+    SIGNABLE_KINDS,
+    check_download_token,
+    get_download_token,
+)
+
+# Modelo que debe existir para el parámetro de cada tipo de reporte
+PARAM_MODELS = {"cdp_id": Cdps, "project_id": Project}
+
+report_request_body = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "kind": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            enum=list(RENDERERS),
+            description="Tipo de reporte",
+        ),
+        "cdp_id": openapi.Schema(
+            type=openapi.TYPE_STRING, description="ID del CDP (tipo cdp)"
+        ),
+        "project_id": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description="ID del proyecto (tipos de proyecto)",
+        ),
+        "sign": openapi.Schema(
+            type=openapi.TYPE_BOOLEAN,
+            description="Firmar digitalmente los CDPs (tipos de CDP)",
+        ),
+    },
+    required=["kind"],
+)
+
+
+def job_response_data(request, job):
+    """
+    Datos del trabajo con el enlace de consulta y, si terminó, el enlace
+    firmado de descarga.
+    """
+    data = ReportJobSerializer(job).data
+    data["status_url"] = request.build_absolute_uri(
+        reverse("report_job_detail_view", args=[job.id])
+    )
+    if job.status == ReportJob.DONE and job.file:
+        download_path = reverse("report_job_download_view", args=[job.id])
+        data["download_url"] = request.build_absolute_uri(
+            f"{download_path}?token={get_download_token(job)}"
+        )
+    return data
+
+
+class ReportJobView(APIView):
+    """
+    Class to enqueue reports that are generated in the background
+
+    @methods:
+    - post: Enqueue a report
+    """
+
+    @swagger_auto_schema(
+        operation_description="Encolar la generación de un reporte",
+        request_body=report_request_body,
+        responses={
+            202: openapi.Response(
+                description="Reporte encolado", schema=ReportJobSerializer
+            ),
+            400: openapi.Response(description="Datos inválidos"),
+            401: openapi.Response(description="Usuario no autenticado"),
+            404: openapi.Response(description="CDP o proyecto no encontrado"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def post(self, request):
+        """
+        Enqueue a report for the authenticated user, who appears in its footer
+        @param request: HTTP request
+        @return: JSON response
+        """
+        try:
+            if not isinstance(request.user, User):
+                response = {
+                    "message": "Debe iniciar sesión para generar reportes",
+                    "status": status.HTTP_401_UNAUTHORIZED,
+                }
+                return Response(response, status=status.HTTP_401_UNAUTHORIZED)
+
+            kind = request.data.get("kind")
+            if kind not in RENDERERS:
+                response = {
+                    "message": f"Tipo de reporte inválido, use uno de: {', '.join(RENDERERS)}",
+                    "status": status.HTTP_400_BAD_REQUEST,
+                }
+                return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+            param, _ = RENDERERS[kind]
+            value = request.data.get(param)
+            if not value:
+                response = {
+                    "message": f"El campo {param} es obligatorio",
+                    "status": status.HTTP_400_BAD_REQUEST,
+                }
+                return Response(response, status=status.HTTP_400_BAD_REQUEST)
+            if not PARAM_MODELS[param].objects.filter(id=value).exists():
+                response = {
+                    "message": f"{param} no encontrado",
+                    "status": status.HTTP_404_NOT_FOUND,
+                }
+                return Response(response, status=status.HTTP_404_NOT_FOUND)
+
+            params = {param: str(value)}
+            if str(request.data.get("sign", "")).lower() in ("1", "true"):
+                if kind not in SIGNABLE_KINDS or not is_signing_enabled():
+                    response = {
+                        "message": "La firma digital no está configurada o no aplica a este reporte",
+                        "status": status.HTTP_400_BAD_REQUEST,
+                    }
+                    return Response(response, status=status.HTTP_400_BAD_REQUEST)
+                params["sign"] = True
+
+            job = ReportJob.objects.create(kind=kind, params=params, user=request.user)
+            return Response(
+                job_response_data(request, job), status=status.HTTP_202_ACCEPTED
+            )
+        except ValidationError:
+            response = {
+                "message": f"{param} inválido",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            response = {
+                "message": f"Error al encolar el reporte: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def user_jobs(user):
+    """
+    Trabajos que puede consultar el usuario: los suyos, o todos si es
+    superusuario.
+    """
+    if not isinstance(user, User):
+        return ReportJob.objects.none()
+    if user.is_superuser:
+        return ReportJob.objects.all()
+    return ReportJob.objects.filter(user=user)
+
+
+class ReportJobDetailView(APIView):
+    """
+    Class to get the status of a report job
+
+    Only the user who requested the report (or a superuser) can get it, since
+    the response carries a fresh download link.
+
+    @methods:
+    - get: Get the status of a report job
+    """
+
+    @swagger_auto_schema(
+        operation_description="Consultar el estado de un reporte",
+        responses={
+            200: openapi.Response(
+                description="Estado del reporte", schema=ReportJobSerializer
+            ),
+            404: openapi.Response(description="Reporte no encontrado"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, job_id):
+        """
+        Get the status of a report job
+        @param request: HTTP request
+        @param job_id: Report job ID
+        @return: JSON response
+        """
+        try:
+            job = user_jobs(request.user).get(id=job_id)
+            return Response(job_response_data(request, job), status=status.HTTP_200_OK)
+        except ReportJob.DoesNotExist:
+            response = {
+                "message": "Reporte no encontrado",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response = {
+                "message": f"Error al obtener el reporte: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ReportJobDownloadView(APIView):
+    """
+    Class to download the file of a finished report job
+
+    The signed, time-limited token in the URL is the credential, so the
+    request does not need to be authenticated.
+
+    @methods:
+    - get: Download the file of a report job
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    @swagger_auto_schema(
+        operation_description="Descargar el archivo de un reporte",
+        manual_parameters=[
+            openapi.Parameter(
+                "token",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="Token firmado de descarga",
+            )
+        ],
+        responses={
+            200: openapi.Response(description="Archivo del reporte"),
+            403: openapi.Response(description="Enlace inválido o vencido"),
+            404: openapi.Response(description="Reporte no encontrado o sin archivo"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, job_id):
+        """
+        Download the file of a report job
+        @param request: HTTP request
+        @param job_id: Report job ID
+        @return: File response
+        """
+        try:
+            check_download_token(job_id, request.query_params.get("token", ""))
+            # ReportJob no se restringe por entidad: el token es la credencial
+            job = ReportJob.objects.get(id=job_id, status=ReportJob.DONE)
+            if not job.file:
+                raise ReportJob.DoesNotExist
+            return FileResponse(
+                job.file.open("rb"),
+                as_attachment=True,
+                filename=os.path.basename(job.file.name),
+            )
+        except signing.SignatureExpired:
+            response = {
+                "message": "El enlace de descarga venció",
+                "status": status.HTTP_403_FORBIDDEN,
+            }
+            return Response(response, status=status.HTTP_403_FORBIDDEN)
+        except signing.BadSignature:
+            response = {
+                "message": "Enlace de descarga inválido",
+                "status": status.HTTP_403_FORBIDDEN,
+            }
+            return Response(response, status=status.HTTP_403_FORBIDDEN)
+        except (ReportJob.DoesNotExist, FileNotFoundError):
+            response = {
+                "message": "Reporte no encontrado",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response = {
+                "message": f"Error al descargar el reporte: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("roles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="role",
+            name="permissions",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="permissions"
+            ),
+        ),
+    ]
@@ -6,6 +6,8 @@ from django.db import models
 class Role(models.Model):
     id = models.UUIDField("id", primary_key=True, default=uuid.uuid4, editable=False, unique=True)
     name = models.CharField("name", max_length=50, unique=True, null=False, blank=False)
+    # Permisos del rol: "<recurso>.<acción>", con "*" como comodín
+    permissions = models.JSONField("permissions", default=list, blank=True)
     created_at = models.DateTimeField("created_at", auto_now_add=True)
     updated_at = models.DateTimeField("updated_at", auto_now=True)
     deleted_at = models.DateTimeField("deleted_at", null=True, blank=True)
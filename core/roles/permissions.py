@@ -0,0 +1,162 @@
+import threading
+from rest_framework.permissions import BasePermission
+from core.caching import versions
+
+VERSION_KEY = "roles:permissions:version"
+
+# Acción que requiere cada método HTTP
+METHOD_ACTIONS = {
+    "GET": "view",
+    "HEAD": "view",
+    "OPTIONS": "view",
+    "POST": "add",
+    "PUT": "change",
+    "PATCH": "change",
+    "DELETE": "delete",
+}
+
+ACTIONS = set(METHOD_ACTIONS.values())
+
+WILDCARD = "*"
+
+
+def get_version():
+    """
+    Versión vigente de los permisos de los roles, compartida por todos los
+    workers a través del caché "versions" y leída en cada proceso como máximo
+    cada VERSIONS_CHECK_INTERVAL segundos. Si la clave se pierde se crea un
+    token nuevo y los procesos recompilan el mapa.
+    """
+    return versions.get_local_version(VERSION_KEY)
+
+
+def bump_version():
+    """
+    Obliga a todos los procesos a recompilar el mapa de permisos.
+    """
+    versions.bump_version(VERSION_KEY)
+
+
+def parse_grant(grant):
+    """
+    Valida un permiso con la forma "<recurso>.<acción>", "<recurso>.*",
+    "*.<acción>" o "*".
+
+    @param grant: permiso
+    @return: (recurso, acción)
+    """
+    if not isinstance(grant, str):
+        raise ValueError("El permiso debe ser un texto")
+    if grant == WILDCARD:
+        return WILDCARD, WILDCARD
+    resource, separator, action = grant.partition(".")
+    if not separator or not resource:
+        raise ValueError(f"Permiso inválido: {grant}")
+    if action != WILDCARD and action not in ACTIONS:
+        raise ValueError(
+            f"Acción inválida en {grant}: debe ser una de "
+            f"{', '.join(sorted(ACTIONS))} o *"
+        )
+    return resource, action
+
+
+def compile_grants(grants):
+    """
+    @return: conjunto de (recurso, acción) de los permisos válidos
+    """
+    compiled = set()
+    for grant in grants or []:
+        try:
+            compiled.add(parse_grant(grant))
+        except ValueError:
+            continue
+    return frozenset(compiled)
+
+
+class PermissionMap:
+    """
+    Permisos de todos los roles compilados en memoria de cada proceso.
+
+    El mapa se carga con una sola consulta y se recompila solo cuando cambia
+    la versión, es decir, cuando se guarda o borra un rol; mientras tanto
+    resolver los permisos de una solicitud no consulta la base de datos, y la
+    versión se vuelve a leer del caché como máximo cada
+    VERSIONS_CHECK_INTERVAL segundos. Los cambios de un rol se ven en los
+    demás procesos con ese retraso.
+    """
+
+    def __init__(self):
+        self.roles = {}
+        self.version = None
+        self.lock = threading.Lock()
+
+    def refresh(self, version):
+        from .models import Role
+
+        with self.lock:
+            if self.version == version:
+                return
+            rows = Role.objects.filter(deleted_at__isnull=True).values_list(
+                "id", "permissions"
+            )
+            self.roles = {role_id: compile_grants(grants) for role_id, grants in rows}
+            self.version = version
+
+    def grants(self, role_id):
+        """
+        @param role_id: id del rol
+        @return: conjunto de (recurso, acción) del rol, vacío si no existe
+        """
+        version = get_version()
+        if version != self.version:
+            self.refresh(version)
+        return self.roles.get(role_id, frozenset())
+
+    def allows(self, role_id, resource, action):
+        grants = self.grants(role_id)
+        return bool(
+            {
+                (resource, action),
+                (resource, WILDCARD),
+                (WILDCARD, action),
+                (WILDCARD, WILDCARD),
+            }
+            & grants
+        )
+
+
+permission_map = PermissionMap()
+
+
+def view_resource(view):
+    """
+    Recurso de una vista: su atributo `permission_resource` o, si no lo
+    tiene, el nombre de la app (core.projects.views -> projects).
+    """
+    resource = getattr(view, "permission_resource", None)
+    if resource:
+        return resource
+    parts = type(view).__module__.split(".")
+    return parts[1] if len(parts) > 2 and parts[0] == "core" else parts[0]
+
+
+class RolePermission(BasePermission):
+    """
+    Permite la solicitud si el rol del usuario tiene el permiso
+    "<recurso>.<acción>" de la vista y el método, p. ej. "projects.view" para
+    un GET o "cdps.add" para un POST. Los superusuarios tienen todos los
+    permisos.
+    """
+
+    message = "Su rol no tiene permiso para realizar esta acción"
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not getattr(user, "is_authenticated", False):
+            return False
+        if getattr(user, "is_superuser", False):
+            return True
+        action = METHOD_ACTIONS.get(request.method)
+        if action is None or user.role_id is None:
+            return False
+        return permission_map.allows(user.role_id, view_resource(view), action)
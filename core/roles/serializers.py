@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import Role
 from django import forms
 from django.core import validators
+from .permissions import parse_grant
 
 
 class RoleValidator(forms.Form):
@@ -19,6 +20,20 @@ class RoleValidator(forms.Form):
             )
         ],
     )
+    permissions = forms.JSONField(required=False)
+
+    def clean_permissions(self):
+        permissions = self.cleaned_data.get("permissions")
+        if permissions is None:
+            return None
+        if not isinstance(permissions, list):
+            raise forms.ValidationError("Debe ser una lista de permisos")
+        for grant in permissions:
+            try:
+                parse_grant(grant)
+            except ValueError as e:
+                raise forms.ValidationError(str(e))
+        return permissions
 
 
 class RoleSerializer(serializers.ModelSerializer):
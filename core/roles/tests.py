@@ -1,3 +1,28 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from core.caching.versions import VERSIONS_CACHE
+from core.tasks.tests import TEST_CACHES
+from .models import Role
+from .permissions import PermissionMap
 
-# Create your tests here.
+
+@override_settings(CACHES=TEST_CACHES, VERSIONS_CHECK_INTERVAL=0)
+class PermissionMapTests(TestCase):
+    def setUp(self):
+        caches[VERSIONS_CACHE].clear()
+        self.role = Role.objects.create(name="Rol", permissions=["projects.view"])
+        self.permission_map = PermissionMap()
+
+    def test_saving_a_role_recompiles_the_map(self):
+        self.assertTrue(self.permission_map.allows(self.role.id, "projects", "view"))
+        self.role.permissions = ["cdps.*"]
+        self.role.save()
+        self.assertFalse(self.permission_map.allows(self.role.id, "projects", "view"))
+        self.assertTrue(self.permission_map.allows(self.role.id, "cdps", "add"))
+
+    def test_lost_version_recompiles_the_map(self):
+        self.assertTrue(self.permission_map.allows(self.role.id, "projects", "view"))
+        Role.objects.filter(id=self.role.id).update(permissions=[])
+        # Una versión descartada del caché no vuelve a un valor anterior
+        caches[VERSIONS_CACHE].clear()
+        self.assertFalse(self.permission_map.allows(self.role.id, "projects", "view"))
@@ -12,6 +12,12 @@ role_request_body = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
         "name": openapi.Schema(type=openapi.TYPE_STRING, description="Nombre del rol"),
+        "permissions": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_STRING),
+            description='Permisos "<recurso>.<acción>" (view, add, change, delete), '
+            'con "*" como comodín, p. ej. "projects.view" o "cdps.*"',
+        ),
     },
 )
 
@@ -87,6 +93,7 @@ class RoleView(APIView):
                 return Response(response, status=status.HTTP_400_BAD_REQUEST)
             role = Role.objects.create(
                 name=data["name"],
+                permissions=role_validator.cleaned_data["permissions"] or [],
             )
             role_serializer = RoleSerializer(role, many=False)
 
@@ -100,6 +107,14 @@ class RoleView(APIView):
 
 
 class RoleDetailView(APIView):
+    def get_object(self, id):
+        """
+        Get a role by ID
+        @param id: Role ID
+        @return: Role
+        """
+        return Role.objects.get(id=id)
+
     # Documentar el método GET para obtener un rol específico por ID
     @swagger_auto_schema(
         operation_description="Obtener un rol específico por ID",
@@ -171,10 +186,18 @@ class RoleDetailView(APIView):
                 }
                 return Response(response, status=status.HTTP_400_BAD_REQUEST)
             role.name = data["name"]
+            if role_validator.cleaned_data["permissions"] is not None:
+                role.permissions = role_validator.cleaned_data["permissions"]
             role.save()
             role_serializer = RoleSerializer(role, many=False)
 
             return Response(role_serializer.data, status=status.HTTP_200_OK)
+        except Role.DoesNotExist:
+            response = {
+                "message": "Role not found",
+                "status": status.HTTP_404_NOT_FOUND,
+            }
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             response = {
                 "message": f"Error updating role: {str(e)}",
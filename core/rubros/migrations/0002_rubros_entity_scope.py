@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:15
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0007_projects_entity_scope"),
+        ("rubros", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="rubro",
+            options={"default_manager_name": "all_objects", "ordering": ["id"]},
+        ),
+        migrations.AlterModelManagers(
+            name="rubro",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="rubro",
+            index=models.Index(fields=["project", "id"], name="rubros_project_idx"),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from core.projects.models import Project
+from core.entities.tenancy import EntityScopedManager
 
 
 # Create your models here.
@@ -19,6 +20,12 @@ class Rubro(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(blank=True, null=True)
 
+    all_objects = models.Manager()
+    # Restringido a la entidad de la solicitud (core.entities.tenancy)
+    objects = EntityScopedManager("project__entity")
+
     class Meta:
         db_table = "rubros"
         ordering = ["id"]
+        default_manager_name = "all_objects"
+        indexes = [models.Index(fields=["project", "id"], name="rubros_project_idx")]
@@ -11,6 +11,11 @@ urlpatterns = [
         views.RubroProjectView.as_view(),
         name="rubro_project_view",
     ),
+    path(
+        "rubros/project/<uuid:project_id>/breakdown",
+        views.RubroBreakdownView.as_view(),
+        name="rubro_breakdown_view",
+    ),
     path(
         "rubros/sum/<uuid:project_id>",
         views.RubrosSumView.as_view(),
@@ -5,6 +5,10 @@ from .models import Rubro
 from rest_framework.views import APIView
 from .serializers import RubroSerializer
 from core.projects.models import Project
+from core.items.models import Item
+from core.persons.models import Person
+from core.travels.models import Travel
+from core.cdps.models import Cdps
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
@@ -338,3 +342,114 @@ class RubroProjectView(APIView):
                 "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
             }
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def sum_by_rubro(queryset, field):
+    """
+    Suma `field` agrupando por rubro en una sola consulta.
+    @return: diccionario {rubro_id: total}
+    """
+    rows = queryset.values("rubro_id").annotate(total=Sum(field)).order_by()
+    return {row["rubro_id"]: row["total"] or 0 for row in rows}
+
+
+class RubroBreakdownView(APIView):
+    """
+    Class to handle HTTP requests related to the breakdown of rubros by project
+
+    @methods:
+    - get: Get the planned detail and commitments of every rubro of a project
+    """
+
+    @swagger_auto_schema(
+        operation_description="Obtener por rubro la suma de items, personas, viajes y CDPs de un proyecto",
+        responses={
+            200: openapi.Response(
+                description="Desglose de rubros recuperado correctamente",
+                examples={
+                    "application/json": [
+                        {
+                            "id": "2b1f6a0e-8a8a-4a8c-9d0e-1c2f3a4b5c6d",
+                            "descripcion": "Equipos",
+                            "value_sgr": 800000.0,
+                            "items_total": 500000.0,
+                            "persons_total": 0,
+                            "travels_total": 100000.0,
+                            "planned_total": 600000.0,
+                            "committed": 200000.0,
+                            "budget": 1000000.0,
+                            "unplanned": 400000.0,
+                            "remaining": 800000.0,
+                        }
+                    ]
+                },
+            ),
+            400: openapi.Response(description="Proyecto no encontrado"),
+            500: openapi.Response(description="Error interno del servidor"),
+        },
+    )
+    def get(self, request, project_id):
+        """
+        Get the breakdown of every rubro of a project
+        @param request: HTTP request
+        @param project_id: Project ID
+        @return: JSON response
+        """
+
+        try:
+            project = Project.objects.get(id=project_id)
+            rubros = Rubro.objects.filter(project=project).values(
+                "id", "descripcion", "value_sgr"
+            )
+
+            # Una consulta agrupada por tabla, sin cargar las filas de detalle
+            items = sum_by_rubro(
+                Item.objects.filter(rubro__project=project), "total_value"
+            )
+            persons = sum_by_rubro(
+                Person.objects.filter(rubro__project=project), "total"
+            )
+            travels = sum_by_rubro(
+                Travel.objects.filter(rubro__project=project), "total"
+            )
+            committed = sum_by_rubro(
+                Cdps.objects.filter(rubro__project=project), "amount"
+            )
+
+            data = []
+            for rubro in rubros:
+                rubro_id = rubro["id"]
+                planned_total = (
+                    items.get(rubro_id, 0)
+                    + persons.get(rubro_id, 0)
+                    + travels.get(rubro_id, 0)
+                )
+                # value_sgr ya tiene descontados los CDPs emitidos (ver CdpsView.post)
+                budget = rubro["value_sgr"] + committed.get(rubro_id, 0)
+                data.append(
+                    {
+                        **rubro,
+                        "items_total": items.get(rubro_id, 0),
+                        "persons_total": persons.get(rubro_id, 0),
+                        "travels_total": travels.get(rubro_id, 0),
+                        "planned_total": planned_total,
+                        "committed": committed.get(rubro_id, 0),
+                        "budget": budget,
+                        "unplanned": budget - planned_total,
+                        "remaining": rubro["value_sgr"],
+                    }
+                )
+
+            return Response(data, status=status.HTTP_200_OK)
+        except Project.DoesNotExist:
+            response = {
+                "message": "Proyecto no encontrado",
+                "status": status.HTTP_400_BAD_REQUEST,
+            }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            response = {
+                "message": f"Error obteniendo el desglose de los rubros: {str(e)}",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+            return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
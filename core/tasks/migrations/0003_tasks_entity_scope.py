@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:15
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activities", "0003_activities_entity_scope"),
+        ("tasks", "0002_alter_task_options"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="task",
+            options={"default_manager_name": "all_objects", "ordering": ["task_num"]},
+        ),
+        migrations.AlterModelManagers(
+            name="task",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["activity", "task_num"], name="tasks_activity_idx"
+            ),
+        ),
+    ]
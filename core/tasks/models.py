@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from core.activities.models import Activity
+from core.entities.tenancy import EntityScopedManager
 
 
 # Create your models here.
@@ -21,6 +22,14 @@ class Task(models.Model):
     updated_at = models.DateTimeField("updated_at", auto_now=True)
     deleted_at = models.DateTimeField("deleted_at", null=True, blank=True)
 
+    all_objects = models.Manager()
+    # Restringido a la entidad de la solicitud (core.entities.tenancy)
+    objects = EntityScopedManager("activity__project__entity")
+
     class Meta:
         db_table = "tasks"
         ordering = ["task_num"]
+        default_manager_name = "all_objects"
+        indexes = [
+            models.Index(fields=["activity", "task_num"], name="tasks_activity_idx")
+        ]
@@ -0,0 +1,68 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from core.activities.models import Activity
+from .models import Task
+from .statistics import bump_scope_versions
+
+
+def invalidate_statistics(*activity_ids):
+    """
+    Invalida las estadísticas globales y las de las actividades y proyectos dados.
+    """
+    activity_ids = {activity_id for activity_id in activity_ids if activity_id}
+    project_ids = set(
+        Activity.all_objects.filter(id__in=activity_ids).values_list(
+            "project_id", flat=True
+        )
+    )
+    bump_scope_versions(
+        "all",
+        *(f"activity:{activity_id}" for activity_id in activity_ids),
+        *(f"project:{project_id}" for project_id in project_ids if project_id),
+    )
+
+
+def statistics_fields(task):
+    # Campos que cambian el resultado de las estadísticas o su alcance
+    return (task.state, task.activity_id, task.start_date, task.end_date)
+
+
+@receiver(post_init, sender=Task)
+def remember_task_scope(sender, instance, **kwargs):
+    # Valores cargados de la base de datos, para detectar cambios al guardar
+    instance._statistics_fields = statistics_fields(instance)
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    previous = instance._statistics_fields
+    if created or previous != statistics_fields(instance):
+        invalidate_statistics(previous[1], instance.activity_id)
+    instance._statistics_fields = statistics_fields(instance)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    invalidate_statistics(instance.activity_id)
+
+
+@receiver(post_init, sender=Activity)
+def remember_activity_project(sender, instance, **kwargs):
+    instance._statistics_project_id = instance.project_id
+
+
+@receiver(post_save, sender=Activity)
+def activity_saved(sender, instance, created, **kwargs):
+    # Las tareas de una actividad que cambia de proyecto cambian de alcance
+    previous = instance._statistics_project_id
+    if not created and previous != instance.project_id:
+        bump_scope_versions(
+            "all",
+            f"activity:{instance.id}",
+            *(
+                f"project:{project_id}"
+                for project_id in (previous, instance.project_id)
+                if project_id
+            ),
+        )
+    instance._statistics_project_id = instance.project_id
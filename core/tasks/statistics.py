@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from core.caching.versions import bump_version, get_version
+from core.entities.tenancy import NO_ENTITY, get_current_entity
+from .models import Task
+
+TASK_STATES = ("Pendiente", "En progreso", "Finalizada", "Cancelada")
+
+CACHE_PREFIX = "task_statistics"
+CACHE_TIMEOUT = getattr(settings, "TASK_STATISTICS_CACHE_TIMEOUT", 60 * 60)
+
+
+def scope_version_key(scope):
+    return f"{CACHE_PREFIX}:version:{scope}"
+
+
+def get_scope_version(scope):
+    return get_version(scope_version_key(scope))
+
+
+def bump_scope_versions(*scopes):
+    """
+    Invalida las estadísticas de los alcances dados cambiando su versión.
+    Las entradas anteriores quedan huérfanas y expiran con CACHE_TIMEOUT.
+    """
+    bump_version(*(scope_version_key(scope) for scope in scopes))
+
+
+def get_scope(project_id=None, activity_id=None):
+    """
+    Alcance más específico de un filtro; su versión es la que invalida el caché.
+    """
+    if activity_id:
+        return f"activity:{activity_id}"
+    if project_id:
+        return f"project:{project_id}"
+    return "all"
+
+
+def get_tenant():
+    """
+    Parte de la clave de caché que separa los resultados por entidad: las
+    consultas de Task.objects dependen del alcance vigente.
+    """
+    entity = get_current_entity()
+    if entity is None:
+        return "all"
+    if entity is NO_ENTITY:
+        return "none"
+    return f"entity:{entity}"
+
+
+def get_task_statistics(
+    project_id=None, activity_id=None, start_date=None, end_date=None
+):
+    """
+    Proporción de tareas por estado en el alcance dado, calculada con una sola
+    consulta de agregación condicional y guardada en caché por alcance y por
+    entidad.
+    @return: diccionario {estado: proporción}
+    """
+    scope = get_scope(project_id, activity_id)
+    cache_key = ":".join(
+        str(part)
+        for part in (
+            CACHE_PREFIX,
+            get_tenant(),
+            scope,
+            get_scope_version(scope),
+            project_id,
+            start_date,
+            end_date,
+        )
+    )
+    statistics = cache.get(cache_key)
+    if statistics is not None:
+        return statistics
+
+    tasks = Task.objects.all()
+    if project_id:
+        tasks = tasks.filter(activity__project_id=project_id)
+    if activity_id:
+        tasks = tasks.filter(activity_id=activity_id)
+    if start_date:
+        tasks = tasks.filter(start_date__gte=start_date)
+    if end_date:
+        tasks = tasks.filter(end_date__lte=end_date)
+
+    counts = tasks.aggregate(
+        total=Count("id"),
+        **{
+            f"state_{index}": Count("id", filter=Q(state=state))
+            for index, state in enumerate(TASK_STATES)
+        },
+    )
+
+    total = counts["total"]
+    statistics = {
+        state: counts[f"state_{index}"] / total if total else 0
+        for index, state in enumerate(TASK_STATES)
+    }
+    cache.set(cache_key, statistics, CACHE_TIMEOUT)
+    return statistics
@@ -1,3 +1,77 @@
-from django.test import TestCase
+from datetime import date
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from core.activities.models import Activity
+from core.caching.versions import VERSIONS_CACHE
+from core.entities.models import Entity
+from core.entities.tenancy import NO_ENTITY, entity_scope
+from core.projects.models import Project
+from .models import Task
+from .statistics import get_task_statistics
 
-# Create your tests here.
+TEST_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    VERSIONS_CACHE: {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "versions",
+    },
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TaskStatisticsCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches[VERSIONS_CACHE].clear()
+        self.project = Project.objects.create(name="Proyecto")
+        self.other = Project.objects.create(name="Otro")
+        self.activity = Activity.objects.create(name="Actividad", project=self.project)
+        self.task = Task.objects.create(
+            activity=self.activity,
+            state="Pendiente",
+            start_date=date(2024, 1, 10),
+            end_date=date(2024, 1, 20),
+        )
+
+    def january(self, project):
+        return get_task_statistics(
+            project_id=project.id,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 31),
+        )
+
+    def test_changing_task_dates_invalidates_date_ranges(self):
+        self.assertEqual(self.january(self.project)["Pendiente"], 1)
+        self.task.end_date = date(2024, 2, 5)
+        self.task.save()
+        self.assertEqual(self.january(self.project)["Pendiente"], 0)
+
+    def test_moving_an_activity_invalidates_both_projects(self):
+        self.assertEqual(self.january(self.project)["Pendiente"], 1)
+        self.assertEqual(self.january(self.other)["Pendiente"], 0)
+        self.activity.project = self.other
+        self.activity.save()
+        self.assertEqual(self.january(self.project)["Pendiente"], 0)
+        self.assertEqual(self.january(self.other)["Pendiente"], 1)
+
+    def test_lost_version_does_not_revive_stale_entries(self):
+        self.assertEqual(self.january(self.project)["Pendiente"], 1)
+        self.task.state = "Finalizada"
+        self.task.save()
+        self.assertEqual(self.january(self.project)["Finalizada"], 1)
+        # Una versión descartada del caché no vuelve a un valor anterior
+        caches[VERSIONS_CACHE].clear()
+        Task.objects.filter(id=self.task.id).update(state="Cancelada")
+        self.assertEqual(self.january(self.project)["Cancelada"], 1)
+
+    def test_cached_statistics_are_not_shared_between_entities(self):
+        self.project.entity = Entity.objects.create(name="Entidad")
+        self.project.save()
+        other_entity = Entity.objects.create(name="Otra")
+        with entity_scope(self.project.entity_id):
+            self.assertEqual(self.january(self.project)["Pendiente"], 1)
+        with entity_scope(other_entity.id):
+            self.assertEqual(self.january(self.project)["Pendiente"], 0)
+        with entity_scope(NO_ENTITY):
+            self.assertEqual(self.january(self.project)["Pendiente"], 0)
+        self.assertEqual(self.january(self.project)["Pendiente"], 1)
@@ -1,9 +1,11 @@
-from django.db.models import Count
+import uuid
+from django.utils.dateparse import parse_date
 from rest_framework import status
 from rest_framework.response import Response
 from .models import Task
 from rest_framework.views import APIView
 from .serializers import TaskSerializer
+from .statistics import get_task_statistics
 from core.projects.models import Project
 from core.activities.models import Activity
 from drf_yasg.utils import swagger_auto_schema
@@ -71,6 +73,36 @@ class TaskStatisticsView(APIView):
 
     @swagger_auto_schema(
         operation_description="Obtener el promedio de tareas por estado",
+        manual_parameters=[
+            openapi.Parameter(
+                "project_id",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_UUID,
+                description="Limitar a las tareas de un proyecto",
+            ),
+            openapi.Parameter(
+                "activity_id",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_UUID,
+                description="Limitar a las tareas de una actividad",
+            ),
+            openapi.Parameter(
+                "start_date",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                description="Tareas que inician desde esta fecha (YYYY-MM-DD)",
+            ),
+            openapi.Parameter(
+                "end_date",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                description="Tareas que terminan hasta esta fecha (YYYY-MM-DD)",
+            ),
+        ],
         responses={
             200: openapi.Response(
                 description="Promedio de tareas por estado",
@@ -92,6 +124,7 @@ class TaskStatisticsView(APIView):
                     },
                 ),
             ),
+            400: openapi.Response(description="Parámetros de filtro inválidos"),
             500: openapi.Response(description="Error interno del servidor"),
         },
     )
@@ -102,37 +135,25 @@ class TaskStatisticsView(APIView):
         @return: Respuesta JSON con los promedios
         """
 
+        filters = {}
         try:
-            # Contamos las tareas por estado
-            task_counts = Task.objects.values("state").annotate(count=Count("id"))
-
-            # Calculamos el total de tareas
-            total_tasks = Task.objects.count()
-
-            # Si no hay tareas, retornamos 0 para todos los estados
-            if total_tasks == 0:
-                return Response(
-                    {"Pendiente": 0, "En progreso": 0, "Finalizada": 0, "Cancelada": 0},
-                    status=status.HTTP_200_OK,
-                )
-
-            # Crear un diccionario con los estados y sus contadores
-            state_counts = {
-                "Pendiente": 0,
-                "En progreso": 0,
-                "Finalizada": 0,
-                "Cancelada": 0,
-            }
-
-            # Poblamos el diccionario con los resultados de la consulta
-            for task in task_counts:
-                state_counts[task["state"]] = task["count"]
-
-            # Calculamos los promedios
-            averages = {
-                state: count / total_tasks for state, count in state_counts.items()
+            for param in ("project_id", "activity_id"):
+                if request.query_params.get(param):
+                    filters[param] = uuid.UUID(request.query_params[param])
+            for param in ("start_date", "end_date"):
+                if request.query_params.get(param):
+                    filters[param] = parse_date(request.query_params[param])
+                    if filters[param] is None:
+                        raise ValueError
+        except ValueError:
+            response = {
+                "message": "Parámetros de filtro inválidos",
+                "status": status.HTTP_400_BAD_REQUEST,
             }
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            averages = get_task_statistics(**filters)
             return Response(averages, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -0,0 +1,47 @@
+import copy
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .user_cache import get_version, user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que resuelve el usuario del token desde `user_cache`,
+    con el rol y la entidad cargados en la misma consulta, en lugar de leer
+    la base de datos en cada solicitud.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        version = get_version()
+        user = user_cache.get(user_id, version)
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related("role", "entity").get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, version, user)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        # Copia por solicitud: las vistas pueden modificar request.user sin
+        # afectar la entrada compartida
+        return copy.copy(user)
@@ -0,0 +1,53 @@
+import hashlib
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher as DjangoPBKDF2PasswordHasher,
+)
+from django.utils.crypto import constant_time_compare
+
+# Formato anterior de User.set_password: pbkdf2_sha256$<salt hex>$<hash hex>,
+# con 100.000 iteraciones y la sal en bytes
+LEGACY_ITERATIONS = 100000
+
+
+class PBKDF2PasswordHasher(DjangoPBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 de Django con las iteraciones de PASSWORD_PBKDF2_ITERATIONS,
+    que además verifica las contraseñas guardadas en el formato anterior.
+
+    Las contraseñas del formato anterior, o con otro número de iteraciones,
+    se vuelven a cifrar al iniciar sesión (`must_update`).
+    """
+
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+
+    def is_legacy(self, encoded):
+        return encoded.count("$") == 2
+
+    def decode(self, encoded):
+        if not self.is_legacy(encoded):
+            return super().decode(encoded)
+        algorithm, salt, hash = encoded.split("$")
+        assert algorithm == self.algorithm
+        return {
+            "algorithm": algorithm,
+            "hash": hash,
+            "iterations": LEGACY_ITERATIONS,
+            "salt": salt,
+        }
+
+    def verify(self, password, encoded):
+        if not self.is_legacy(encoded):
+            return super().verify(password, encoded)
+        decoded = self.decode(encoded)
+        try:
+            salt = bytes.fromhex(decoded["salt"])
+        except ValueError:
+            return False
+        hashed = hashlib.pbkdf2_hmac(
+            "sha256", password.encode("utf-8"), salt, LEGACY_ITERATIONS
+        )
+        return constant_time_compare(hashed.hex(), decoded["hash"])
+
+    def must_update(self, encoded):
+        return self.is_legacy(encoded) or super().must_update(encoded)
@@ -0,0 +1,81 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+
+
+class LoginPoolSaturated(Exception):
+    pass
+
+
+class PasswordCheckPool:
+    """
+    Hilos dedicados a verificar contraseñas, fuera del hilo de la solicitud.
+
+    PBKDF2 en hashlib libera el GIL, así `workers` verificaciones corren en
+    paralelo mientras los demás hilos del worker de gunicorn siguen atendiendo
+    solicitudes, y un pico de inicios de sesión no ocupa más CPU que esos
+    `workers` hilos. Además de las que están en curso, se aceptan hasta
+    `queue_size` en espera; con la cola llena `submit` falla de inmediato con
+    LoginPoolSaturated en lugar de acumular inicios de sesión.
+
+    Cada inicio de sesión admitido ocupa además un hilo de la solicitud
+    mientras espera su resultado, así que el total admitido se limita a
+    `request_threads - 1`: siempre queda al menos un hilo del worker para las
+    demás solicitudes.
+    """
+
+    def __init__(self, workers, queue_size, request_threads):
+        self.admitted = max(1, min(workers + queue_size, request_threads - 1))
+        self.workers = min(workers, self.admitted)
+        self.lock = threading.Lock()
+        self.pid = None
+
+    def start(self):
+        # Un pool por proceso, creado después del fork del servidor
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-check"
+            )
+            self.slots = threading.BoundedSemaphore(self.admitted)
+            self.pid = os.getpid()
+
+    def submit(self, fn, *args):
+        if self.pid != os.getpid():
+            self.start()
+        if not self.slots.acquire(blocking=False):
+            raise LoginPoolSaturated
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def run(self, fn, *args):
+        """
+        Ejecuta `fn` en el pool y espera su resultado.
+        """
+        return self.submit(fn, *args).result()
+
+
+def check_user_password(user, password):
+    """
+    Verifica la contraseña en un hilo del pool; si el hash se actualiza se
+    guarda desde ese hilo, que cierra su conexión al terminar.
+    """
+    try:
+        return user.check_password(password)
+    finally:
+        close_old_connections()
+
+
+password_check_pool = PasswordCheckPool(
+    settings.LOGIN_PASSWORD_WORKERS,
+    settings.LOGIN_PASSWORD_QUEUE_SIZE,
+    settings.GUNICORN_THREADS,
+)
@@ -0,0 +1,73 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.users.hashers import PBKDF2PasswordHasher
+
+SAMPLE_PASSWORD = "benchmark-password"
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide inicios de sesión por segundo y latencias p50/p99 de la "
+        "verificación de contraseñas con distintas iteraciones de PBKDF2, "
+        "para elegir PASSWORD_PBKDF2_ITERATIONS"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            nargs="+",
+            help="Iteraciones de PBKDF2 a comparar (por defecto 100000, 260000, "
+            "600000 y las configuradas)",
+        )
+        parser.add_argument(
+            "--logins",
+            type=int,
+            default=200,
+            help="Verificaciones por cada número de iteraciones",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Verificaciones simultáneas, como los hilos de los workers",
+        )
+
+    def handle(self, *args, **options):
+        if options["logins"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--logins y --concurrency deben ser mayores que 0")
+        iterations_list = options["iterations"] or sorted(
+            {100000, 260000, 600000, settings.PASSWORD_PBKDF2_ITERATIONS}
+        )
+
+        for iterations in iterations_list:
+            hasher = PBKDF2PasswordHasher()
+            hasher.iterations = iterations
+            encoded = hasher.encode(SAMPLE_PASSWORD, hasher.salt())
+
+            def login(_):
+                start = time.perf_counter()
+                hasher.verify(SAMPLE_PASSWORD, encoded)
+                return time.perf_counter() - start
+
+            with ThreadPoolExecutor(options["concurrency"]) as pool:
+                start = time.perf_counter()
+                latencies = list(pool.map(login, range(options["logins"])))
+                wall = time.perf_counter() - start
+
+            configured = iterations == settings.PASSWORD_PBKDF2_ITERATIONS
+            marker = " (configuradas)" if configured else ""
+            self.stdout.write(
+                f"{iterations:>9} iteraciones{marker}: "
+                f"{options['logins'] / wall:8.1f} inicios/s, "
+                f"p50 {statistics.median(latencies) * 1000:8.1f} ms, "
+                f"p99 {percentile(latencies, 0.99) * 1000:8.1f} ms"
+            )
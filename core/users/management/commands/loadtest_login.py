@@ -0,0 +1,124 @@
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def timed_request(url, data=None):
+    """
+    @return: (código de estado, segundos)
+    """
+    request = urllib.request.Request(url)
+    if data is not None:
+        request.data = json.dumps(data).encode()
+        request.add_header("Content-Type", "application/json")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            code = response.status
+    except urllib.error.HTTPError as e:
+        code = e.code
+    return code, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga contra un servidor en ejecución: mide la latencia de "
+        "un endpoint que no es el login, sin carga y durante una ráfaga de "
+        "inicios de sesión, para comprobar que el login no la afecta"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost:8000")
+        parser.add_argument("--email", required=True, help="Usuario de prueba")
+        parser.add_argument("--password", required=True)
+        parser.add_argument(
+            "--probe",
+            default="/api/roles/",
+            help="Ruta que se mide sin carga y durante la ráfaga",
+        )
+        parser.add_argument(
+            "--logins",
+            type=int,
+            default=200,
+            help="Inicios de sesión de la ráfaga",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Inicios de sesión simultáneos",
+        )
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=5,
+            help="Duración de la medición sin carga",
+        )
+
+    def handle(self, *args, **options):
+        if options["logins"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--logins y --concurrency deben ser mayores que 0")
+        base_url = options["url"].rstrip("/")
+        probe_url = f"{base_url}{options['probe']}"
+        login_url = f"{base_url}/api/login/"
+        credentials = {"email": options["email"], "password": options["password"]}
+
+        def probe(stop):
+            latencies = []
+            while not stop.is_set():
+                latencies.append(timed_request(probe_url)[1])
+            return latencies
+
+        # Sin carga
+        stop = threading.Event()
+        timer = threading.Timer(options["seconds"], stop.set)
+        timer.start()
+        baseline = probe(stop)
+
+        # Ráfaga de inicios de sesión
+        stop = threading.Event()
+        with ThreadPoolExecutor(1) as prober:
+            probing = prober.submit(probe, stop)
+            with ThreadPoolExecutor(options["concurrency"]) as pool:
+                start = time.perf_counter()
+                logins = list(
+                    pool.map(
+                        lambda _: timed_request(login_url, credentials),
+                        range(options["logins"]),
+                    )
+                )
+                wall = time.perf_counter() - start
+            stop.set()
+            spike = probing.result()
+
+        for name, latencies in (("sin carga", baseline), ("con ráfaga", spike)):
+            self.stdout.write(
+                f"{options['probe']} {name:>10}: {len(latencies):5} solicitudes, "
+                f"p50 {statistics.median(latencies) * 1000:8.1f} ms, "
+                f"p99 {percentile(latencies, 0.99) * 1000:8.1f} ms"
+            )
+        codes = {}
+        for code, _ in logins:
+            codes[code] = codes.get(code, 0) + 1
+        accepted = [seconds for code, seconds in logins if code == 200]
+        summary = ", ".join(f"{code}: {count}" for code, count in sorted(codes.items()))
+        self.stdout.write(
+            f"Login: {options['logins'] / wall:.1f} respuestas/s ({summary})"
+            + (
+                f", p50 {statistics.median(accepted) * 1000:.1f} ms, "
+                f"p99 {percentile(accepted, 0.99) * 1000:.1f} ms"
+                if accepted
+                else ""
+            )
+        )
@@ -1,9 +1,8 @@
 from django.db import models
 from core.roles.models import Role
 from core.entities.models import Entity
+from django.contrib.auth.hashers import check_password, make_password
 import uuid
-import os
-import hashlib
 
 
 class User(models.Model):
@@ -40,27 +39,25 @@ class User(models.Model):
         return self.email
 
     def set_password(self, raw_password):
-        """Este método crea el hash de la contraseña"""
-        salt = os.urandom(32)  # 32 bytes salt
-        hashed_pw = hashlib.pbkdf2_hmac(
-            "sha256", raw_password.encode("utf-8"), salt, 100000
-        )
-        self.password = f"pbkdf2_sha256${salt.hex()}${hashed_pw.hex()}"
-        self.save()
+        """Cifra la contraseña con el primer hasher de PASSWORD_HASHERS, sin guardar"""
+        self.password = make_password(raw_password)
 
     def check_password(self, raw_password):
-        """Este método compara el hash con la contraseña ingresada"""
-        try:
-            algorithm, salt, hashed_pw = self.password.split("$")
-            salt = bytes.fromhex(salt)
-            stored_hashed_pw = bytes.fromhex(hashed_pw)
-            hashed_input_pw = hashlib.pbkdf2_hmac(
-                "sha256", raw_password.encode("utf-8"), salt, 100000
-            )
-            return hashed_input_pw == stored_hashed_pw
-        except Exception as e:
-            print("Error al verificar la contraseña", e)
-            return False
+        """
+        Compara la contraseña ingresada con el hash. Si el hash usa un formato
+        o un costo distinto al configurado, se vuelve a cifrar y se guarda.
+        """
+
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Mismo usuario y contraseña: no invalida el caché de usuarios
+            self._rehashing_password = True
+            try:
+                self.save(update_fields=["password", "updated_at"])
+            finally:
+                self._rehashing_password = False
+
+        return check_password(raw_password, self.password, setter)
 
     # Métodos que Django espera para autenticación
     @property
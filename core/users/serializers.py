@@ -45,18 +45,21 @@ class UserSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Crear un nuevo usuario con la contraseña cifrada"""
         password = validated_data.pop("password", None)
-        user = User.objects.create(**validated_data)
+        user = User(**validated_data)
         if password:
             user.set_password(
                 password
             )  # Asegurarse de que la contraseña se guarde correctamente
+        user.save()
         return user
 
 
-class LoginUserSerializer(serializers.Serializer):
+class LoginCredentialsSerializer(serializers.Serializer):
     email = serializers.EmailField(required=True)
     password = serializers.CharField(write_only=True, required=True)
 
+
+class LoginUserSerializer(LoginCredentialsSerializer):
     first_name = serializers.CharField(read_only=True)
     last_name = serializers.CharField(read_only=True)
     role_name = serializers.CharField(read_only=True)
@@ -68,41 +71,42 @@ class LoginUserSerializer(serializers.Serializer):
         """
         Valida las credenciales de login (email y contraseña).
         """
-        email = attrs.get("email")
-        password = attrs.get("password")
+        user = get_login_user(attrs.get("email"))
+        # Verifica que la contraseña sea correcta
+        if not user.check_password(attrs.get("password")):
+            raise serializers.ValidationError(INVALID_PASSWORD_MESSAGE)
+        return get_login_data(user)
 
-        try:
-            user = User.objects.get(email=email)
-            print(f"User found: {user.id}")
-        except User.DoesNotExist:
-            raise serializers.ValidationError("El usuario no existe")
 
-        # Verifica que la contraseña sea correcta
-        if not user.check_password(password):
-            raise serializers.ValidationError("Credenciales incorrectas (password)")
-
-        # Genera tokens de acceso
-        print(f"Generating tokens for user ID: {user.id}")
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
-
-        print(f"Generated Access Token: {access_token}")
-
-        user_data = {
-            "first_name": user.name,
-            "last_name": user.last_name,
-            "email": user.email,
-            "role_name": user.role.name if user.role else None,
-            "entity_name": user.entity.name if user.entity else None,
-            "user_id": user.id,
-            "entity_id": user.entity.id if user.entity else None,
-            "refresh": str(refresh),
-            "access": str(access_token),
-        }
-
-        print("Esta es la data")
-
-        return user_data
+INVALID_PASSWORD_MESSAGE = "Credenciales incorrectas (password)"
+
+
+def get_login_user(email):
+    """
+    Usuario que inicia sesión, con su rol y su entidad.
+    """
+    try:
+        return User.objects.select_related("role", "entity").get(email=email)
+    except User.DoesNotExist:
+        raise serializers.ValidationError("El usuario no existe")
+
+
+def get_login_data(user):
+    """
+    Datos del usuario y tokens de acceso de la respuesta del login.
+    """
+    refresh = RefreshToken.for_user(user)
+    return {
+        "first_name": user.name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "role_name": user.role.name if user.role else None,
+        "entity_name": user.entity.name if user.entity else None,
+        "user_id": user.id,
+        "entity_id": user.entity.id if user.entity else None,
+        "refresh": str(refresh),
+        "access": str(refresh.access_token),
+    }
 
 
 class UserValidator(forms.Form):
@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from core.entities.models import Entity
+from core.roles.models import Role
+from .models import User
+from .user_cache import bump_version
+
+
+def auth_fields(user):
+    # Campos del usuario que cambian el resultado de CachedJWTAuthentication
+    return (
+        user.is_active,
+        user.is_staff,
+        user.is_superuser,
+        user.role_id,
+        user.entity_id,
+        user.password,
+    )
+
+
+@receiver(post_init, sender=User)
+def remember_auth_fields(sender, instance, **kwargs):
+    # Valores cargados de la base de datos, para detectar cambios al guardar
+    instance._auth_fields = auth_fields(instance)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    previous = instance._auth_fields
+    instance._auth_fields = auth_fields(instance)
+    # Un usuario nuevo no está en caché. Al volver a cifrar la contraseña en
+    # el login (User.check_password) la contraseña no cambia, y el hash solo
+    # importa si los tokens se revocan por cambio de contraseña
+    if created:
+        return
+    rehashing = getattr(instance, "_rehashing_password", False)
+    if rehashing and not api_settings.CHECK_REVOKE_TOKEN:
+        return
+    if previous != instance._auth_fields:
+        bump_version()
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Entity)
+@receiver(post_delete, sender=Entity)
+def invalidate_user_cache(sender, instance, **kwargs):
+    bump_version()
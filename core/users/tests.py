@@ -1,3 +1,92 @@
-from django.test import TestCase
+from unittest import mock
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from core.caching.versions import VERSIONS_CACHE
+from core.roles.models import Role
+from core.tasks.tests import TEST_CACHES
+from .login_pool import LoginPoolSaturated, PasswordCheckPool, password_check_pool
+from .models import User
+from .user_cache import get_version
 
-# Create your tests here.
+
+@override_settings(CACHES=TEST_CACHES, VERSIONS_CHECK_INTERVAL=0)
+class UserCacheVersionTests(TestCase):
+    def setUp(self):
+        caches[VERSIONS_CACHE].clear()
+        self.user = User.objects.create(
+            email="usuario@example.com",
+            identification="1",
+            password=make_password("secreta", hasher="pbkdf2_sha1"),
+        )
+        self.user = User.objects.get(id=self.user.id)
+
+    def test_rehash_on_login_keeps_the_version(self):
+        version = get_version()
+        self.assertTrue(self.user.check_password("secreta"))
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+        self.assertEqual(get_version(), version)
+
+    def test_profile_changes_keep_the_version(self):
+        version = get_version()
+        self.user.name = "Nombre"
+        self.user.save()
+        self.assertEqual(get_version(), version)
+
+    def test_auth_changes_bump_the_version(self):
+        role = Role.objects.create(name="Rol")
+        for field, value in (("role", role), ("is_active", False)):
+            version = get_version()
+            setattr(self.user, field, value)
+            self.user.save()
+            self.assertNotEqual(get_version(), version)
+
+        version = get_version()
+        self.user.set_password("otra")
+        self.user.save()
+        self.assertNotEqual(get_version(), version)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class LoginUserViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            email="usuario@example.com",
+            identification="1",
+            password=make_password("secreta"),
+        )
+
+    def login(self, password):
+        return self.client.post(
+            reverse("user-login"),
+            {"email": self.user.email, "password": password},
+            content_type="application/json",
+        )
+
+    def test_login(self):
+        response = self.login("secreta")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+        self.assertEqual(self.login("otra").status_code, 400)
+
+    def test_full_pool_answers_503(self):
+        with mock.patch.object(
+            password_check_pool, "submit", side_effect=LoginPoolSaturated
+        ):
+            response = self.login("secreta")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+    def test_admission_leaves_a_request_thread_free(self):
+        pool = PasswordCheckPool(workers=2, queue_size=16, request_threads=4)
+        self.assertEqual((pool.workers, pool.admitted), (2, 3))
+        pool.start()
+        for _ in range(3):
+            self.assertTrue(pool.slots.acquire(blocking=False))
+        with self.assertRaises(LoginPoolSaturated):
+            pool.submit(print)
+
+    def test_login_is_documented(self):
+        response = self.client.get("/swagger/?format=openapi")
+        self.assertIn("/login/", "".join(response.json()["paths"]))
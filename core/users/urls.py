@@ -4,5 +4,10 @@ from . import views
 urlpatterns = [
     path("users/", views.UserView.as_view(), name="users_view"),
     path("users/<uuid:pk>/", views.UserDetailView.as_view(), name="users_detail_view"),
+    path(
+        "users/auth-cache/stats/",
+        views.UserCacheStatsView.as_view(),
+        name="users_auth_cache_stats_view",
+    ),
     path("login/", views.LoginUserView.as_view(), name="user-login"),
 ]
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from core.caching import versions
+
+VERSION_KEY = "users:auth_cache:version"
+
+
+def get_version():
+    """
+    Versión vigente de los usuarios en caché, compartida por todos los
+    workers a través del caché "versions" y leída en cada proceso como máximo
+    cada VERSIONS_CHECK_INTERVAL segundos.
+    """
+    return versions.get_local_version(VERSION_KEY)
+
+
+def bump_version():
+    """
+    Invalida los usuarios en caché de todos los procesos con una versión
+    nueva; las entradas anteriores quedan huérfanas y salen por LRU o TTL.
+    """
+    versions.bump_version(VERSION_KEY)
+    user_cache.clear()
+
+
+class UserCache:
+    """
+    Caché por proceso de los usuarios autenticados, con su rol y su entidad ya
+    cargados, acotado en número de entradas (LRU) y en tiempo de vida (TTL).
+
+    La clave es (id del usuario, versión): al cambiar los datos de
+    autenticación de un usuario o al guardar o borrar un rol o entidad cambia
+    la versión y las entradas anteriores dejan de coincidir. Los demás cambios
+    del usuario (nombre, correo) y los que no emiten señales
+    (`QuerySet.update()`) se ven cuando vence el TTL.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id, version):
+        key = (str(user_id), version)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, user_id, version, user):
+        if self.max_size <= 0:
+            return
+        key = (str(user_id), version)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, user)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        @return: contadores de este proceso y proporción de aciertos
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
@@ -1,13 +1,25 @@
+from django.conf import settings
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework import status
-from .serializers import UserSerializer, UserValidator, LoginUserSerializer
+from rest_framework.serializers import ValidationError
+from .serializers import (
+    INVALID_PASSWORD_MESSAGE,
+    LoginCredentialsSerializer,
+    LoginUserSerializer,
+    UserSerializer,
+    UserValidator,
+    get_login_data,
+    get_login_user,
+)
 from .models import User
 from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from core.roles.models import Role
 from core.entities.models import Entity
+from .login_pool import LoginPoolSaturated, check_user_password, password_check_pool
+from .user_cache import user_cache
 
 
 # Definir el cuerpo de la solicitud para la creación de un usuario
@@ -107,7 +119,7 @@ class UserView(APIView):
             )
 
             # Crear el usuario
-            user = User.objects.create(
+            user = User(
                 name=data["name"],
                 last_name=data["last_name"],
                 email=data["email"],
@@ -276,6 +288,7 @@ class UserDetailView(APIView):
 # Definir el cuerpo de la solicitud para el login
 login_request_body = openapi.Schema(
     type=openapi.TYPE_OBJECT,
+    required=["email", "password"],
     properties={
         "email": openapi.Schema(
             type=openapi.TYPE_STRING, description="Correo electrónico del usuario"
@@ -290,6 +303,10 @@ login_request_body = openapi.Schema(
 class LoginUserView(APIView):
     """
     Vista para manejar el login de usuario y la generación de tokens.
+
+    La contraseña se verifica en `password_check_pool`, que limita cuántas
+    verificaciones de PBKDF2 corren a la vez en el proceso; si el pool está
+    lleno se responde 503 con Retry-After.
     """
 
     permission_classes = [AllowAny]
@@ -302,14 +319,72 @@ class LoginUserView(APIView):
                 description="Token obtenido correctamente", schema=LoginUserSerializer
             ),
             400: openapi.Response(description="Credenciales incorrectas"),
+            503: openapi.Response(
+                description="Demasiados inicios de sesión en curso",
+                headers={
+                    "Retry-After": {
+                        "type": openapi.TYPE_INTEGER,
+                        "description": "Segundos antes de reintentar",
+                    }
+                },
+            ),
         },
     )
     def post(self, request, *args, **kwargs):
         """
         Método para manejar el login de un usuario
         """
-        # Usamos el nuevo serializer
-        serializer = LoginUserSerializer(data=request.data)
-        if serializer.is_valid():
-            return Response(serializer.validated_data, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = LoginCredentialsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        credentials = serializer.validated_data
+
+        try:
+            user = get_login_user(credentials["email"])
+            if not password_check_pool.run(
+                check_user_password, user, credentials["password"]
+            ):
+                raise ValidationError(INVALID_PASSWORD_MESSAGE)
+        except ValidationError as e:
+            return Response(
+                {"non_field_errors": e.detail}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except LoginPoolSaturated:
+            response = {
+                "message": "Hay demasiados inicios de sesión en curso, intente de nuevo",
+                "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+            }
+            return Response(
+                response,
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(settings.LOGIN_RETRY_AFTER)},
+            )
+        return Response(get_login_data(user), status=status.HTTP_200_OK)
+
+
+class UserCacheStatsView(APIView):
+    """
+    Vista para consultar los contadores del caché de usuarios autenticados.
+    """
+
+    # Solo administradores: la vista lo verifica
+    permission_classes = []
+
+    @swagger_auto_schema(
+        operation_description="Contadores del caché de usuarios del proceso que atiende la solicitud",
+        responses={
+            200: openapi.Response(description="Contadores del caché"),
+            403: openapi.Response(description="Solo para administradores"),
+        },
+    )
+    def get(self, request):
+        """
+        Obtener aciertos, fallos, expulsiones y proporción de aciertos
+        """
+        if not getattr(request.user, "is_staff", False):
+            response = {
+                "message": "Solo los administradores pueden consultar el caché",
+                "status": status.HTTP_403_FORBIDDEN,
+            }
+            return Response(response, status=status.HTTP_403_FORBIDDEN)
+        return Response(user_cache.stats(), status=status.HTTP_200_OK)
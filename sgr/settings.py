@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os
+import sys
+import tempfile
 from dotenv import load_dotenv
 from datetime import timedelta
 import dj_database_url
@@ -34,7 +36,7 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 SECRET_KEY = os.environ.get("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.environ.get("DEBUG", default=False)
+DEBUG = os.environ.get("DEBUG", "False").lower() == "true"
 APP_NAME = os.environ.get("FLY_APP_NAME")
 
 ALLOWED_HOSTS = [f"{APP_NAME}.fly.dev", "*"]
@@ -72,10 +74,16 @@ INSTALLED_APPS = [
     "core.cdps",
     "core.counterpartExecution",
     "core.movementsCounterpart",
+    "core.checkpoints",
+    "core.reports",
+    "core.metrics",
 ]
 
 MIDDLEWARE = [
-    "core.middleware.log_request_headers.LogRequestHeadersMiddleware",
+    "core.middleware.request_log.RequestLogMiddleware",
+    "core.middleware.metrics.MetricsMiddleware",
+    "core.middleware.slow_queries.SlowQueryMiddleware",
+    "core.middleware.entity_scope.EntityScopeMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -84,6 +92,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.profiler.ProfilerMiddleware",
 ]
 
 
@@ -119,6 +128,263 @@ DATABASES_URL = f'postgres://{os.environ.get("DB_USER")}:{os.environ.get("DB_PAS
 DATABASES = {"default": dj_database_url.config(default=DATABASES_URL)}
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Por defecto en disco para que los workers de gunicorn compartan las entradas
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "sgr_cache")
+        ),
+    },
+    # Versiones de los cachés (core.caching.versions): pocas claves que no
+    # deben descartarse al llenarse el caché, por eso MAX_ENTRIES sin límite
+    "versions": {
+        "BACKEND": os.environ.get(
+            "VERSIONS_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.environ.get(
+            "VERSIONS_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "sgr_versions"),
+        ),
+        "OPTIONS": {"MAX_ENTRIES": sys.maxsize},
+    },
+}
+
+# Segundos que cada proceso reutiliza en memoria las versiones que se
+# consultan en cada solicitud (usuarios autenticados, permisos de los roles)
+# antes de volver a leerlas del caché "versions"
+VERSIONS_CHECK_INTERVAL = float(os.environ.get("VERSIONS_CHECK_INTERVAL", 1))
+
+TASK_STATISTICS_CACHE_TIMEOUT = 60 * 60
+
+# Usuarios autenticados en memoria de cada proceso: máximo de entradas y
+# segundos de vida de cada una
+
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", 1024))
+
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", 60))
+
+# Autorización por rol: con ROLE_PERMISSIONS_ENABLED cada vista exige el
+# permiso "<recurso>.<acción>" en Role.permissions (core.roles.permissions)
+
+ROLE_PERMISSIONS_ENABLED = (
+    os.environ.get("ROLE_PERMISSIONS_ENABLED", "False").lower() == "true"
+)
+
+DEFAULT_PERMISSION_CLASSES = (
+    ["core.roles.permissions.RolePermission"]
+    if ROLE_PERMISSIONS_ENABLED
+    else ["rest_framework.permissions.AllowAny"]
+)
+
+
+# PDF
+# Motor de los PDFs de CDP ("xhtml2pdf" o "reportlab"), procesos para generar
+# PDFs en lote y tamaño máximo del caché de PDFs de CDP
+
+CDP_PDF_ENGINE = os.environ.get("CDP_PDF_ENGINE", "xhtml2pdf")
+
+# Procesos del pool de PDFs de cada worker de gunicorn: cada uno es un proceso
+# de Django completo y cada worker tiene su propio pool
+PDF_RENDER_WORKERS = int(
+    os.environ.get("PDF_RENDER_WORKERS", min(2, os.cpu_count() or 1))
+)
+
+# CDPs de un proyecto que se unen en un PDF durante la solicitud; con más el
+# PDF unido se genera en la cola de reportes
+
+CDPS_MERGED_PDF_SYNC_MAX = int(os.environ.get("CDPS_MERGED_PDF_SYNC_MAX", 50))
+
+CDP_PDF_CACHE_MAX_BYTES = int(
+    os.environ.get("CDP_PDF_CACHE_MAX_BYTES", 200 * 1024 * 1024)
+)
+
+# Firma digital (PAdES) de los CDPs con una llave PKCS#12 local; sin ruta la
+# firma queda deshabilitada. Con EMBED_VALIDATION_INFO se descargan y agregan
+# las respuestas OCSP/CRL del certificado (firma LTV), validado contra las CA
+# de CDP_SIGNING_TRUST_ROOTS
+
+CDP_SIGNING_PKCS12_PATH = os.environ.get("CDP_SIGNING_PKCS12_PATH", "")
+
+CDP_SIGNING_PKCS12_PASSWORD = os.environ.get("CDP_SIGNING_PKCS12_PASSWORD", "")
+
+CDP_SIGNING_EMBED_VALIDATION_INFO = (
+    os.environ.get("CDP_SIGNING_EMBED_VALIDATION_INFO", "False").lower() == "true"
+)
+
+CDP_SIGNING_TRUST_ROOTS = os.environ.get("CDP_SIGNING_TRUST_ROOTS", "")
+
+# URL pública base de los códigos QR de verificación de los CDPs
+
+CDP_VERIFY_BASE_URL = os.environ.get(
+    "CDP_VERIFY_BASE_URL",
+    f"https://{APP_NAME}.fly.dev" if APP_NAME else "http://localhost:8000",
+).rstrip("/")
+
+
+# Reportes en segundo plano
+# Trabajos simultáneos por worker, segundos de validez de los enlaces de
+# descarga, segundos entre latidos de los trabajos en curso y sin latido tras
+# los que un trabajo se considera abandonado, segundos entre revisiones de
+# trabajos abandonados y vencidos, y segundos que se conservan los reportes
+# terminados. Los archivos van en REPORTS_ROOT, que no se sirve como media
+
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", 2))
+
+REPORT_DOWNLOAD_MAX_AGE = int(os.environ.get("REPORT_DOWNLOAD_MAX_AGE", 15 * 60))
+
+REPORT_JOB_HEARTBEAT_INTERVAL = int(os.environ.get("REPORT_JOB_HEARTBEAT_INTERVAL", 15))
+
+REPORT_JOB_TIMEOUT = int(os.environ.get("REPORT_JOB_TIMEOUT", 2 * 60))
+
+REPORT_MAINTENANCE_INTERVAL = int(os.environ.get("REPORT_MAINTENANCE_INTERVAL", 60))
+
+REPORT_RETENTION = int(os.environ.get("REPORT_RETENTION", 7 * 24 * 60 * 60))
+
+REPORTS_ROOT = os.environ.get(
+    "REPORTS_ROOT", os.path.join(BASE_DIR, "private", "reports")
+)
+
+
+# Registro de solicitudes
+# Proporción de solicitudes registradas (0 a 1), headers que se incluyen y
+# registros pendientes de escribir antes de empezar a descartar
+
+REQUEST_LOG_SAMPLE_RATE = float(os.environ.get("REQUEST_LOG_SAMPLE_RATE", 0.1))
+
+REQUEST_LOG_HEADERS = [
+    header.strip()
+    for header in os.environ.get(
+        "REQUEST_LOG_HEADERS",
+        "User-Agent,Content-Type,Content-Length,X-Activity,X-Forwarded-For",
+    ).split(",")
+    if header.strip()
+]
+
+REQUEST_LOG_QUEUE_SIZE = int(os.environ.get("REQUEST_LOG_QUEUE_SIZE", 1000))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "sgr.requests": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "sgr.queries": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
+
+
+# Métricas por ruta
+# Directorio compartido por los workers, segundos entre escrituras de cada
+# worker y token para consultar /api/metrics (sin token, solo administradores)
+
+METRICS_DIR = os.environ.get(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "sgr_metrics")
+)
+
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+
+# Detección de consultas N+1 (desarrollo y pruebas)
+# Repeticiones de una misma forma de consulta por solicitud que se reportan y
+# si la solicitud debe fallar al detectarlas
+
+NPLUSONE_ENABLED = os.environ.get("NPLUSONE_ENABLED", str(DEBUG)).lower() == "true"
+
+NPLUSONE_THRESHOLD = int(os.environ.get("NPLUSONE_THRESHOLD", 5))
+
+NPLUSONE_RAISE = os.environ.get("NPLUSONE_RAISE", "False").lower() == "true"
+
+if NPLUSONE_ENABLED:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("core.middleware.metrics.MetricsMiddleware") + 1,
+        "core.middleware.query_inspector.QueryInspectorMiddleware",
+    )
+
+
+# Perfiles de solicitudes con ?_profile= (solo administradores)
+# Perfiles que se conservan, funciones del perfil de cProfile y consultas a
+# las que se les obtiene el plan con EXPLAIN ANALYZE
+
+PROFILE_BUFFER_SIZE = int(os.environ.get("PROFILE_BUFFER_SIZE", 100))
+
+PROFILE_STATS_LIMIT = int(os.environ.get("PROFILE_STATS_LIMIT", 40))
+
+PROFILE_EXPLAIN_LIMIT = int(os.environ.get("PROFILE_EXPLAIN_LIMIT", 50))
+
+
+# Consultas lentas
+# Milisegundos desde los que una consulta se registra, archivo del registro y
+# tamaño y número de archivos rotados que se conservan
+
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 200))
+
+SLOW_QUERY_LOG = os.environ.get(
+    "SLOW_QUERY_LOG",
+    os.path.join(tempfile.gettempdir(), "sgr_slow_queries", "slow_queries.jsonl"),
+)
+
+SLOW_QUERY_LOG_MAX_BYTES = int(
+    os.environ.get("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024)
+)
+
+SLOW_QUERY_LOG_BACKUPS = int(os.environ.get("SLOW_QUERY_LOG_BACKUPS", 3))
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.1/topics/auth/passwords/
+# Iteraciones de PBKDF2. Por defecto las del formato anterior; para subirlas,
+# medir antes con `manage.py benchmark_login` en el servidor. Las contraseñas
+# con otro número de iteraciones o en el formato anterior se actualizan al
+# iniciar sesión
+
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS", 100000))
+
+PASSWORD_HASHERS = [
+    "core.users.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+# Hilos de cada worker de gunicorn (--threads en el Dockerfile)
+
+GUNICORN_THREADS = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Hilos por proceso que verifican contraseñas en el login, inicios de sesión
+# que pueden esperar un hilo y segundos de Retry-After cuando se llena la cola.
+# Cada inicio de sesión admitido ocupa un hilo de gunicorn mientras espera, así
+# que entre los dos se limitan a GUNICORN_THREADS - 1 (ver login_pool)
+
+LOGIN_PASSWORD_WORKERS = int(os.environ.get("LOGIN_PASSWORD_WORKERS", 1))
+
+LOGIN_PASSWORD_QUEUE_SIZE = int(
+    os.environ.get(
+        "LOGIN_PASSWORD_QUEUE_SIZE",
+        max(GUNICORN_THREADS - 1 - LOGIN_PASSWORD_WORKERS, 0),
+    )
+)
+
+LOGIN_RETRY_AFTER = int(os.environ.get("LOGIN_RETRY_AFTER", 2))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -214,7 +480,7 @@ SIMPLE_JWT = {
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.users.authentication.CachedJWTAuthentication",
     ],
-    # "DEFAULT_PERMISSION_CLASSES": DEFAULT_PERMISSION_CLASSES,
+    "DEFAULT_PERMISSION_CLASSES": DEFAULT_PERMISSION_CLASSES,
 }
@@ -57,6 +57,11 @@ urlpatterns = [
     path("api/", include("core.contracts.urls")),
     path("api/", include("core.cdps.urls")),
     path("api/", include("core.movements.urls")),
+    path("api/", include("core.counterpartExecution.urls")),
+    path("api/", include("core.movementsCounterpart.urls")),
+    path("api/", include("core.checkpoints.urls")),
+    path("api/", include("core.reports.urls")),
+    path("api/", include("core.metrics.urls")),
     # Ruta de la documentación Swagger
     path(
         "swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="swagger-ui"